@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    aircraft_id TEXT,
+    alert_type TEXT,
+    severity TEXT,
+    timestamp TEXT,
+    state TEXT,
+    incident TEXT,
+    latest INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lines_aircraft ON lines (aircraft_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_lines_type ON lines (alert_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_lines_severity ON lines (severity, timestamp);
+CREATE INDEX IF NOT EXISTS idx_lines_timestamp ON lines (timestamp);
+CREATE INDEX IF NOT EXISTS idx_lines_incident ON lines (incident, latest);
+"""
+
+# Logs are parsed in blocks so a full re-index never holds a whole log in memory
+CHUNK_SIZE = 8 * 1024 * 1024
+
+class AlertIndex:
+    """SQLite sidecar mapping alert log lines to byte offsets by aircraft, type, severity and time
+    
+    Each log's indexed size and inode are kept, so a refresh only parses the
+    bytes appended since, and a log rewritten by compaction is re-indexed
+    from the start. The latest line of each incident is flagged, so queries
+    can return current incident states without reading the history.
+    """
+    
+    def __init__(self, path='logs/alert_index.db'):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.connection = sqlite3.connect(path)
+        # Re-indexing a large log touches every index page, so keep more of them cached
+        self.connection.execute("PRAGMA cache_size = -65536")
+        self.connection.executescript(SCHEMA)
+    
+    def close(self):
+        self.connection.close()
+    
+    def refresh(self, log_path):
+        """Index the lines appended to a log since the last refresh; returns the number indexed"""
+        try:
+            stat = os.stat(log_path)
+        except FileNotFoundError:
+            with self.connection:
+                self._forget(log_path)
+            return 0
+        
+        row = self.connection.execute("SELECT inode, size FROM logs WHERE path = ?", (log_path,)).fetchone()
+        if row is None or row[0] != stat.st_ino or stat.st_size < row[1]:
+            start = 0
+        else:
+            start = row[1]
+        if start == stat.st_size:
+            return 0
+        if start == 0:
+            with self.connection:
+                self._forget(log_path)
+        
+        indexed = 0
+        pending = b''
+        with open(log_path, 'rb') as f:
+            f.seek(start)
+            while True:
+                block = f.read(CHUNK_SIZE)
+                if not block:
+                    break
+                # A line still being written is left for the next refresh
+                data = pending + block
+                end = data.rfind(b'\n') + 1
+                pending = data[end:]
+                if end:
+                    indexed += self._index_lines(log_path, stat.st_ino, start, data[:end])
+                    start += end
+        return indexed
+    
+    def _index_lines(self, log_path, inode, start, data):
+        rows = []
+        latest = {}
+        offset = start
+        # json.dumps escapes non-ASCII, so one character per byte keeps the offsets exact
+        for line in data.decode('latin-1').splitlines(keepends=True):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                offset += len(line)
+                continue
+            
+            incident = f"{entry.get('aircraft_id')}|{entry.get('alert_type')}|{entry.get('source')}"
+            latest[incident] = len(rows)
+            rows.append([
+                log_path, offset, len(line), entry.get('aircraft_id'), entry.get('alert_type'),
+                entry.get('severity'), entry.get('timestamp'), entry.get('state', 'open'), incident, 0
+            ])
+            offset += len(line)
+        
+        for position in latest.values():
+            rows[position][-1] = 1
+        
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE lines SET latest = 0 WHERE incident = ? AND latest = 1", ((incident,) for incident in latest)
+            )
+            self.connection.executemany(
+                "INSERT INTO lines (path, offset, length, aircraft_id, alert_type, severity, timestamp, state, incident, latest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.connection.execute("INSERT OR REPLACE INTO logs VALUES (?, ?, ?)", (log_path, inode, offset))
+        return len(rows)
+    
+    def last_id(self):
+        return self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM lines").fetchone()[0]
+    
+    def _forget(self, log_path):
+        self.connection.execute("DELETE FROM lines WHERE path = ?", (log_path,))
+        self.connection.execute("DELETE FROM logs WHERE path = ?", (log_path,))
+    
+    def query(self, aircraft_id=None, alert_type=None, severity=None, state=None,
+              since=None, until=None, history=False, limit=None, after_id=0):
+        """Matching alert lines in time order, read by seeking to their offsets
+        
+        Without history only the latest line of each incident is considered;
+        a limit keeps the most recent matches. Returns (id, entry) pairs.
+        """
+        conditions = ["id > ?"]
+        parameters = [after_id]
+        for column, value in (('aircraft_id', aircraft_id), ('alert_type', alert_type),
+                              ('severity', severity), ('state', state)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            parameters.append(since)
+        if until is not None:
+            # Dates compare as prefixes of the ISO timestamps, so the bound is the next character up
+            conditions.append("timestamp < ?")
+            parameters.append(until + '\uffff')
+        if not history:
+            conditions.append("latest = 1")
+        
+        sql = f"SELECT id, path, offset, length FROM lines WHERE {' AND '.join(conditions)} ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        matches = self.connection.execute(sql, parameters).fetchall()
+        matches.reverse()
+        
+        by_path = {}
+        for match in matches:
+            by_path.setdefault(match[1], []).append(match)
+        
+        entries = {}
+        for log_path, path_matches in by_path.items():
+            with open(log_path, 'rb') as f:
+                for line_id, _, offset, length in sorted(path_matches, key=lambda match: match[2]):
+                    f.seek(offset)
+                    entries[line_id] = json.loads(f.read(length))
+        
+        return [(match[0], entries[match[0]]) for match in matches]
@@ -0,0 +1,216 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from modules.alert_index import AlertIndex
+
+ALERT_LOGS = {
+    'CRITICAL': 'logs/critical_flight_alerts.log',
+    'WARNING': 'logs/aircraft_health_alerts.log'
+}
+
+OPEN = 'open'
+ACKNOWLEDGED = 'ack'
+RESOLVED = 'resolved'
+
+class AlertStore:
+    """JSON-lines alert logs holding one line per incident state change
+    
+    An incident is identified by (aircraft_id, alert_type, source reading), so
+    re-analyzing a reading writes nothing. A newer reading raising the same
+    alert replaces the incident and keeps its open or acknowledged state; a
+    newer reading without it resolves the incident. Once a log grows past
+    compact_ratio times both its unresolved incidents and the lines its
+    last compaction kept, it is rewritten with the latest line of each
+    incident and long-resolved incidents are dropped.
+    """
+    
+    def __init__(self, config, paths=None):
+        settings = config.get('alert_store', {})
+        self.paths = dict(paths or ALERT_LOGS)
+        self.compact_ratio = settings.get('compact_ratio', 2.0)
+        self.min_compact_lines = settings.get('min_compact_lines', 64)
+        self.retention = timedelta(days=settings.get('retention_days', 30))
+        self.index_path = settings.get('index_path', 'logs/alert_index.db')
+        self.index = None
+        
+        self.incidents = None
+        self.current = {}
+        self.line_counts = {}
+        self.live_counts = {}
+        self.kept_counts = {}
+    
+    def _path(self, entry):
+        return self.paths.get(entry['severity'], self.paths['WARNING'])
+    
+    def _load(self):
+        if self.incidents is not None:
+            return
+        
+        self.incidents = {}
+        self.current = {}
+        for path in self.paths.values():
+            self.line_counts[path] = 0
+            self.live_counts[path] = 0
+            self.kept_counts[path] = 0
+        
+        for path in self.paths.values():
+            if not os.path.exists(path):
+                continue
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    # Lines written before incidents were tracked count as open and share one source
+                    entry.setdefault('source', None)
+                    entry.setdefault('state', OPEN)
+                    entry.setdefault('updated', entry['timestamp'])
+                    self._remember(entry)
+                    self.line_counts[path] += 1
+        
+        if self.index_path:
+            self.index = AlertIndex(self.index_path)
+            for path in self.paths.values():
+                self.index.refresh(path)
+    
+    def _store(self, key, entry):
+        # Live counts follow unresolved incidents, so resolving one lowers its log's compaction threshold
+        previous = self.incidents.get(key)
+        if previous is not None and previous['state'] != RESOLVED:
+            self.live_counts[self._path(previous)] -= 1
+        if entry['state'] != RESOLVED:
+            self.live_counts[self._path(entry)] += 1
+        self.incidents[key] = entry
+    
+    def _remember(self, entry):
+        key = (entry['aircraft_id'], entry['alert_type'], entry['source'])
+        self._store(key, entry)
+        
+        current = self.current.setdefault(key[0], {})
+        latest = current.get(key[1])
+        if latest is None or entry['timestamp'] >= self.incidents[latest]['timestamp']:
+            current[key[1]] = key
+    
+    def _transition(self, key, state, now):
+        entry = dict(self.incidents[key], state=state, updated=now)
+        self._store(key, entry)
+        return entry
+    
+    def sync(self, aircraft_id, source, alerts):
+        """Record the alerts raised by one reading of an aircraft and resolve the ones it no longer raises"""
+        self._load()
+        now = datetime.now().isoformat()
+        changes = []
+        raised = set()
+        
+        for alert in alerts:
+            raised.add(alert['alert_type'])
+            key = (aircraft_id, alert['alert_type'], source)
+            if key in self.incidents:
+                continue
+            
+            state = OPEN
+            previous = self.current.get(aircraft_id, {}).get(key[1])
+            if previous is not None and self.incidents[previous]['state'] != RESOLVED:
+                # The condition persists into the newer reading, so an acknowledgement still holds
+                state = self.incidents[previous]['state']
+                changes.append(self._transition(previous, RESOLVED, now))
+            
+            entry = {
+                'timestamp': alert['timestamp'],
+                'aircraft_id': aircraft_id,
+                'alert_type': alert['alert_type'],
+                'message': alert['message'],
+                'severity': alert['severity'],
+                'source': source,
+                'state': state,
+                'updated': now
+            }
+            self._remember(entry)
+            changes.append(entry)
+        
+        for alert_type, key in self.current.get(aircraft_id, {}).items():
+            if alert_type not in raised and self.incidents[key]['state'] != RESOLVED:
+                changes.append(self._transition(key, RESOLVED, now))
+        
+        self._write(changes)
+        return changes
+    
+    def acknowledge(self, aircraft_id, alert_type=None):
+        """Mark the aircraft's open incidents (optionally of one type) as acknowledged"""
+        self._load()
+        now = datetime.now().isoformat()
+        changes = []
+        for current_type, key in self.current.get(aircraft_id, {}).items():
+            if alert_type in (None, current_type) and self.incidents[key]['state'] == OPEN:
+                changes.append(self._transition(key, ACKNOWLEDGED, now))
+        
+        self._write(changes)
+        return len(changes)
+    
+    def state(self, aircraft_id, alert_type):
+        self._load()
+        key = self.current.get(aircraft_id, {}).get(alert_type)
+        return self.incidents[key]['state'] if key is not None else None
+    
+    def open_incidents(self):
+        self._load()
+        return [self.incidents[key] for current in self.current.values() for key in current.values()
+                if self.incidents[key]['state'] != RESOLVED]
+    
+    def _write(self, changes):
+        by_path = {}
+        for entry in changes:
+            by_path.setdefault(self._path(entry), []).append(entry)
+        
+        for path, entries in by_path.items():
+            try:
+                with open(path, 'a') as f:
+                    f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+            except Exception as e:
+                print(f"Error logging alerts to {path}: {e}")
+                continue
+            
+            self.line_counts[path] += len(entries)
+            # Measured against the last compaction too, so resolved incidents still within retention cannot
+            # make every write compact again
+            threshold = max(self.live_counts[path], self.kept_counts[path]) * self.compact_ratio
+            if self.line_counts[path] > max(self.min_compact_lines, threshold):
+                self.compact(path)
+            elif self.index is not None:
+                self.index.refresh(path)
+    
+    def compact(self, path=None):
+        """Rewrite the logs with the latest line of each incident, dropping long-resolved ones"""
+        self._load()
+        cutoff = (datetime.now() - self.retention).isoformat()
+        paths = [path] if path else list(self.paths.values())
+        
+        for path in paths:
+            kept = []
+            for key, entry in list(self.incidents.items()):
+                if self._path(entry) != path:
+                    continue
+                if entry['state'] == RESOLVED and entry['updated'] < cutoff:
+                    del self.incidents[key]
+                    if self.current[key[0]].get(key[1]) == key:
+                        del self.current[key[0]][key[1]]
+                    continue
+                kept.append(entry)
+            
+            kept.sort(key=lambda entry: entry['timestamp'])
+            temp_path = path + '.tmp'
+            try:
+                with open(temp_path, 'w') as f:
+                    f.write(''.join(json.dumps(entry) + '\n' for entry in kept))
+                os.replace(temp_path, path)
+            except Exception as e:
+                print(f"Error compacting {path}: {e}")
+                continue
+            
+            self.line_counts[path] = len(kept)
+            self.kept_counts[path] = len(kept)
+            if self.index is not None:
+                self.index.refresh(path)
@@ -0,0 +1,123 @@
+import numpy as np
+
+from modules.validation import ENGINE_METRICS
+
+FUEL_BURN_COLUMN = ENGINE_METRICS.index('fuel_burn_rate')
+
+def metric_matrix(engine_logs):
+    """Stack engine log metrics into an (n, len(ENGINE_METRICS)) float array"""
+    return np.array(
+        [[engine_log['metrics'][metric] for metric in ENGINE_METRICS] for engine_log in engine_logs],
+        dtype=float
+    ).reshape(-1, len(ENGINE_METRICS))
+
+def get_metric_matrix(logs_data):
+    """Stack the snapshot's engine log metrics once and share the array between modules"""
+    samples = logs_data.get('engine_metric_matrix')
+    if samples is None:
+        samples = metric_matrix(logs_data['engine_logs'])
+        logs_data['engine_metric_matrix'] = samples
+    return samples
+
+class MetricBaseline:
+    """Running mean and covariance of the engine metrics of one aircraft type"""
+    
+    def __init__(self, dimensions=len(ENGINE_METRICS)):
+        self.count = 0
+        self.mean = np.zeros(dimensions)
+        self.scatter = np.zeros((dimensions, dimensions))
+        self._inverse = None
+        self._inverse_count = 0
+    
+    def update(self, samples):
+        """Merge a batch of samples into the running statistics (Chan's parallel update)"""
+        count = len(samples)
+        if count == 0:
+            return
+        
+        batch_mean = samples.mean(axis=0)
+        centered = samples - batch_mean
+        total = self.count + count
+        delta = batch_mean - self.mean
+        
+        self.scatter += centered.T @ centered + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+    
+    @property
+    def covariance(self):
+        return self.scatter / max(self.count - 1, 1)
+    
+    def inverse_covariance(self):
+        # Streaming updates move the covariance slowly, so it is only re-inverted after 5% more samples
+        if self._inverse is None or self.count > self._inverse_count * 1.05:
+            covariance = self.covariance
+            # A small ridge keeps near-constant metrics from making the inverse explode
+            ridge = np.trace(covariance) / len(covariance) * 1e-6 + 1e-9
+            self._inverse = np.linalg.pinv(covariance + np.eye(len(covariance)) * ridge)
+            self._inverse_count = self.count
+        return self._inverse
+    
+    def distances(self, samples):
+        centered = samples - self.mean
+        squared = np.einsum('ij,jk,ik->i', centered, self.inverse_covariance(), centered)
+        return np.sqrt(np.maximum(squared, 0.0))
+
+class FleetAnomalyModel:
+    """Per-aircraft-type metric baselines scored by Mahalanobis distance"""
+    
+    def __init__(self, config):
+        anomaly = config.get('anomaly', {})
+        self.threshold = anomaly.get('mahalanobis_threshold', 5.4)
+        self.critical_threshold = anomaly.get('critical_threshold', 8.0)
+        self.min_samples = anomaly.get('min_samples', 30)
+        self.baselines = {}
+        self.aircraft_types = {}
+    
+    def register_flights(self, flights):
+        for flight in flights:
+            self.aircraft_types.setdefault(flight['aircraft_id'], flight['aircraft_type'])
+    
+    def type_of(self, aircraft_id):
+        return self.aircraft_types.get(aircraft_id, 'UNKNOWN')
+    
+    def _group(self, engine_logs):
+        groups = {}
+        for position, engine_log in enumerate(engine_logs):
+            groups.setdefault(self.type_of(engine_log['aircraft_id']), []).append(position)
+        return groups
+    
+    def update(self, engine_logs, samples=None):
+        if samples is None:
+            samples = metric_matrix(engine_logs)
+        for aircraft_type, positions in self._group(engine_logs).items():
+            baseline = self.baselines.setdefault(aircraft_type, MetricBaseline())
+            baseline.update(samples[positions])
+    
+    def score(self, engine_logs, samples=None):
+        """Distances for each log in one pass per aircraft type; NaN where the baseline is still too thin"""
+        if samples is None:
+            samples = metric_matrix(engine_logs)
+        distances = np.full(len(engine_logs), np.nan)
+        
+        for aircraft_type, positions in self._group(engine_logs).items():
+            baseline = self.baselines.get(aircraft_type)
+            if baseline is not None and baseline.count >= self.min_samples:
+                distances[positions] = baseline.distances(samples[positions])
+        return distances
+    
+    def fuel_baseline(self, aircraft_id, default=2500):
+        baseline = self.baselines.get(self.type_of(aircraft_id))
+        if baseline is None or baseline.count < self.min_samples:
+            return default
+        return float(baseline.mean[FUEL_BURN_COLUMN])
+
+def get_anomaly_model(config, logs_data):
+    """Fit the fleet baselines once per snapshot and share them between modules"""
+    model = logs_data.get('anomaly_model')
+    if model is None:
+        model = FleetAnomalyModel(config)
+        model.register_flights(logs_data.get('flight_schedule', []))
+        model.update(logs_data['engine_logs'], get_metric_matrix(logs_data))
+        logs_data['anomaly_model'] = model
+    return model
@@ -0,0 +1,207 @@
+import os
+import sqlite3
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_date TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS delay_predictions (
+    run_date TEXT NOT NULL,
+    flight_id TEXT NOT NULL,
+    aircraft_id TEXT,
+    route TEXT,
+    predicted_delay INTEGER,
+    severity TEXT,
+    reasons TEXT
+);
+CREATE TABLE IF NOT EXISTS health_alerts (
+    run_date TEXT NOT NULL,
+    aircraft_id TEXT NOT NULL,
+    alert_type TEXT,
+    severity TEXT,
+    message TEXT,
+    timestamp TEXT
+);
+CREATE TABLE IF NOT EXISTS load_predictions (
+    run_date TEXT NOT NULL,
+    flight_id TEXT NOT NULL,
+    route TEXT,
+    predicted_load INTEGER,
+    capacity INTEGER,
+    load_factor REAL,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS crew_compliance (
+    run_date TEXT NOT NULL,
+    flight_id TEXT NOT NULL,
+    is_compliant INTEGER,
+    issues TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_delay_date ON delay_predictions (run_date);
+CREATE INDEX IF NOT EXISTS idx_delay_flight ON delay_predictions (flight_id, run_date);
+CREATE INDEX IF NOT EXISTS idx_delay_aircraft ON delay_predictions (aircraft_id, run_date);
+CREATE INDEX IF NOT EXISTS idx_delay_route ON delay_predictions (route, run_date);
+CREATE INDEX IF NOT EXISTS idx_alert_date ON health_alerts (run_date);
+CREATE INDEX IF NOT EXISTS idx_alert_aircraft ON health_alerts (aircraft_id, run_date);
+CREATE INDEX IF NOT EXISTS idx_load_date ON load_predictions (run_date);
+CREATE INDEX IF NOT EXISTS idx_load_flight ON load_predictions (flight_id, run_date);
+CREATE INDEX IF NOT EXISTS idx_load_route ON load_predictions (route, run_date);
+CREATE INDEX IF NOT EXISTS idx_crew_date ON crew_compliance (run_date);
+CREATE INDEX IF NOT EXISTS idx_crew_flight ON crew_compliance (flight_id, run_date);
+"""
+
+class ReportArchive:
+    """SQLite archive of each daily run, indexed by date, flight, aircraft and route"""
+    
+    TABLES = ('delay_predictions', 'health_alerts', 'load_predictions', 'crew_compliance')
+    
+    def __init__(self, path='output/archive/operations.db'):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+    
+    def close(self):
+        self.connection.close()
+    
+    def record_run(self, run_date, **data):
+        """Store one run, replacing any earlier run archived for the same date"""
+        logs_data = data.get('logs_data', {})
+        delay_predictions = data.get('delay_predictions', {})
+        crew_schedule = data.get('crew_schedule', {})
+        load_predictions = data.get('load_predictions', {})
+        health_alerts = data.get('health_alerts', {})
+        
+        aircraft_by_flight = {
+            flight['flight_id']: flight.get('aircraft_id')
+            for flight in logs_data.get('flight_schedule', [])
+        }
+        
+        with self.connection:
+            for table in ('runs',) + self.TABLES:
+                self.connection.execute(f"DELETE FROM {table} WHERE run_date = ?", (run_date,))
+            
+            self.connection.execute(
+                "INSERT INTO runs (run_date, created_at) VALUES (?, ?)",
+                (run_date, datetime.now().isoformat())
+            )
+            
+            self.connection.executemany(
+                "INSERT INTO delay_predictions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((run_date, flight_id, aircraft_by_flight.get(flight_id), pred['route'],
+                  pred['predicted_delay'], pred['severity'], '; '.join(pred.get('reasons', [])))
+                 for flight_id, pred in delay_predictions.items())
+            )
+            
+            self.connection.executemany(
+                "INSERT INTO health_alerts VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_date, alert['aircraft_id'], alert['alert_type'], alert['severity'],
+                  alert['message'], alert['timestamp'])
+                 for alert in health_alerts.get('critical', []) + health_alerts.get('warning', []))
+            )
+            
+            self.connection.executemany(
+                "INSERT INTO load_predictions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((run_date, flight_id, pred['route'], pred['predicted_load'], pred['capacity'],
+                  pred['load_factor'], pred['status'])
+                 for flight_id, pred in load_predictions.items())
+            )
+            
+            self.connection.executemany(
+                "INSERT INTO crew_compliance VALUES (?, ?, ?, ?)",
+                ((run_date, flight_id, int(assignment['compliance_check']['is_compliant']),
+                  '; '.join(assignment['compliance_check']['issues']))
+                 for flight_id, assignment in crew_schedule.items())
+            )
+    
+    def run_dates(self):
+        return [row[0] for row in self.connection.execute("SELECT run_date FROM runs ORDER BY run_date")]
+    
+    def delay_profile(self, start_date, end_date, route=None, aircraft_id=None):
+        """Per-day flight count, delayed count and average predicted delay"""
+        query = """
+            SELECT run_date,
+                   COUNT(*),
+                   SUM(CASE WHEN predicted_delay > 0 THEN 1 ELSE 0 END),
+                   AVG(predicted_delay)
+            FROM delay_predictions
+            WHERE run_date BETWEEN ? AND ?
+        """
+        params = [start_date, end_date]
+        
+        if route:
+            query += " AND route = ?"
+            params.append(route)
+        if aircraft_id:
+            query += " AND aircraft_id = ?"
+            params.append(aircraft_id)
+        
+        query += " GROUP BY run_date ORDER BY run_date"
+        
+        return [
+            {'date': row[0], 'flights': row[1], 'delayed': row[2], 'average_delay': row[3]}
+            for row in self.connection.execute(query, params)
+        ]
+    
+    def flight_history(self, flight_id, start_date, end_date):
+        query = """
+            SELECT run_date, route, predicted_delay, severity, reasons
+            FROM delay_predictions
+            WHERE flight_id = ? AND run_date BETWEEN ? AND ?
+            ORDER BY run_date
+        """
+        return [
+            {'date': row[0], 'route': row[1], 'predicted_delay': row[2],
+             'severity': row[3], 'reasons': row[4]}
+            for row in self.connection.execute(query, (flight_id, start_date, end_date))
+        ]
+    
+    def alert_history(self, aircraft_id, start_date, end_date, severity=None):
+        query = """
+            SELECT run_date, alert_type, severity, message, timestamp
+            FROM health_alerts
+            WHERE aircraft_id = ? AND run_date BETWEEN ? AND ?
+        """
+        params = [aircraft_id, start_date, end_date]
+        
+        if severity:
+            query += " AND severity = ?"
+            params.append(severity)
+        
+        query += " ORDER BY run_date"
+        
+        return [
+            {'date': row[0], 'alert_type': row[1], 'severity': row[2],
+             'message': row[3], 'timestamp': row[4]}
+            for row in self.connection.execute(query, params)
+        ]
+    
+    def load_trend(self, route, start_date, end_date):
+        query = """
+            SELECT run_date, COUNT(*), AVG(load_factor),
+                   SUM(CASE WHEN status = 'OVERBOOKING RISK' THEN 1 ELSE 0 END)
+            FROM load_predictions
+            WHERE route = ? AND run_date BETWEEN ? AND ?
+            GROUP BY run_date ORDER BY run_date
+        """
+        return [
+            {'date': row[0], 'flights': row[1], 'average_load_factor': row[2], 'overbooking_risk': row[3]}
+            for row in self.connection.execute(query, (route, start_date, end_date))
+        ]
+    
+    def compliance_trend(self, start_date, end_date):
+        query = """
+            SELECT run_date, COUNT(*), SUM(is_compliant)
+            FROM crew_compliance
+            WHERE run_date BETWEEN ? AND ?
+            GROUP BY run_date ORDER BY run_date
+        """
+        return [
+            {'date': row[0], 'flights': row[1], 'compliant': row[2]}
+            for row in self.connection.execute(query, (start_date, end_date))
+        ]
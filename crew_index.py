@@ -0,0 +1,102 @@
+import bisect
+
+from modules.settings import get_compiled_config
+
+PILOT_ROLES = ('Pilot', 'Co-Pilot')
+CABIN_ROLES = ('Senior Attendant', 'Attendant')
+
+class CrewAvailabilityIndex:
+    """Cumulative crew counts per base airport, bucketed by ready time"""
+    
+    BUCKET_SECONDS = 3600
+    
+    def __init__(self, config, crew_members):
+        self.config = config
+        self.crew_rules = config['crew_rules']
+        self.aircraft = get_compiled_config(config).aircraft
+        self.buckets = {}
+        self.cumulative = {}
+        self._build(crew_members)
+    
+    def _build(self, crew_members):
+        counts_by_airport = {}
+        
+        for crew in crew_members:
+            if crew['role'] in PILOT_ROLES:
+                slot = 0
+            elif crew['role'] in CABIN_ROLES:
+                slot = 1
+            else:
+                continue
+            
+            # Crew on duty are committed to their current flights; like the baseline, only free crew are counted
+            if crew['status'] == 'ON_DUTY':
+                continue
+            
+            if crew['duty_hours_today'] > self.crew_rules['max_duty_hours']:
+                continue
+            
+            if len(crew['assigned_flights']) >= self.crew_rules['max_consecutive_flights']:
+                continue
+            
+            ready_at = self._ready_time(crew)
+            
+            # Round up so a crew member only counts for buckets they are ready for in full
+            bucket = -(-int(ready_at) // self.BUCKET_SECONDS)
+            airport_counts = counts_by_airport.setdefault(crew['current_location'], {})
+            bucket_counts = airport_counts.setdefault(bucket, [0, 0])
+            bucket_counts[slot] += 1
+        
+        for airport, airport_counts in counts_by_airport.items():
+            keys = sorted(airport_counts)
+            cumulative = []
+            pilots = 0
+            cabin = 0
+            for key in keys:
+                pilots += airport_counts[key][0]
+                cabin += airport_counts[key][1]
+                cumulative.append((pilots, cabin))
+            
+            self.buckets[airport] = keys
+            self.cumulative[airport] = cumulative
+    
+    def _ready_time(self, crew):
+        ready_at = crew['available_ts']
+        
+        # Crew short of the minimum rest have to finish it before reporting
+        rest_remaining = crew['rest_hours_remaining']
+        if rest_remaining < self.crew_rules['min_rest_hours']:
+            ready_at += (self.crew_rules['min_rest_hours'] - rest_remaining) * 3600
+        
+        return ready_at
+    
+    def available_at(self, airport, timestamp):
+        """Return (pilots, cabin_crew) ready at airport by timestamp"""
+        keys = self.buckets.get(airport)
+        if not keys:
+            return 0, 0
+        
+        position = bisect.bisect_right(keys, int(timestamp) // self.BUCKET_SECONDS)
+        if position == 0:
+            return 0, 0
+        
+        return self.cumulative[airport][position - 1]
+    
+    def shortfall(self, flight):
+        spec = self.aircraft[flight['aircraft_type']]
+        
+        airport = flight['route'].split('-')[0]
+        pilots, cabin = self.available_at(airport, flight['departure_ts'])
+        
+        return {
+            'pilots': max(0, spec.pilots - pilots),
+            'crew': max(0, spec.crew - cabin)
+        }
+
+def get_crew_index(config, logs_data):
+    """Build the crew index once per snapshot and share it between modules"""
+    index = logs_data.get('crew_index')
+    if index is None:
+        index = CrewAvailabilityIndex(config, logs_data['crew_schedules'])
+        logs_data['crew_index'] = index
+    return index
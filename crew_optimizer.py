@@ -1,9 +1,13 @@
 from datetime import datetime, timedelta
 
+from modules.pairing import PairingGenerator
+from modules.settings import get_compiled_config
+
 class CrewOptimizer:
     def __init__(self, config):
         self.config = config
         self.crew_rules = config['crew_rules']
+        self.aircraft = get_compiled_config(config).aircraft
     
     def optimize_schedule(self, logs_data):
         flights = logs_data['flight_schedule']
@@ -12,25 +16,29 @@ class CrewOptimizer:
         schedule = {}
         
         for flight in flights:
-            flight_id = flight['flight_id']
-            aircraft_type = flight.get('aircraft_type', 'A320')
-            
-            aircraft_size = self.config['aircraft_types'][aircraft_type]['type']
-            required_crew = self.crew_rules['required_crew_per_flight'][aircraft_size]
-            
-            assigned_crew = self._assign_crew_to_flight(
-                flight, crew_members, required_crew
-            )
-            
-            schedule[flight_id] = {
-                'flight': flight,
-                'required_crew': required_crew,
-                'assigned_crew': assigned_crew,
-                'compliance_check': self._check_compliance(flight, assigned_crew)
-            }
+            schedule[flight['flight_id']] = self.assign_flight(flight, crew_members)
         
         return schedule
     
+    def assign_flight(self, flight, crew_members):
+        spec = self.aircraft[flight['aircraft_type']]
+        required_crew = {'pilots': spec.pilots, 'crew': spec.crew}
+        
+        assigned_crew = self._assign_crew_to_flight(
+            flight, crew_members, required_crew
+        )
+        
+        return {
+            'flight': flight,
+            'required_crew': required_crew,
+            'assigned_crew': assigned_crew,
+            'compliance_check': self._check_compliance(flight, assigned_crew)
+        }
+    
+    def build_pairings(self, logs_data):
+        """Multi-leg duty periods covering the day's flights within duty, leg and connection limits"""
+        return PairingGenerator(self.config).generate(logs_data)
+    
     def _assign_crew_to_flight(self, flight, crew_members, required_crew):
         assigned = {
             'pilots': [],
@@ -76,16 +84,16 @@ class CrewOptimizer:
         return assigned
     
     def _is_crew_available(self, crew, flight):
-        if crew.get('duty_hours_today', 0) > self.crew_rules['max_duty_hours']:
+        if crew['duty_hours_today'] > self.crew_rules['max_duty_hours']:
             return False
         
-        if crew.get('rest_hours_remaining', 0) < self.crew_rules['min_rest_hours']:
+        if crew['rest_hours_remaining'] < self.crew_rules['min_rest_hours']:
             return False
         
-        if len(crew.get('assigned_flights', [])) >= self.crew_rules['max_consecutive_flights']:
+        if len(crew['assigned_flights']) >= self.crew_rules['max_consecutive_flights']:
             return False
         
-        if crew.get('status') != 'AVAILABLE':
+        if crew['status'] != 'AVAILABLE':
             return False
         
         return True
@@ -118,7 +126,7 @@ class CrewOptimizer:
             compliance = assignment['compliance_check']
             
             print(f"\nFlight: {flight_id} ({flight['route']})")
-            print(f"  Scheduled: {flight['scheduled_departure'][11:16]}")
+            print(f"  Scheduled: {datetime.fromtimestamp(flight['departure_ts']).strftime('%H:%M')}")
             print(f"  Aircraft: {flight['aircraft_id']} ({flight['aircraft_type']})")
             print(f"  Status: {flight['status']}")
             
@@ -144,4 +152,22 @@ class CrewOptimizer:
                     print(f"    {issue}")
             
             print("-" * 80)
-            
\ No newline at end of file
+    
+    def display_pairings(self, result):
+        print("\n" + "="*80)
+        print("CREW PAIRINGS")
+        print("="*80)
+        
+        for number, pairing in enumerate(result['pairings'], 1):
+            report = datetime.fromtimestamp(pairing['report_ts']).strftime('%H:%M')
+            release = datetime.fromtimestamp(pairing['release_ts']).strftime('%H:%M')
+            print(f"\nPairing {number}: {pairing['start_airport']} -> {pairing['end_airport']} "
+                  f"({report}-{release}, {pairing['duty_hours']:.1f} h)")
+            print(f"  Legs: {', '.join(pairing['legs'])}")
+            if pairing['deadhead_legs']:
+                print(f"  Deadhead: {', '.join(pairing['deadhead_legs'])}")
+            print(f"  Crew: {pairing['required_crew']['pilots']} pilots, {pairing['required_crew']['crew']} cabin crew")
+        
+        print(f"\nPairings: {len(result['pairings'])} chosen from {result['candidate_duties']} legal duties")
+        if result['uncovered_flights']:
+            print(f"Uncovered flights: {', '.join(result['uncovered_flights'])}")
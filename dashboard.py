@@ -1,262 +1,320 @@
+import shutil
+import sys
+import time
 from datetime import datetime
-import statistics
+
+from modules.summary import OperationsSummary
+
+# Dashboard sections in display order, named after the summary part each one renders
+SECTIONS = (
+    ('flights', '_flight_summary_lines'),
+    ('delays', '_delay_summary_lines'),
+    ('crew', '_crew_status_lines'),
+    ('loads', '_load_summary_lines'),
+    ('health', '_health_summary_lines'),
+    ('tails', '_tail_assignment_lines'),
+    ('routes', '_route_analysis_lines'),
+    ('weather', '_weather_risk_lines')
+)
+
+HIDE_CURSOR = '\x1b[?25l'
+SHOW_CURSOR = '\x1b[?25h'
+CLEAR_SCREEN = '\x1b[2J'
+CLEAR_LINE = '\x1b[K'
+CLEAR_BELOW = '\x1b[J'
 
 class Dashboard:
     def __init__(self, config):
         self.config = config
     
     def display(self, **data):
-        print("\n" + "="*100)
-        print("AIRLINE OPERATIONS DASHBOARD")
-        print("="*100)
-        
-        logs_data = data.get('logs_data', {})
-        delay_predictions = data.get('delay_predictions', {})
-        crew_schedule = data.get('crew_schedule', {})
-        load_predictions = data.get('load_predictions', {})
-        health_alerts = data.get('health_alerts', {})
-        route_suggestions = data.get('route_suggestions', [])
-        
-        self._display_flight_summary(logs_data)
-        self._display_delay_summary(delay_predictions)
-        self._display_crew_status(crew_schedule, logs_data)
-        self._display_load_summary(load_predictions)
-        self._display_health_summary(health_alerts)
-        self._display_route_analysis(route_suggestions)
-        self._display_weather_risk(logs_data)
-        
-        print("\n" + "="*100)
-        print("END OF DASHBOARD")
-        print("="*100)
+        summary = OperationsSummary.build(**data)
+        
+        lines = self._header_lines()
+        for _, method in SECTIONS:
+            lines.extend(getattr(self, method)(summary))
+        lines.extend(self._footer_lines())
+        
+        print('\n'.join(lines))
     
-    def _display_flight_summary(self, logs_data):
-        flights = logs_data.get('flight_schedule', [])
-        
-        print("\nFLIGHT OPERATIONS SUMMARY")
-        print("-" * 50)
-        print(f"Total Flights Monitored: {len(flights)}")
-        
-        if flights:
-            status_count = {}
-            for flight in flights:
-                status = flight.get('status', 'UNKNOWN')
-                status_count[status] = status_count.get(status, 0) + 1
-            
-            print("\nFlight Status Distribution:")
-            for status, count in status_count.items():
-                print(f"  {status}: {count}")
-            
-            delays = [f.get('current_delay', 0) for f in flights]
-            avg_delay = statistics.mean(delays) if delays else 0
-            print(f"\nAverage Current Delay: {avg_delay:.1f} minutes")
+    def _header_lines(self):
+        return ["", "="*100, "AIRLINE OPERATIONS DASHBOARD", "="*100]
+    
+    def _footer_lines(self):
+        return ["", "="*100, "END OF DASHBOARD", "="*100]
+    
+    def _flight_summary_lines(self, summary):
+        lines = ["", "FLIGHT OPERATIONS SUMMARY", "-" * 50]
+        lines.append(f"Total Flights Monitored: {summary.total_flights}")
+        
+        if summary.total_flights:
+            lines.extend(["", "Flight Status Distribution:"])
+            for status, count in summary.flight_status_count.items():
+                lines.append(f"  {status}: {count}")
             
-            aircraft_types = {}
-            for flight in flights:
-                ac_type = flight.get('aircraft_type', 'UNKNOWN')
-                aircraft_types[ac_type] = aircraft_types.get(ac_type, 0) + 1
+            lines.extend(["", f"Average Current Delay: {summary.average_current_delay:.1f} minutes"])
             
-            print("\nAircraft Fleet Distribution:")
-            for ac_type, count in aircraft_types.items():
-                print(f"  {ac_type}: {count}")
+            lines.extend(["", "Aircraft Fleet Distribution:"])
+            for ac_type, count in summary.aircraft_type_count.items():
+                lines.append(f"  {ac_type}: {count}")
+        return lines
     
-    def _display_delay_summary(self, delay_predictions):
-        print("\nDELAY PREDICTIONS SUMMARY")
-        print("-" * 50)
+    def _delay_summary_lines(self, summary):
+        lines = ["", "DELAY PREDICTIONS SUMMARY", "-" * 50]
         
-        if not delay_predictions:
-            print("No delay predictions available")
-            return
+        if not summary.prediction_count:
+            lines.append("No delay predictions available")
+            return lines
         
-        severity_count = {'NONE': 0, 'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
-        total_delay = 0
-        delayed_flights = 0
+        lines.append(f"Flights with Predicted Delays: {summary.delayed_flights}/{summary.prediction_count}")
+        lines.append(f"Total Predicted Delay Minutes: {summary.total_predicted_delay}")
+        quantile = summary.delay_quantiles.quantile
+        lines.append(f"Predicted Delay p50/p90/p99: {quantile(0.5):.0f} / {quantile(0.9):.0f} / {quantile(0.99):.0f} min")
         
-        for prediction in delay_predictions.values():
-            severity = prediction.get('severity', 'NONE')
-            severity_count[severity] = severity_count.get(severity, 0) + 1
-            
-            delay = prediction.get('predicted_delay', 0)
-            total_delay += delay
-            if delay > 0:
-                delayed_flights += 1
-        
-        print(f"Flights with Predicted Delays: {delayed_flights}/{len(delay_predictions)}")
-        print(f"Total Predicted Delay Minutes: {total_delay}")
-        
-        print("\nDelay Severity Distribution:")
-        for severity, count in severity_count.items():
-            print(f"  {severity}: {count}")
-        
-        if delayed_flights > 0:
-            print("\nTop 3 Most Delayed Flights:")
-            sorted_predictions = sorted(
-                delay_predictions.items(),
-                key=lambda x: x[1].get('predicted_delay', 0),
-                reverse=True
-            )[:3]
-            
-            for flight_id, prediction in sorted_predictions:
+        lines.extend(["", "Delay Severity Distribution:"])
+        for severity, count in summary.delay_severity_count.items():
+            lines.append(f"  {severity}: {count}")
+        
+        if summary.delayed_flights > 0:
+            lines.extend(["", "Top 3 Most Delayed Flights:"])
+            for flight_id, prediction in summary.top_delays:
                 if prediction['predicted_delay'] > 0:
-                    print(f"  {flight_id}: {prediction['predicted_delay']} min - {prediction['route']}")
+                    lines.append(f"  {flight_id}: {prediction['predicted_delay']} min - {prediction['route']}")
+        return lines
     
-    def _display_crew_status(self, crew_schedule, logs_data):
-        print("\nCREW STATUS SUMMARY")
-        print("-" * 50)
+    def _crew_status_lines(self, summary):
+        lines = ["", "CREW STATUS SUMMARY", "-" * 50]
         
-        crew_members = logs_data.get('crew_schedules', [])
-        print(f"Total Crew Members: {len(crew_members)}")
+        lines.append(f"Total Crew Members: {summary.total_crew}")
         
-        if crew_members:
-            status_count = {}
-            role_count = {}
-            
-            for crew in crew_members:
-                status = crew.get('status', 'UNKNOWN')
-                role = crew.get('role', 'UNKNOWN')
-                
-                status_count[status] = status_count.get(status, 0) + 1
-                role_count[role] = role_count.get(role, 0) + 1
+        if summary.total_crew:
+            lines.extend(["", "Crew Availability:"])
+            for status, count in summary.crew_status_count.items():
+                lines.append(f"  {status}: {count}")
             
-            print("\nCrew Availability:")
-            for status, count in status_count.items():
-                print(f"  {status}: {count}")
-            
-            print("\nCrew Role Distribution:")
-            for role, count in role_count.items():
-                print(f"  {role}: {count}")
+            lines.extend(["", "Crew Role Distribution:"])
+            for role, count in summary.crew_role_count.items():
+                lines.append(f"  {role}: {count}")
         
-        if crew_schedule:
-            compliant = 0
-            non_compliant = 0
-            
-            for assignment in crew_schedule.values():
-                if assignment['compliance_check']['is_compliant']:
-                    compliant += 1
-                else:
-                    non_compliant += 1
+        if summary.assignment_count:
+            non_compliant = summary.non_compliant_count
             
-            print(f"\nCrew Assignment Compliance: {compliant}/{len(crew_schedule)} flights compliant")
+            lines.extend(["", f"Crew Assignment Compliance: {summary.compliant_assignments}/{summary.assignment_count} flights compliant"])
             if non_compliant > 0:
-                print(f"  {non_compliant} flights have crew assignment issues")
+                lines.append(f"  {non_compliant} flights have crew assignment issues")
+        return lines
     
-    def _display_load_summary(self, load_predictions):
-        print("\nPASSENGER LOAD SUMMARY")
-        print("-" * 50)
-        
-        if not load_predictions:
-            print("No load predictions available")
-            return
-        
-        total_capacity = 0
-        total_predicted = 0
-        status_count = {}
-        
-        for prediction in load_predictions.values():
-            total_capacity += prediction.get('capacity', 0)
-            total_predicted += prediction.get('predicted_load', 0)
-            
-            status = prediction.get('status', 'UNKNOWN')
-            status_count[status] = status_count.get(status, 0) + 1
-        
-        if total_capacity > 0:
-            overall_load_factor = total_predicted / total_capacity
-            print(f"Overall Load Factor: {overall_load_factor:.1%}")
-            print(f"Total Predicted Passengers: {total_predicted}")
-            print(f"Total Available Seats: {total_capacity}")
-        
-        print("\nFlight Status Distribution:")
-        for status, count in status_count.items():
-            print(f"  {status}: {count}")
-        
-        overbooking_risks = [f for f, p in load_predictions.items() 
-                           if p.get('status') == 'OVERBOOKING RISK']
-        
-        if overbooking_risks:
-            print(f"\nOverbooking Risk: {len(overbooking_risks)} flights")
-            for flight_id in overbooking_risks[:3]:
-                print(f"  {flight_id}")
+    def _load_summary_lines(self, summary):
+        lines = ["", "PASSENGER LOAD SUMMARY", "-" * 50]
+        
+        if not summary.load_prediction_count:
+            lines.append("No load predictions available")
+            return lines
+        
+        if summary.total_capacity > 0:
+            lines.append(f"Overall Load Factor: {summary.overall_load_factor:.1%}")
+            lines.append(f"Total Predicted Passengers: {summary.total_predicted_passengers}")
+            lines.append(f"Total Available Seats: {summary.total_capacity}")
+        
+        quantile = summary.load_factor_quantiles.quantile
+        lines.append(f"Load Factor p10/p50/p90: {quantile(0.1):.0%} / {quantile(0.5):.0%} / {quantile(0.9):.0%}")
+        
+        lines.extend(["", "Flight Status Distribution:"])
+        for status, count in summary.load_status_count.items():
+            lines.append(f"  {status}: {count}")
+        
+        if summary.overbooking_flights:
+            lines.extend(["", f"Overbooking Risk: {summary.overbooking_count} flights"])
+            for flight_id, _ in summary.overbooking_flights[:3]:
+                lines.append(f"  {flight_id}")
+        return lines
     
-    def _display_health_summary(self, health_alerts):
-        print("\nAIRCRAFT HEALTH SUMMARY")
-        print("-" * 50)
+    def _health_summary_lines(self, summary):
+        lines = ["", "AIRCRAFT HEALTH SUMMARY", "-" * 50]
         
-        critical = len(health_alerts.get('critical', []))
-        warning = len(health_alerts.get('warning', []))
+        critical = summary.critical_alert_count
+        warning = summary.warning_alert_count
         
-        print(f"Critical Alerts: {critical}")
-        print(f"Warning Alerts: {warning}")
+        lines.append(f"Critical Alerts: {critical}")
+        lines.append(f"Warning Alerts: {warning}")
         
         if critical > 0:
-            print("\nCRITICAL ALERTS:")
-            for alert in health_alerts['critical'][:3]:
-                print(f"  {alert['aircraft_id']}: {alert['alert_type']}")
-        
-        if health_alerts.get('critical') or health_alerts.get('warning'):
-            all_alerts = health_alerts.get('critical', []) + health_alerts.get('warning', [])
-            alert_types = {}
-            
-            for alert in all_alerts:
-                alert_type = alert.get('alert_type', 'UNKNOWN')
-                alert_types[alert_type] = alert_types.get(alert_type, 0) + 1
-            
-            print("\nAlert Type Distribution:")
-            for alert_type, count in alert_types.items():
-                print(f"  {alert_type}: {count}")
+            lines.extend(["", "CRITICAL ALERTS:"])
+            for alert in summary.critical_alerts[:3]:
+                lines.append(f"  {alert['aircraft_id']}: {alert['alert_type']}")
+        
+        if summary.alert_type_count:
+            lines.extend(["", "Alert Type Distribution:"])
+            for alert_type, count in summary.alert_type_count.items():
+                lines.append(f"  {alert_type}: {count}")
+        return lines
     
-    def _display_route_analysis(self, route_suggestions):
-        print("\nROUTE ANALYSIS SUMMARY")
-        print("-" * 50)
-        
-        if not route_suggestions:
-            print("No route issues detected")
-            return
+    def _tail_assignment_lines(self, summary):
+        lines = ["", "TAIL ASSIGNMENT", "-" * 50]
+        
+        if not summary.grounded_aircraft:
+            lines.append("No aircraft grounded")
+            return lines
+        
+        lines.append(f"Grounded Aircraft: {', '.join(summary.grounded_aircraft)}")
+        lines.append(f"Reassigned Flights: {summary.tail_change_count}")
+        for change in summary.tail_changes[:3]:
+            lines.append(f"  {change['flight_id']}: {change['from_aircraft']} -> {change['to_aircraft']}")
+        
+        if summary.unassigned_flights:
+            lines.extend(["", f"Flights Without a Tail: {summary.unassigned_count}"])
+            for flight in summary.unassigned_flights[:3]:
+                lines.append(f"  {flight['flight_id']}: {flight['reason']}")
+        return lines
+    
+    def _route_analysis_lines(self, summary):
+        lines = ["", "ROUTE ANALYSIS SUMMARY", "-" * 50]
         
-        print(f"Flights with Route Issues: {len(route_suggestions)}")
+        if not summary.route_issue_count:
+            lines.append("No route issues detected")
+            return lines
         
-        high_severity = [r for r in route_suggestions if r.get('severity') == 'HIGH']
-        medium_severity = [r for r in route_suggestions if r.get('severity') == 'MEDIUM']
+        lines.append(f"Flights with Route Issues: {summary.route_issue_count}")
         
-        if high_severity:
-            print("\nHIGH SEVERITY ISSUES:")
-            for suggestion in high_severity[:3]:
-                print(f"  {suggestion['flight_id']} ({suggestion['route']}):")
+        if summary.high_severity_routes:
+            lines.extend(["", "HIGH SEVERITY ISSUES:"])
+            for suggestion in summary.high_severity_routes[:3]:
+                lines.append(f"  {suggestion['flight_id']} ({suggestion['route']}):")
                 for issue in suggestion.get('issues', [])[:2]:
-                    print(f"    {issue}")
-        
-        if medium_severity:
-            print("\nMEDIUM SEVERITY ISSUES:")
-            for suggestion in medium_severity[:2]:
-                print(f"  {suggestion['flight_id']} ({suggestion['route']}):")
-                print(f"    {suggestion.get('suggestion', 'No suggestion')}")
+                    lines.append(f"    {issue}")
+        
+        if summary.medium_severity_routes:
+            lines.extend(["", "MEDIUM SEVERITY ISSUES:"])
+            for suggestion in summary.medium_severity_routes[:2]:
+                lines.append(f"  {suggestion['flight_id']} ({suggestion['route']}):")
+                lines.append(f"    {suggestion.get('suggestion', 'No suggestion')}")
+        return lines
     
-    def _display_weather_risk(self, logs_data):
-        print("\nWEATHER RISK SUMMARY")
-        print("-" * 50)
-        
-        weather_logs = logs_data.get('weather_logs', [])
-        
-        if not weather_logs:
-            print("No weather data available")
-            return
-        
-        conditions = {}
-        for log in weather_logs:
-            condition = log['weather_data'].get('conditions', 'UNKNOWN')
-            conditions[condition] = conditions.get(condition, 0) + 1
+    def _weather_risk_lines(self, summary):
+        lines = ["", "WEATHER RISK SUMMARY", "-" * 50]
         
-        print("Current Weather Conditions:")
-        for condition, count in conditions.items():
-            print(f"  {condition}: {count}")
+        if not summary.weather_report_count:
+            lines.append("No weather data available")
+            return lines
         
-        risky_conditions = ['Thunderstorm', 'Fog', 'Rain']
-        risky_airports = []
+        lines.append("Current Weather Conditions:")
+        for condition, count in summary.weather_condition_count.items():
+            lines.append(f"  {condition}: {count}")
         
-        for log in weather_logs:
-            condition = log['weather_data'].get('conditions', '')
-            if condition in risky_conditions:
-                airport = log.get('airport', 'UNKNOWN')
-                if airport not in risky_airports:
-                    risky_airports.append(airport)
-        
-        if risky_airports:
-            print(f"\nRisky Weather at: {', '.join(risky_airports)}")
\ No newline at end of file
+        if summary.risky_airports:
+            lines.extend(["", f"Risky Weather at: {', '.join(summary.risky_airports)}"])
+        return lines
+
+class LiveDashboard:
+    """Keeps the dashboard on screen, redrawing only the lines that changed since the last refresh
+    
+    A section is rebuilt only when one of its summary inputs was replaced by
+    an unequal value; inputs mutated in place must be named in `changed`.
+    A frame taller than the terminal is split into pages at section
+    boundaries, and run() turns to the next page on every poll.
+    """
+    
+    def __init__(self, dashboard, stream=None):
+        self.dashboard = dashboard
+        self.stream = stream or sys.stdout
+        self.inputs = {}
+        self.sections = {}
+        self.status = ''
+        self.notice = ''
+        self.page = 0
+        self.screen = []
+    
+    def refresh(self, changed=(), **data):
+        """Rebuild the sections whose inputs changed and redraw; returns the rebuilt section names"""
+        inputs = OperationsSummary.inputs(**data)
+        stale = set(changed)
+        for name, value in inputs.items():
+            previous = self.inputs.get(name)
+            # Holding the previous objects keeps identity checks sound; equal replacements cost one comparison
+            if name not in self.inputs or (value is not previous and value != previous):
+                stale.add(name)
+        self.inputs = inputs
+        
+        rebuilt = []
+        for part, method in SECTIONS:
+            if part not in self.sections or stale.intersection(OperationsSummary.PARTS[part]):
+                summary = OperationsSummary.build_part(part, inputs)
+                self.sections[part] = getattr(self.dashboard, method)(summary)
+                rebuilt.append(part)
+        
+        self.status = (f"Updated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                       f"  rebuilt: {', '.join(rebuilt) or 'none'}")
+        self.show()
+        return rebuilt
+    
+    def _pages(self, height):
+        """The frame packed into pages of at most height lines, starting a new page at a section that would not fit"""
+        blocks = [self.dashboard._header_lines()]
+        blocks.extend(self.sections[part] for part, _ in SECTIONS)
+        blocks.append(self.dashboard._footer_lines())
+        
+        pages = [[]]
+        for block in blocks:
+            if pages[-1] and len(pages[-1]) + len(block) > height:
+                pages.append([])
+            # A section taller than the whole terminal is cut across pages
+            for line in block:
+                if len(pages[-1]) == height:
+                    pages.append([])
+                pages[-1].append(line)
+        return pages
+    
+    def show(self):
+        """Draw the current page of the last refreshed frame"""
+        if not self.sections:
+            return
+        _, rows = shutil.get_terminal_size()
+        pages = self._pages(max(rows - 1, 1))
+        self.page %= len(pages)
+        
+        status = f"{self.status}  (Ctrl+C to stop)"
+        if self.notice:
+            status = f"{self.notice}  {status}"
+        if len(pages) > 1:
+            status = f"Page {self.page + 1}/{len(pages)}  {status}"
+        self._draw(pages[self.page] + [status])
+    
+    def _draw(self, lines):
+        columns, _ = shutil.get_terminal_size()
+        # Wrapped lines would break row addressing, so each is cut to the terminal width
+        lines = [line[:columns] for line in lines]
+        
+        output = []
+        if not self.screen:
+            output.append(CLEAR_SCREEN)
+        for row, line in enumerate(lines):
+            if row >= len(self.screen) or self.screen[row] != line:
+                output.append(f"\x1b[{row + 1};1H{line}{CLEAR_LINE}")
+        if len(lines) < len(self.screen):
+            output.append(f"\x1b[{len(lines) + 1};1H{CLEAR_BELOW}")
+        output.append(f"\x1b[{len(lines) + 1};1H")
+        
+        self.stream.write(''.join(output))
+        self.stream.flush()
+        self.screen = lines
+    
+    def run(self, source, interval=5.0, iterations=None):
+        """Poll source() every interval seconds; it returns dashboard data, or None when nothing changed"""
+        self.stream.write(HIDE_CURSOR)
+        try:
+            count = 0
+            while iterations is None or count < iterations:
+                data = source()
+                if data is not None:
+                    self.refresh(**data)
+                else:
+                    self.show()
+                count += 1
+                if iterations is None or count < iterations:
+                    time.sleep(interval)
+                    self.page += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stream.write(SHOW_CURSOR + '\n')
+            self.stream.flush()
@@ -0,0 +1,107 @@
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'GADM'
+VERSION = 1
+
+# One column per delay rule, so the learned weights read as re-fitted penalty minutes
+FEATURES = (
+    'origin_crosswind', 'origin_thunderstorm', 'origin_low_visibility',
+    'destination_crosswind', 'destination_thunderstorm', 'destination_low_visibility',
+    'thrust_deviation', 'maintenance_warning', 'low_cabin_pressure',
+    'runway_queue_minutes', 'boarding_overrun', 'pilot_shortfall', 'cabin_shortfall'
+)
+
+class DelayModel:
+    """Ridge regression on standardized delay features, scored as one matrix product"""
+    
+    def __init__(self, features, weights, intercept, mean, scale):
+        self.features = tuple(features)
+        self.weights = np.asarray(weights, dtype=float)
+        self.intercept = float(intercept)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+    
+    @classmethod
+    def fit(cls, samples, targets, features=FEATURES, ridge=1.0):
+        samples = np.asarray(samples, dtype=float)
+        targets = np.asarray(targets, dtype=float)
+        
+        mean = samples.mean(axis=0)
+        scale = samples.std(axis=0)
+        scale[scale == 0] = 1.0
+        standardized = (samples - mean) / scale
+        
+        # Closed-form ridge; the intercept is the target mean because the features are centred
+        intercept = targets.mean()
+        gram = standardized.T @ standardized + np.eye(standardized.shape[1]) * ridge
+        weights = np.linalg.solve(gram, standardized.T @ (targets - intercept))
+        return cls(features, weights, intercept, mean, scale)
+    
+    def predict(self, samples):
+        standardized = (np.asarray(samples, dtype=float) - self.mean) / self.scale
+        return np.maximum(standardized @ self.weights + self.intercept, 0.0)
+    
+    def penalty_minutes(self):
+        """Minutes added per unit of each raw feature, for comparison with the fixed rule penalties"""
+        return dict(zip(self.features, (self.weights / self.scale).tolist()))
+    
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        names = '\n'.join(self.features).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<HHI', VERSION, len(self.features), len(names)))
+            f.write(names)
+            f.write(struct.pack('<d', self.intercept))
+            for array in (self.weights, self.mean, self.scale):
+                f.write(array.astype('<f8').tobytes())
+        return path
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a delay model artifact")
+        
+        version, count, names_length = struct.unpack_from('<HHI', data, 4)
+        if version != VERSION:
+            raise ValueError(f"unsupported delay model version {version}")
+        
+        offset = 12
+        features = data[offset:offset + names_length].decode('utf-8').split('\n')
+        offset += names_length
+        intercept, = struct.unpack_from('<d', data, offset)
+        offset += 8
+        
+        arrays = []
+        for _ in range(3):
+            arrays.append(np.frombuffer(data, dtype='<f8', count=count, offset=offset))
+            offset += count * 8
+        
+        weights, mean, scale = arrays
+        return cls(features, weights, intercept, mean, scale)
+
+def load_delay_model(config):
+    """The trained model named in the config, or None when it is missing or built for other features"""
+    path = config.get('delay_model', {}).get('artifact_path')
+    if not path or not os.path.exists(path):
+        return None
+    
+    try:
+        model = DelayModel.load(path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Ignoring delay model {path}: {e}")
+        return None
+    
+    if model.features != FEATURES:
+        print(f"Ignoring delay model {path}: trained on different features")
+        return None
+    return model
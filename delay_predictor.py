@@ -1,138 +1,156 @@
 from datetime import datetime
 
+from modules.crew_index import get_crew_index
+from modules.delay_model import FEATURES, load_delay_model
+from modules.health_monitor import get_latest_engine_logs
+from modules.memo import cache_key, config_hash, get_record_hashes, get_result_cache, memoized
+from modules.propagation import DelayPropagator, delay_severity
+from modules.records import DelayPrediction
+from modules.settings import get_compiled_config
+from modules.weather_index import get_weather_index
+
+MIN_CABIN_PRESSURE_PSI = 10.8
+
+# The fixed-penalty rules, in reason order: the features that trigger each one, minutes added
+# (None adds the feature's own value) and the reason, formatted with the flight's observations
+DELAY_RULES = (
+    (('origin_crosswind',), 45, "High crosswind at {origin}"),
+    (('origin_thunderstorm',), 90, "Thunderstorm at {origin}"),
+    (('origin_low_visibility',), 30, "Low visibility at {origin}"),
+    (('destination_crosswind',), 45, "High crosswind at {destination}"),
+    (('destination_thunderstorm',), 90, "Thunderstorm at {destination}"),
+    (('destination_low_visibility',), 30, "Low visibility at {destination}"),
+    (('thrust_deviation',), 60, "Engine thrust deviation: {thrust_deviation:.1f}%"),
+    (('maintenance_warning',), 30, "Aircraft maintenance warning"),
+    (('low_cabin_pressure',), 45, "Low cabin pressure: {cabin_pressure_psi:.1f} psi"),
+    (('runway_queue_minutes',), None, "Runway queue: {runway_queue} min"),
+    (('boarding_overrun',), 30, "Boarding delay: {boarding_time_minutes} min"),
+    (('pilot_shortfall', 'cabin_shortfall'), 60, "Crew shortage: {pilots} pilots, {crew} cabin crew")
+)
+
+FEATURE_POSITION = {name: position for position, name in enumerate(FEATURES)}
+
 class DelayPredictor:
     def __init__(self, config):
         self.config = config
-        self.thresholds = config['thresholds']
+        self.thresholds = get_compiled_config(config).thresholds
+        self.propagator = DelayPropagator(config)
+        self.model = load_delay_model(config)
+        self.config_digest = config_hash(config, ('crew_rules', 'aircraft_types'), (
+            'crosswind_max_knots', 'visibility_min_meters', 'engine_thrust_deviation_percent',
+            'runway_queue_max_minutes', 'boarding_max_minutes'
+        ))
     
-    def predict_all_flights(self, logs_data):
-        predictions = {}
+    def predict_all_flights(self, logs_data, summary=None):
+        hashes = get_record_hashes(logs_data)
+        entries = {}
         
+        # A flight's rule-based estimate only depends on these records, so unchanged flights reuse it
         for flight in logs_data['flight_schedule']:
-            flight_id = flight['flight_id']
-            predictions[flight_id] = self.predict_delay(flight, logs_data)
-        
+            origin, destination = flight['route'].split('-')
+            key = cache_key(
+                'delay', self.config_digest, hashes.flight(flight), hashes.engine(flight['aircraft_id']),
+                hashes.weather(origin), hashes.weather(destination), hashes.crew(origin)
+            )
+            entries[flight['flight_id']] = (key, flight)
+        
+        # The rules are applied to the model's feature row, so the row is cached alongside the rule estimate
+        def predict(flight):
+            row, observed = self._observe(flight, logs_data)
+            return self._apply_rules(flight, row, observed), row if self.model is not None else None
+        
+        results = memoized(get_result_cache(self.config), entries, predict)
+        predictions = {flight_id: prediction for flight_id, (prediction, row) in results.items()}
+        
+        # A trained model replaces the fixed penalty minutes; the rule reasons still explain the delay
+        if self.model is not None and logs_data['flight_schedule']:
+            rows = []
+            for flight in logs_data['flight_schedule']:
+                row = results[flight['flight_id']][1]
+                rows.append(row if row is not None else self.features(flight, logs_data))
+            
+            minutes = self.model.predict(rows)
+            for flight, predicted in zip(logs_data['flight_schedule'], minutes):
+                prediction = predictions[flight['flight_id']]
+                prediction['predicted_delay'] = int(round(predicted))
+                prediction['severity'] = delay_severity(prediction['predicted_delay'])
+        
+        # Knock-on delays from late inbound aircraft are added once every flight has its own estimate
+        predictions = self.propagator.apply(logs_data['flight_schedule'], predictions)
+        if summary is not None:
+            for flight_id, prediction in predictions.items():
+                summary.add_delay_prediction(flight_id, prediction)
         return predictions
     
     def predict_delay(self, flight, logs_data):
+        row, observed = self._observe(flight, logs_data)
+        return self._apply_rules(flight, row, observed)
+    
+    def _apply_rules(self, flight, row, observed):
         delay_minutes = 0
         reasons = []
-        
-        weather_delay, weather_reasons = self._check_weather_delays(flight, logs_data)
-        delay_minutes += weather_delay
-        reasons.extend(weather_reasons)
-        
-        maint_delay, maint_reasons = self._check_maintenance_delays(flight, logs_data)
-        delay_minutes += maint_delay
-        reasons.extend(maint_reasons)
-        
-        op_delay, op_reasons = self._check_operational_delays(flight, logs_data)
-        delay_minutes += op_delay
-        reasons.extend(op_reasons)
-        
-        if delay_minutes == 0:
-            severity = "NONE"
-        elif delay_minutes <= 30:
-            severity = "LOW"
-        elif delay_minutes <= 90:
-            severity = "MEDIUM"
-        else:
-            severity = "HIGH"
-        
-        return {
-            'predicted_delay': delay_minutes,
-            'reasons': reasons,
-            'severity': severity,
-            'flight_id': flight['flight_id'],
-            'route': flight['route']
-        }
+        for features, minutes, reason in DELAY_RULES:
+            values = [row[FEATURE_POSITION[name]] for name in features]
+            if any(values):
+                delay_minutes += minutes if minutes is not None else int(sum(values))
+                reasons.append(reason.format(**observed))
+        
+        return DelayPrediction(
+            predicted_delay=delay_minutes,
+            reasons=reasons,
+            severity=delay_severity(delay_minutes),
+            flight_id=flight['flight_id'],
+            route=flight['route']
+        )
     
-    def _check_weather_delays(self, flight, logs_data):
-        delay = 0
-        reasons = []
-        
-        route = flight['route']
-        if '-' in route:
-            airports = [route.split('-')[0], route.split('-')[1]]
-            
-            for airport in airports:
-                airport_weather = []
-                for weather_log in logs_data['weather_logs']:
-                    if weather_log['airport'] == airport:
-                        airport_weather.append(weather_log)
-                
-                if airport_weather:
-                    latest_weather = airport_weather[0]
-                    weather_data = latest_weather['weather_data']
-                    
-                    if latest_weather.get('crosswind_knots', 0) > self.thresholds['crosswind_max_knots']:
-                        delay += 45
-                        reasons.append(f"High crosswind at {airport}")
-                    
-                    if weather_data['conditions'] == 'Thunderstorm':
-                        delay += 90
-                        reasons.append(f"Thunderstorm at {airport}")
-                    
-                    if weather_data['visibility_meters'] < self.thresholds['visibility_min_meters']:
-                        delay += 30
-                        reasons.append(f"Low visibility at {airport}")
-        
-        return delay, reasons
+    def features(self, flight, logs_data):
+        """Inputs of each delay rule for one flight, in delay_model.FEATURES order"""
+        return self._observe(flight, logs_data)[0]
     
-    def _check_maintenance_delays(self, flight, logs_data):
-        delay = 0
-        reasons = []
-        aircraft_id = flight['aircraft_id']
-        
-        aircraft_engine_logs = []
-        for engine_log in logs_data['engine_logs']:
-            if engine_log['aircraft_id'] == aircraft_id:
-                aircraft_engine_logs.append(engine_log)
-        
-        if aircraft_engine_logs:
-            latest_log = aircraft_engine_logs[0]
+    def _observe(self, flight, logs_data):
+        """The flight's feature row, and the observed values its rules' reasons quote"""
+        row = []
+        
+        weather_index = get_weather_index(logs_data)
+        origin, destination = flight['route'].split('-')
+        observed = {
+            'origin': origin,
+            'destination': destination,
+            'runway_queue': flight['runway_queue'],
+            'boarding_time_minutes': flight['boarding_time_minutes']
+        }
+        for airport, scheduled_ts in ((origin, flight['departure_ts']), (destination, flight['arrival_ts'])):
+            weather = weather_index.conditions_at(airport, scheduled_ts)
+            if weather:
+                row.append(float(weather['crosswind_knots'] > self.thresholds.crosswind_max_knots))
+                row.append(float(weather['conditions'] == 'Thunderstorm'))
+                row.append(float(weather['visibility_meters'] < self.thresholds.visibility_min_meters))
+            else:
+                row.extend((0.0, 0.0, 0.0))
+        
+        latest_log = get_latest_engine_logs(logs_data).get(flight['aircraft_id'])
+        if latest_log:
             metrics = latest_log['metrics']
-            
-            if 'engine_thrust_percent' in metrics:
-                thrust_dev = abs(100 - metrics['engine_thrust_percent'])
-                if thrust_dev > self.thresholds['engine_thrust_deviation_percent']:
-                    delay += 60
-                    reasons.append(f"Engine thrust deviation: {thrust_dev:.1f}%")
-            
-            if latest_log.get('status') == 'WARNING':
-                delay += 30
-                reasons.append("Aircraft maintenance warning")
-            
-            if 'cabin_pressure_psi' in metrics:
-                if metrics['cabin_pressure_psi'] < 10.8:
-                    delay += 45
-                    reasons.append(f"Low cabin pressure: {metrics['cabin_pressure_psi']:.1f} psi")
-        
-        return delay, reasons
-    
-    def _check_operational_delays(self, flight, logs_data):
-        delay = 0
-        reasons = []
-        
-        if flight.get('runway_queue', 0) > self.thresholds['runway_queue_max_minutes']:
-            delay += flight['runway_queue']
-            reasons.append(f"Runway queue: {flight['runway_queue']} min")
+            observed['thrust_deviation'] = abs(100 - metrics['engine_thrust_percent'])
+            observed['cabin_pressure_psi'] = metrics['cabin_pressure_psi']
+            row.append(float(observed['thrust_deviation'] > self.thresholds.engine_thrust_deviation_percent))
+            row.append(float(latest_log['status'] == 'WARNING'))
+            row.append(float(metrics['cabin_pressure_psi'] < MIN_CABIN_PRESSURE_PSI))
+        else:
+            row.extend((0.0, 0.0, 0.0))
         
-        if flight.get('boarding_time_minutes', 0) > self.thresholds['boarding_max_minutes']:
-            delay += 30
-            reasons.append(f"Boarding delay: {flight['boarding_time_minutes']} min")
+        runway_queue = flight['runway_queue']
+        row.append(float(runway_queue) if runway_queue > self.thresholds.runway_queue_max_minutes else 0.0)
+        row.append(float(flight['boarding_time_minutes'] > self.thresholds.boarding_max_minutes))
         
-        crew_available = self._check_crew_availability(flight, logs_data)
-        if not crew_available:
-            delay += 60
-            reasons.append("Crew shortage")
+        shortfall = self._check_crew_availability(flight, logs_data)
+        observed['pilots'] = shortfall['pilots']
+        observed['crew'] = shortfall['crew']
+        row.append(float(shortfall['pilots']))
+        row.append(float(shortfall['crew']))
         
-        return delay, reasons
+        return row, observed
     
     def _check_crew_availability(self, flight, logs_data):
-        available_crew = 0
-        for crew in logs_data['crew_schedules']:
-            if crew['status'] == 'AVAILABLE':
-                available_crew += 1
-        
-        return available_crew > 5
\ No newline at end of file
+        crew_index = get_crew_index(self.config, logs_data)
+        return crew_index.shortfall(flight)
\ No newline at end of file
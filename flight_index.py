@@ -0,0 +1,48 @@
+import bisect
+import time
+
+class FlightTimeIndex:
+    """Flights sorted by epoch departure time, overall and per departure airport"""
+    
+    def __init__(self, flights):
+        ordered = sorted(flights, key=lambda flight: flight['departure_ts'])
+        self.departures = [flight['departure_ts'] for flight in ordered]
+        self.flights = ordered
+        
+        self.airport_departures = {}
+        self.airport_flights = {}
+        for flight in ordered:
+            airport = flight['route'].split('-')[0]
+            self.airport_departures.setdefault(airport, []).append(flight['departure_ts'])
+            self.airport_flights.setdefault(airport, []).append(flight)
+    
+    def departing_between(self, start, end, airport=None):
+        """Flights with start <= departure_ts < end, optionally from one airport"""
+        if airport is None:
+            departures, flights = self.departures, self.flights
+        else:
+            departures = self.airport_departures.get(airport, [])
+            flights = self.airport_flights.get(airport, [])
+        
+        first = bisect.bisect_left(departures, start)
+        last = bisect.bisect_left(departures, end)
+        return flights[first:last]
+    
+    def departing_within(self, hours, airport=None, now=None):
+        start = int(now if now is not None else time.time())
+        return self.departing_between(start, start + int(hours * 3600), airport)
+    
+    def next_departure(self, after, airport=None):
+        departures = self.departures if airport is None else self.airport_departures.get(airport, [])
+        flights = self.flights if airport is None else self.airport_flights.get(airport, [])
+        
+        position = bisect.bisect_right(departures, after)
+        return flights[position] if position < len(flights) else None
+
+def get_flight_index(logs_data):
+    """Build the departure index once per snapshot and share it between modules"""
+    index = logs_data.get('flight_index')
+    if index is None:
+        index = FlightTimeIndex(logs_data['flight_schedule'])
+        logs_data['flight_index'] = index
+    return index
@@ -0,0 +1,185 @@
+import numpy as np
+
+from modules.anomaly import get_metric_matrix
+from modules.validation import ENGINE_METRICS
+
+ALTITUDE_COLUMN = ENGINE_METRICS.index('altitude_ft')
+AIRSPEED_COLUMN = ENGINE_METRICS.index('airspeed_knots')
+TURBULENCE_COLUMN = ENGINE_METRICS.index('turbulence_level')
+BURN_COLUMN = ENGINE_METRICS.index('fuel_burn_rate')
+
+DEFAULT_PHASES = (
+    {'name': 'climb', 'fraction': 0.15, 'altitude_ft': 15000, 'airspeed_knots': 300},
+    {'name': 'cruise', 'fraction': 0.7, 'altitude_ft': 35000, 'airspeed_knots': 460},
+    {'name': 'descent', 'fraction': 0.15, 'altitude_ft': 12000, 'airspeed_knots': 280}
+)
+
+class FuelBurnTables:
+    """Mean fuel burn (kg/hr) per altitude x airspeed x turbulence bin, one table row per aircraft, type and the fleet
+    
+    Every row is fully resolved when built: a bin with fewer than
+    min_samples readings takes the value of the aircraft's type, then the
+    fleet, so a lookup is a single array index with no fallbacks left.
+    """
+    
+    def __init__(self, config, engine_logs, flights, samples):
+        fuel = config.get('fuel', {})
+        self.altitude_edges = np.array(fuel.get('altitude_bins_ft', [10000, 20000, 30000]), dtype=float)
+        self.airspeed_edges = np.array(fuel.get('airspeed_bins_knots', [250, 350, 450]), dtype=float)
+        self.turbulence_edges = np.array(fuel.get('turbulence_bins', [2, 4, 6]), dtype=float)
+        self.min_samples = fuel.get('min_samples', 5)
+        self.shape = (len(self.altitude_edges) + 1, len(self.airspeed_edges) + 1, len(self.turbulence_edges) + 1)
+        
+        aircraft_types = {}
+        for flight in flights:
+            aircraft_types.setdefault(flight['aircraft_id'], flight['aircraft_type'])
+        
+        self.rows = {}
+        self.sources = []
+        self.turbulence = {}
+        aircraft_ids = [engine_log['aircraft_id'] for engine_log in engine_logs]
+        flight_ids = [engine_log.get('flight_id') for engine_log in engine_logs]
+        self.table = self._build(samples, aircraft_ids, aircraft_types)
+        self._average_turbulence(samples[:, TURBULENCE_COLUMN], aircraft_ids, flight_ids)
+    
+    def bins(self, altitude, airspeed, turbulence):
+        """Flat bin index for arrays of conditions"""
+        return np.ravel_multi_index((
+            np.digitize(altitude, self.altitude_edges),
+            np.digitize(airspeed, self.airspeed_edges),
+            np.digitize(turbulence, self.turbulence_edges)
+        ), self.shape)
+    
+    def _build(self, samples, aircraft_ids, aircraft_types):
+        size = int(np.prod(self.shape))
+        bins = self.bins(samples[:, ALTITUDE_COLUMN], samples[:, AIRSPEED_COLUMN], samples[:, TURBULENCE_COLUMN])
+        burn = samples[:, BURN_COLUMN]
+        
+        # Rows: the fleet, then each type, then each aircraft, so every row can fall back to one built before it
+        types = sorted(set(aircraft_types.get(aircraft_id, 'UNKNOWN') for aircraft_id in aircraft_ids) | set(aircraft_types.values()))
+        aircraft = sorted(set(aircraft_ids))
+        self.rows = {None: 0}
+        self.rows.update((('type', name), position + 1) for position, name in enumerate(types))
+        self.rows.update((('aircraft', name), position + 1 + len(types)) for position, name in enumerate(aircraft))
+        self.sources = ['fleet'] + ['type'] * len(types) + ['aircraft'] * len(aircraft)
+        
+        type_rows = np.array([self.rows[('type', aircraft_types.get(aircraft_id, 'UNKNOWN'))] for aircraft_id in aircraft_ids], dtype=int)
+        aircraft_rows = np.array([self.rows[('aircraft', aircraft_id)] for aircraft_id in aircraft_ids], dtype=int)
+        
+        totals = np.zeros(len(self.rows) * size)
+        counts = np.zeros(len(self.rows) * size)
+        for rows in (np.zeros(len(bins), dtype=int), type_rows, aircraft_rows):
+            flat = rows * size + bins
+            totals += np.bincount(flat, weights=burn, minlength=len(totals))
+            counts += np.bincount(flat, minlength=len(counts))
+        totals = totals.reshape(len(self.rows), size)
+        counts = counts.reshape(len(self.rows), size)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = totals / counts
+        fleet_mean = burn.mean() if len(burn) else 0.0
+        table = np.empty_like(means)
+        table[0] = np.where(counts[0] >= 1, means[0], fleet_mean)
+        
+        parents = np.zeros(len(self.rows), dtype=int)
+        for aircraft_id in aircraft:
+            parents[self.rows[('aircraft', aircraft_id)]] = self.rows[('type', aircraft_types.get(aircraft_id, 'UNKNOWN'))]
+        # Parents always precede their children, so one ordered pass resolves every fallback
+        for row in range(1, len(self.rows)):
+            table[row] = np.where(counts[row] >= self.min_samples, means[row], table[parents[row]])
+        return table
+    
+    def _average_turbulence(self, levels, aircraft_ids, flight_ids):
+        for key, ids in (('aircraft', aircraft_ids), ('flight', flight_ids)):
+            names, groups = np.unique(np.array(ids, dtype=str), return_inverse=True)
+            means = np.bincount(groups, weights=levels, minlength=len(names)) / np.bincount(groups, minlength=len(names))
+            self.turbulence.update(((key, name), float(mean)) for name, mean in zip(names, means))
+    
+    def expected_turbulence(self, flight):
+        """Mean turbulence seen on the flight, else on its aircraft, else calm"""
+        return self.turbulence.get(('flight', flight['flight_id']), self.turbulence.get(('aircraft', flight['aircraft_id']), 0.0))
+    
+    def row(self, aircraft_id, aircraft_type):
+        """Table row for an aircraft, its type when it has no telemetry, or the fleet"""
+        return self.rows.get(('aircraft', aircraft_id), self.rows.get(('type', aircraft_type), 0))
+
+class FuelPlanner:
+    """Trip, reserve and contingency fuel for the whole schedule in one vectorized pass
+    
+    Block time is split into flight phases, each flown at its configured
+    altitude and airspeed and at the turbulence seen on that flight (or
+    its aircraft), and each phase burns at its table bin's rate. A flight
+    that does not arrive after it departs has no block time to fuel, so
+    its plan carries an issue and no fuel figures.
+    """
+    
+    def __init__(self, config):
+        self.config = config
+        fuel = config.get('fuel', {})
+        self.phases = fuel.get('phases', DEFAULT_PHASES)
+        self.reserve_minutes = fuel.get('reserve_minutes', 30)
+        self.contingency_percent = fuel.get('contingency_percent', 5)
+    
+    def plan(self, logs_data):
+        flights = logs_data['flight_schedule']
+        if not flights:
+            return {}
+        
+        tables = get_fuel_tables(self.config, logs_data)
+        turbulence = np.array([tables.expected_turbulence(flight) for flight in flights])
+        
+        rows = np.array([tables.row(flight['aircraft_id'], flight['aircraft_type']) for flight in flights])
+        hours = np.array([(flight['arrival_ts'] - flight['departure_ts']) / 3600 for flight in flights])
+        fractions = np.array([phase['fraction'] for phase in self.phases])
+        
+        # (flights, phases) bin indices, looked up in one gather
+        bins = tables.bins(
+            np.array([phase['altitude_ft'] for phase in self.phases])[None, :],
+            np.array([phase['airspeed_knots'] for phase in self.phases])[None, :],
+            turbulence[:, None]
+        )
+        burn = tables.table[rows[:, None], bins]
+        
+        valid = hours > 0
+        trip = (burn * fractions).sum(axis=1) * np.where(valid, hours, 0)
+        cruise = burn[:, int(np.argmax(fractions))]
+        reserve = cruise * self.reserve_minutes / 60
+        contingency = trip * self.contingency_percent / 100
+        
+        plans = {}
+        for position, flight in enumerate(flights):
+            if not valid[position]:
+                plans[flight['flight_id']] = {
+                    'route': flight['route'],
+                    'aircraft_id': flight['aircraft_id'],
+                    'block_hours': float(hours[position]),
+                    'issue': f"Arrival is {-hours[position]:.1f} hours before departure" if hours[position] < 0
+                             else "Arrival is at the departure time",
+                    'trip_fuel_kg': None,
+                    'contingency_kg': None,
+                    'reserve_kg': None,
+                    'block_fuel_kg': None,
+                    'burn_source': None
+                }
+                continue
+            
+            plans[flight['flight_id']] = {
+                'route': flight['route'],
+                'aircraft_id': flight['aircraft_id'],
+                'block_hours': float(hours[position]),
+                'issue': None,
+                'trip_fuel_kg': round(float(trip[position])),
+                'contingency_kg': round(float(contingency[position])),
+                'reserve_kg': round(float(reserve[position])),
+                'block_fuel_kg': round(float(trip[position] + contingency[position] + reserve[position])),
+                'burn_source': tables.sources[rows[position]]
+            }
+        return plans
+
+def get_fuel_tables(config, logs_data):
+    """Build the burn tables once per snapshot and share them between modules"""
+    tables = logs_data.get('fuel_tables')
+    if tables is None:
+        tables = FuelBurnTables(config, logs_data['engine_logs'], logs_data['flight_schedule'], get_metric_matrix(logs_data))
+        logs_data['fuel_tables'] = tables
+    return tables
@@ -1,10 +1,32 @@
-import json
-from datetime import datetime
+
+from modules.alert_store import AlertStore
+from modules.anomaly import FleetAnomalyModel, get_anomaly_model
+from modules.memo import cache_key, config_hash, content_hash, get_result_cache, memoized
+from modules.records import Alert
+from modules.settings import get_compiled_config
+
+def get_latest_engine_logs(logs_data):
+    """Map each aircraft to its latest engine log, the first one listed for it in the snapshot"""
+    latest = logs_data.get('latest_engine_logs')
+    if latest is None:
+        latest = {}
+        for engine_log in logs_data['engine_logs']:
+            if engine_log['aircraft_id'] not in latest:
+                latest[engine_log['aircraft_id']] = engine_log
+        logs_data['latest_engine_logs'] = latest
+    return latest
 
 class HealthMonitor:
-    def __init__(self, config):
+    def __init__(self, config, store_alerts=True):
         self.config = config
-        self.thresholds = config['thresholds']
+        self.thresholds = get_compiled_config(config).thresholds
+        self.anomaly = FleetAnomalyModel(config)
+        # Replays and what-if runs pass store_alerts=False so they never touch the production alert logs
+        self.alert_store = AlertStore(config) if store_alerts else None
+        self.config_digest = config_hash(config, ('anomaly',), (
+            'engine_vibration_threshold', 'fuel_burn_threshold_percent',
+            'engine_thrust_deviation_percent', 'cabin_temp_max_celsius', 'turbulence_threshold'
+        ))
     
     def monitor_all_aircraft(self, logs_data):
         alerts = {
@@ -12,147 +34,163 @@ class HealthMonitor:
             'warning': []
         }
         
-        logs_by_aircraft = {}
-        for engine_log in logs_data['engine_logs']:
-            aircraft_id = engine_log['aircraft_id']
-            if aircraft_id not in logs_by_aircraft:
-                logs_by_aircraft[aircraft_id] = []
-            logs_by_aircraft[aircraft_id].append(engine_log)
-        
-        for aircraft_id, aircraft_logs in logs_by_aircraft.items():
-            if aircraft_logs:
-                latest_log = aircraft_logs[0]
-                aircraft_alerts = self._analyze_aircraft_health(aircraft_id, latest_log)
-                
-                for alert in aircraft_alerts:
-                    if alert['severity'] == 'CRITICAL':
-                        alerts['critical'].append(alert)
-                        self._log_critical_alert(alert)
-                    else:
-                        alerts['warning'].append(alert)
-                        self._log_warning_alert(alert)
+        # Baselines come from the whole snapshot; the latest readings are scored in one vectorized pass.
+        # The snapshot model stays local so readings streamed into self.anomaly are never counted twice
+        model = get_anomaly_model(self.config, logs_data)
+        latest_logs = list(get_latest_engine_logs(logs_data).values())
+        distances = model.score(latest_logs)
+        
+        # Besides the reading itself, only the type's fuel baseline and the distance feed the checks
+        entries = {}
+        sources = {}
+        for latest_log, distance in zip(latest_logs, distances):
+            aircraft_id = latest_log['aircraft_id']
+            sources[aircraft_id] = content_hash(latest_log)
+            key = cache_key(
+                'health', self.config_digest, sources[aircraft_id],
+                round(model.fuel_baseline(aircraft_id), 3), round(float(distance), 4)
+            )
+            entries[aircraft_id] = (key, (latest_log, distance))
+        
+        results = memoized(get_result_cache(self.config), entries,
+                           lambda reading: self.analyze_reading(reading[0], log_alerts=False,
+                                                                distance=reading[1], model=model))
+        
+        for aircraft_id, aircraft_alerts in results.items():
+            for alert in aircraft_alerts:
+                if alert['severity'] == 'CRITICAL':
+                    alerts['critical'].append(alert)
+                else:
+                    alerts['warning'].append(alert)
+            self._log_alerts(aircraft_id, sources[aircraft_id], aircraft_alerts)
         
         return alerts
     
-    def _analyze_aircraft_health(self, aircraft_id, engine_log):
+    def analyze_reading(self, engine_log, log_alerts=True, distance=None, model=None):
+        """Check one engine reading and return its alerts, optionally appending them to the alert logs
+        
+        Without a precomputed distance the reading is first folded into its
+        aircraft type's baseline, so a stream of readings keeps the model current.
+        A distance scored against another model must come with that model.
+        """
+        model = model or self.anomaly
+        if distance is None:
+            model.update([engine_log])
+            distance = model.score([engine_log])[0]
+        
+        aircraft_alerts = self._analyze_aircraft_health(engine_log['aircraft_id'], engine_log, distance, model)
+        
+        if log_alerts:
+            self._log_alerts(engine_log['aircraft_id'], content_hash(engine_log), aircraft_alerts)
+        
+        return aircraft_alerts
+    
+    def _analyze_aircraft_health(self, aircraft_id, engine_log, distance, model):
+        # Alerts are stamped with the reading they come from, so re-checking an unchanged reading raises equal alerts
         alerts = []
-        metrics = engine_log.get('metrics', {})
-        
-        vibration = metrics.get('engine_vibration', 0)
-        if vibration > self.thresholds['engine_vibration_threshold']:
-            alerts.append({
-                'aircraft_id': aircraft_id,
-                'alert_type': 'ENGINE_VIBRATION',
-                'message': f'High engine vibration: {vibration:.1f}',
-                'severity': 'CRITICAL' if vibration > 8.0 else 'WARNING',
-                'timestamp': datetime.now().isoformat(),
-                'metric_value': vibration,
-                'threshold': self.thresholds['engine_vibration_threshold']
-            })
-        
-        fuel_burn = metrics.get('fuel_burn_rate', 0)
-        normal_fuel_burn = 2500
+        metrics = engine_log['metrics']
+        
+        vibration = metrics['engine_vibration']
+        if vibration > self.thresholds.engine_vibration_threshold:
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='ENGINE_VIBRATION',
+                message=f'High engine vibration: {vibration:.1f}',
+                severity='CRITICAL' if vibration > 8.0 else 'WARNING',
+                timestamp=engine_log['timestamp'],
+                metric_value=vibration,
+                threshold=self.thresholds.engine_vibration_threshold
+            ))
+        
+        fuel_burn = metrics['fuel_burn_rate']
+        normal_fuel_burn = model.fuel_baseline(aircraft_id)
         fuel_deviation = abs(fuel_burn - normal_fuel_burn) / normal_fuel_burn * 100
         
-        if fuel_deviation > self.thresholds['fuel_burn_threshold_percent']:
-            alerts.append({
-                'aircraft_id': aircraft_id,
-                'alert_type': 'FUEL_BURN_ANOMALY',
-                'message': f'Abnormal fuel burn: {fuel_burn:.0f} kg/hr',
-                'severity': 'WARNING',
-                'timestamp': datetime.now().isoformat(),
-                'metric_value': fuel_deviation,
-                'threshold': self.thresholds['fuel_burn_threshold_percent']
-            })
-        
-        oil_temp = metrics.get('oil_temperature', 0)
+        if fuel_deviation > self.thresholds.fuel_burn_threshold_percent:
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='FUEL_BURN_ANOMALY',
+                message=f'Abnormal fuel burn: {fuel_burn:.0f} kg/hr',
+                severity='WARNING',
+                timestamp=engine_log['timestamp'],
+                metric_value=fuel_deviation,
+                threshold=self.thresholds.fuel_burn_threshold_percent
+            ))
+        
+        oil_temp = metrics['oil_temperature']
         if oil_temp > 110:
-            alerts.append({
-                'aircraft_id': aircraft_id,
-                'alert_type': 'OIL_TEMPERATURE',
-                'message': f'High oil temperature: {oil_temp:.1f}C',
-                'severity': 'WARNING' if oil_temp < 115 else 'CRITICAL',
-                'timestamp': datetime.now().isoformat(),
-                'metric_value': oil_temp,
-                'threshold': 110
-            })
-        
-        thrust = metrics.get('engine_thrust_percent', 100)
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='OIL_TEMPERATURE',
+                message=f'High oil temperature: {oil_temp:.1f}C',
+                severity='WARNING' if oil_temp < 115 else 'CRITICAL',
+                timestamp=engine_log['timestamp'],
+                metric_value=oil_temp,
+                threshold=110
+            ))
+        
+        thrust = metrics['engine_thrust_percent']
         thrust_deviation = abs(100 - thrust)
-        if thrust_deviation > self.thresholds['engine_thrust_deviation_percent']:
-            alerts.append({
-                'aircraft_id': aircraft_id,
-                'alert_type': 'ENGINE_THRUST',
-                'message': f'Engine thrust deviation: {thrust:.1f}%',
-                'severity': 'CRITICAL' if thrust_deviation > 25 else 'WARNING',
-                'timestamp': datetime.now().isoformat(),
-                'metric_value': thrust_deviation,
-                'threshold': self.thresholds['engine_thrust_deviation_percent']
-            })
-        
-        cabin_temp = metrics.get('cabin_temperature_c', 0)
-        if cabin_temp > self.thresholds['cabin_temp_max_celsius']:
-            alerts.append({
-                'aircraft_id': aircraft_id,
-                'alert_type': 'CABIN_TEMPERATURE',
-                'message': f'High cabin temperature: {cabin_temp:.1f}C',
-                'severity': 'WARNING',
-                'timestamp': datetime.now().isoformat(),
-                'metric_value': cabin_temp,
-                'threshold': self.thresholds['cabin_temp_max_celsius']
-            })
-        
-        turbulence = metrics.get('turbulence_level', 0)
-        if turbulence > self.thresholds['turbulence_threshold']:
-            alerts.append({
-                'aircraft_id': aircraft_id,
-                'alert_type': 'TURBULENCE',
-                'message': f'High turbulence level: {turbulence:.1f}',
-                'severity': 'WARNING',
-                'timestamp': datetime.now().isoformat(),
-                'metric_value': turbulence,
-                'threshold': self.thresholds['turbulence_threshold']
-            })
-        
-        if engine_log.get('status') == 'WARNING':
-            alerts.append({
-                'aircraft_id': aircraft_id,
-                'alert_type': 'SYSTEM_WARNING',
-                'message': 'Aircraft system warning flag detected',
-                'severity': 'WARNING',
-                'timestamp': datetime.now().isoformat(),
-                'metric_value': 'WARNING',
-                'threshold': 'NORMAL'
-            })
+        if thrust_deviation > self.thresholds.engine_thrust_deviation_percent:
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='ENGINE_THRUST',
+                message=f'Engine thrust deviation: {thrust:.1f}%',
+                severity='CRITICAL' if thrust_deviation > 25 else 'WARNING',
+                timestamp=engine_log['timestamp'],
+                metric_value=thrust_deviation,
+                threshold=self.thresholds.engine_thrust_deviation_percent
+            ))
         
-        return alerts
-    
-    def _log_critical_alert(self, alert):
-        log_entry = {
-            'timestamp': alert['timestamp'],
-            'aircraft_id': alert['aircraft_id'],
-            'alert_type': alert['alert_type'],
-            'message': alert['message'],
-            'severity': alert['severity']
-        }
+        cabin_temp = metrics['cabin_temperature_c']
+        if cabin_temp > self.thresholds.cabin_temp_max_celsius:
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='CABIN_TEMPERATURE',
+                message=f'High cabin temperature: {cabin_temp:.1f}C',
+                severity='WARNING',
+                timestamp=engine_log['timestamp'],
+                metric_value=cabin_temp,
+                threshold=self.thresholds.cabin_temp_max_celsius
+            ))
         
-        try:
-            with open('logs/critical_flight_alerts.log', 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
-        except Exception as e:
-            print(f"Error logging critical alert: {e}")
-    
-    def _log_warning_alert(self, alert):
-        log_entry = {
-            'timestamp': alert['timestamp'],
-            'aircraft_id': alert['aircraft_id'],
-            'alert_type': alert['alert_type'],
-            'message': alert['message'],
-            'severity': alert['severity']
-        }
+        turbulence = metrics['turbulence_level']
+        if turbulence > self.thresholds.turbulence_threshold:
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='TURBULENCE',
+                message=f'High turbulence level: {turbulence:.1f}',
+                severity='WARNING',
+                timestamp=engine_log['timestamp'],
+                metric_value=turbulence,
+                threshold=self.thresholds.turbulence_threshold
+            ))
+        
+        if engine_log['status'] == 'WARNING':
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='SYSTEM_WARNING',
+                message='Aircraft system warning flag detected',
+                severity='WARNING',
+                timestamp=engine_log['timestamp'],
+                metric_value='WARNING',
+                threshold='NORMAL'
+            ))
         
-        try:
-            with open('logs/aircraft_health_alerts.log', 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
-        except Exception as e:
-            print(f"Error logging warning alert: {e}")
\ No newline at end of file
+        if distance is not None and distance > model.threshold:
+            alerts.append(Alert(
+                aircraft_id=aircraft_id,
+                alert_type='MULTIVARIATE_ANOMALY',
+                message=f'Correlated engine metric anomaly: distance {distance:.1f} from {model.type_of(aircraft_id)} baseline',
+                severity='CRITICAL' if distance > model.critical_threshold else 'WARNING',
+                timestamp=engine_log['timestamp'],
+                metric_value=float(distance),
+                threshold=model.threshold
+            ))
+        
+        return alerts
+    
+    def _log_alerts(self, aircraft_id, source, alerts):
+        # The store appends only new incidents and state changes, so repeated runs leave the logs unchanged
+        if self.alert_store is not None:
+            self.alert_store.sync(aircraft_id, source, alerts)
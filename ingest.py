@@ -0,0 +1,103 @@
+import json
+import os
+
+from modules.records import RECORD_TYPES
+from modules.validation import RecordValidator, ValidationError
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def _first_character(path):
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(4096)
+            if not block:
+                return b''
+            stripped = block.lstrip()
+            if stripped:
+                return stripped[:1]
+
+def _last_character(path):
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            stripped = f.read(position - start).rstrip()
+            if stripped:
+                return stripped[-1:]
+            position = start
+    return b''
+
+def check_input(path):
+    """Cheap structural check of a data file without parsing all of it
+    
+    A JSON array must open with '[' and close with ']'; an NDJSON file must
+    have a parseable first line. Raises ValueError when the file is neither.
+    """
+    first = _first_character(path)
+    if first == b'[':
+        if _last_character(path) != b']':
+            raise ValueError("JSON array is not closed")
+        return
+    if first != b'{':
+        raise ValueError("not a JSON array or NDJSON file")
+    
+    with open(path, 'rb') as f:
+        line = f.readline()
+        while not line.strip():
+            line = f.readline()
+    _loads(line)
+
+def _build_records(key, raw_records, validator):
+    record_type = RECORD_TYPES.get(key)
+    records = []
+    rejects = []
+    
+    for raw in raw_records:
+        try:
+            record = validator.normalize(key, raw)
+        except ValidationError as e:
+            rejects.append((str(e), raw))
+            continue
+        records.append(record_type.from_dict(record) if record_type else record)
+    
+    return records, rejects
+
+def _parse_lines(data):
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield _loads(line)
+        except ValueError:
+            yield line.decode('utf-8', errors='replace')
+
+class Ingestor:
+    """Loads and validates JSON array or NDJSON inputs into records"""
+    
+    def __init__(self, config):
+        self.validator = RecordValidator(config)
+    
+    def load(self, path, key):
+        """Return (records, rejects) where rejects are (reason, raw record) pairs"""
+        if _first_character(path) == b'[':
+            return self._load_array(path, key)
+        return self._load_ndjson(path, key)
+    
+    def _load_array(self, path, key):
+        with open(path, 'rb') as f:
+            raw_records = _loads(f.read())
+        
+        if not isinstance(raw_records, list):
+            raise ValueError(f"expected a JSON array in {path}")
+        
+        return _build_records(key, raw_records, self.validator)
+    
+    def _load_ndjson(self, path, key):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return _build_records(key, _parse_lines(data), self.validator)
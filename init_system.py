@@ -162,12 +162,63 @@ def create_sample_data():
                 "max_duty_hours": 14,
                 "min_rest_hours": 10,
                 "max_consecutive_flights": 4,
+                "min_connection_minutes": 45,
                 "required_crew_per_flight": {
                     "small": {"pilots": 2, "crew": 4},
                     "medium": {"pilots": 2, "crew": 6},
                     "large": {"pilots": 3, "crew": 8}
                 }
             },
+            "anomaly": {
+                "mahalanobis_threshold": 5.4,
+                "critical_threshold": 8.0,
+                "min_samples": 30
+            },
+            "delay_model": {
+                "artifact_path": "output/models/delay_model.bin",
+                "ridge_lambda": 1.0
+            },
+            "alert_store": {
+                "compact_ratio": 2.0,
+                "min_compact_lines": 64,
+                "retention_days": 30,
+                "index_path": "logs/alert_index.db"
+            },
+            "dashboard": {
+                "refresh_seconds": 5
+            },
+            "overbooking": {
+                "show_rate": 0.92,
+                "prior_weight_bookings": 400,
+                "average_fare": 250,
+                "denied_boarding_cost": 800,
+                "max_overbooking_percent": 15
+            },
+            "network": {
+                "cruise_speed_kmh": 800,
+                "weather_penalty_km": 150,
+                "max_alternates": 3,
+                "max_diversion_km": 1000
+            },
+            "fuel": {
+                "altitude_bins_ft": [10000, 20000, 30000],
+                "airspeed_bins_knots": [250, 350, 450],
+                "turbulence_bins": [2, 4, 6],
+                "min_samples": 5,
+                "reserve_minutes": 30,
+                "contingency_percent": 5
+            },
+            "memoization": {
+                "enabled": True,
+                "path": "output/cache/results.db",
+                "max_mb": 64
+            },
+            "pairing": {
+                "max_sit_hours": 4,
+                "max_connections_per_leg": 6,
+                "duty_overhead_hours": 1.5
+            },
+            "min_turnaround_minutes": {"small": 25, "medium": 40, "large": 90},
             "aircraft_types": {
                 "A320": {"type": "medium", "capacity": 180, "range_km": 6100},
                 "B737": {"type": "medium", "capacity": 178, "range_km": 6285},
@@ -177,6 +228,31 @@ def create_sample_data():
             "routes": {
                 "domestic": ["DEL-MAA", "DEL-BOM", "DEL-BLR", "DEL-HYD", "DEL-CCU"],
                 "international": ["DEL-LHR", "DEL-JFK", "DEL-DXB", "DEL-SIN", "DEL-SYD"]
+            },
+            "airports": {
+                "DEL": [28.5562, 77.1000],
+                "BOM": [19.0896, 72.8656],
+                "MAA": [12.9941, 80.1709],
+                "BLR": [13.1986, 77.7066],
+                "HYD": [17.2403, 78.4294],
+                "CCU": [22.6547, 88.4467],
+                "LHR": [51.4700, -0.4543],
+                "JFK": [40.6413, -73.7781],
+                "DXB": [25.2532, 55.3657],
+                "SIN": [1.3644, 103.9915],
+                "SYD": [-33.9399, 151.1753]
+            },
+            "ingestion": {
+                "reject_path": "logs/rejected_records.jsonl"
+            },
+            "reporting": {
+                "formats": ["txt", "pdf", "csv", "json"],
+                "archive_path": "output/archive/operations.db"
+            },
+            "planning": {
+                "horizon_hours": 6,
+                "tick_minutes": 15,
+                "telemetry_window_hours": 24
             }
         }
         
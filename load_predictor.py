@@ -1,11 +1,18 @@
 import statistics
 from datetime import datetime
 
+from modules.overbooking import OverbookingOptimizer
+from modules.memo import cache_key, config_hash, get_record_hashes, get_result_cache, memoized
+from modules.settings import get_compiled_config
+
 class LoadPredictor:
     def __init__(self, config):
         self.config = config
+        self.aircraft = get_compiled_config(config).aircraft
+        self.config_digest = config_hash(config, ('aircraft_types',))
+        self.overbooking = OverbookingOptimizer(config)
     
-    def predict_loads(self, logs_data):
+    def predict_loads(self, logs_data, summary=None):
         predictions = {}
         
         load_by_route = {}
@@ -15,20 +22,32 @@ class LoadPredictor:
                 load_by_route[route] = []
             load_by_route[route].append(load_data)
         
+        hashes = get_record_hashes(logs_data)
+        entries = {}
         for flight in logs_data['flight_schedule']:
-            flight_id = flight['flight_id']
+            key = cache_key('load', self.config_digest, flight['route'], flight['aircraft_type'],
+                            hashes.loads(flight['route']))
+            entries[flight['flight_id']] = (key, flight)
+        
+        def predict(flight):
             route = flight['route']
-            
             if route in load_by_route:
-                predictions[flight_id] = self._predict_for_flight(flight, load_by_route[route])
-            else:
-                predictions[flight_id] = self._predict_default(flight)
+                return self._predict_for_flight(flight, load_by_route[route])
+            return self._predict_default(flight)
+        
+        predictions.update(memoized(get_result_cache(self.config), entries, predict))
         
+        # Limits are computed for the whole schedule in one pass, so they are attached after the per-flight cache
+        for flight_id, limit in self.overbooking.optimize(logs_data).items():
+            predictions[flight_id]['booking_limit'] = limit['booking_limit']
+            predictions[flight_id]['show_rate'] = limit['show_rate']
+            if summary is not None:
+                summary.add_load_prediction(flight_id, predictions[flight_id])
         return predictions
     
     def _predict_for_flight(self, flight, route_loads):
-        aircraft_type = flight.get('aircraft_type', 'A320')
-        capacity = self.config['aircraft_types'][aircraft_type]['capacity']
+        aircraft_type = flight['aircraft_type']
+        capacity = self.aircraft[aircraft_type].capacity
         
         all_historical = []
         for load_data in route_loads:
@@ -37,7 +56,7 @@ class LoadPredictor:
         if all_historical:
             predicted_load = statistics.mean(all_historical)
             
-            seasonal_factors = [ld.get('seasonal_factor', 1.0) for ld in route_loads]
+            seasonal_factors = [ld['seasonal_factor'] for ld in route_loads]
             avg_seasonal = statistics.mean(seasonal_factors) if seasonal_factors else 1.0
             predicted_load *= avg_seasonal
             
@@ -45,7 +64,7 @@ class LoadPredictor:
         else:
             predicted_load = capacity * 0.7
         
-        current_bookings = route_loads[0].get('current_bookings', 0) if route_loads else 0
+        current_bookings = route_loads[0]['current_bookings'] if route_loads else 0
         
         if current_bookings > predicted_load:
             predicted_load = current_bookings * 1.1
@@ -74,8 +93,8 @@ class LoadPredictor:
         }
     
     def _predict_default(self, flight):
-        aircraft_type = flight.get('aircraft_type', 'A320')
-        capacity = self.config['aircraft_types'][aircraft_type]['capacity']
+        aircraft_type = flight['aircraft_type']
+        capacity = self.aircraft[aircraft_type].capacity
         
         route = flight['route']
         if 'DEL' in route or 'BOM' in route:
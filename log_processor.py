@@ -2,9 +2,17 @@ import json
 import os
 from datetime import datetime
 
+from modules.ingest import Ingestor
+from modules.route_network import get_route_network
+from modules.settings import get_compiled_config
+from modules.validation import RejectLog
+from modules.weather_index import get_weather_index
+
 class LogProcessor:
     def __init__(self, config):
         self.config = config
+        self.thresholds = get_compiled_config(config).thresholds
+        self.reject_log = RejectLog(config.get('ingestion', {}).get('reject_path', 'logs/rejected_records.jsonl'))
     
     def process_all_logs(self):
         data = {
@@ -25,6 +33,7 @@ class LogProcessor:
         
         print("\nLoading data files...")
         
+        ingestor = Ingestor(self.config)
         for filename, key in files_to_process:
             filepath = f'data/{filename}'
             
@@ -33,16 +42,19 @@ class LogProcessor:
                 continue
             
             try:
-                with open(filepath, 'r') as f:
-                    data[key] = json.load(f)
+                data[key], rejects = ingestor.load(filepath, key)
                 print(f"Loaded {len(data[key])} records from {filename}")
             except json.JSONDecodeError as e:
                 print(f"Error parsing {filename}: {e}")
                 print(f"File might be empty or corrupted. Please run init_system.py")
-                return data
+                continue
             except Exception as e:
                 print(f"Error loading {filename}: {e}")
-                return data
+                continue
+            
+            if rejects:
+                self.reject_log.write(filename, rejects)
+                print(f"Rejected {len(rejects)} invalid records from {filename} (see {self.reject_log.path})")
         
         # Print summary
         if data['flight_schedule']:
@@ -63,12 +75,8 @@ class LogProcessor:
         if not logs_data['weather_logs'] or not logs_data['flight_schedule']:
             return suggestions
         
-        weather_by_airport = {}
-        for weather_log in logs_data['weather_logs']:
-            airport = weather_log['airport']
-            if airport not in weather_by_airport:
-                weather_by_airport[airport] = []
-            weather_by_airport[airport].append(weather_log)
+        weather_index = get_weather_index(logs_data)
+        network = get_route_network(self.config, logs_data)
         
         for flight in logs_data['flight_schedule']:
             route = flight['route']
@@ -77,27 +85,51 @@ class LogProcessor:
                 arr_airport = route.split('-')[1]
                 
                 issues = []
+                arrival_issue = False
                 
-                if dep_airport in weather_by_airport:
-                    latest_weather = weather_by_airport[dep_airport][0]
-                    if latest_weather['weather_data']['conditions'] == 'Thunderstorm':
+                dep_weather = weather_index.conditions_at(dep_airport, flight['departure_ts'])
+                if dep_weather:
+                    if dep_weather['conditions'] == 'Thunderstorm':
                         issues.append(f"Thunderstorm at {dep_airport}")
-                    if latest_weather['crosswind_knots'] > self.config['thresholds']['crosswind_max_knots']:
+                    if dep_weather['crosswind_knots'] > self.thresholds.crosswind_max_knots:
                         issues.append(f"High crosswind at {dep_airport}")
                 
-                if arr_airport in weather_by_airport:
-                    latest_weather = weather_by_airport[arr_airport][0]
-                    if latest_weather['weather_data']['visibility_meters'] < self.config['thresholds']['visibility_min_meters']:
+                arr_weather = weather_index.conditions_at(arr_airport, flight['arrival_ts'])
+                if arr_weather:
+                    if arr_weather['visibility_meters'] < self.thresholds.visibility_min_meters:
                         issues.append(f"Low visibility at {arr_airport}")
+                        arrival_issue = True
                 
                 if issues:
+                    # Only a destination problem can be flown around; at the origin the flight has to wait
+                    alternates = network.alternates(flight, weather_index) if arrival_issue else {'diversions': [], 'hubs': []}
                     suggestion = {
                         'flight_id': flight['flight_id'],
                         'route': route,
                         'issues': issues,
-                        'suggestion': 'Consider delay or alternate route',
+                        'suggestion': self._route_suggestion(dep_airport, arrival_issue, alternates),
+                        'alternates': alternates,
                         'severity': 'HIGH' if 'Thunderstorm' in str(issues) else 'MEDIUM'
                     }
                     suggestions.append(suggestion)
         
-        return suggestions
\ No newline at end of file
+        return suggestions
+    
+    def _route_suggestion(self, dep_airport, arrival_issue, alternates):
+        if not arrival_issue:
+            return f"Hold departure until conditions at {dep_airport} improve"
+        
+        options = []
+        diversions = alternates['diversions']
+        if diversions:
+            best = diversions[0]
+            options.append(f"Divert to {best['airport']} ({best['km_from_destination']} km from destination)")
+            if len(diversions) > 1:
+                options.append(f"alternates {', '.join(option['airport'] for option in diversions[1:])}")
+        if alternates['hubs']:
+            path = '-'.join(alternates['hubs'][0]['path'])
+            options.append(f"or connect via {path}" if options else f"Connect via {path}")
+        
+        if not options:
+            return "Consider delay; no alternate within aircraft range"
+        return '; '.join(options)
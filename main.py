@@ -1,17 +1,27 @@
-import json
+import contextlib
+import io
 import os
 import sys
+import time
 from datetime import datetime, timedelta
 
 # Import modules
 try:
     from modules.log_processor import LogProcessor
+    from modules.ingest import check_input
     from modules.delay_predictor import DelayPredictor
     from modules.crew_optimizer import CrewOptimizer
     from modules.load_predictor import LoadPredictor
     from modules.health_monitor import HealthMonitor
-    from modules.dashboard import Dashboard
+    from modules.dashboard import Dashboard, LiveDashboard
     from modules.reporter import ReportGenerator
+    from modules.summary import OperationsSummary
+    from modules.planner import RollingHorizonPlanner, SimulatedClock
+    from modules.simulator import OperationsSimulator
+    from modules.fuel_planner import FuelPlanner
+    from modules.tail_assignment import TailAssigner
+    from modules.settings import ConfigWatcher
+    from modules.validation import ValidationError
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Please make sure all module files are in the 'modules' directory.")
@@ -22,15 +32,27 @@ class AirlineOperationsSystem:
         self.load_config()
         self.setup_directories()
         self.initialize_modules()
-        
+    
     def load_config(self):
+        self.config_watcher = ConfigWatcher('airline_config.json')
         try:
-            with open('airline_config.json', 'r') as f:
-                self.config = json.load(f)
+            self.config = self.config_watcher.load()
             print("Configuration loaded successfully")
         except FileNotFoundError:
             print("Configuration file not found. Please run init_system.py first.")
             sys.exit(1)
+        except (ValueError, ValidationError) as e:
+            print(f"Invalid configuration: {e}")
+            sys.exit(1)
+    
+    def reload_config_if_changed(self):
+        """Pick up edits to airline_config.json without restarting; a broken edit keeps the running config"""
+        if not self.config_watcher.check():
+            return False
+        self.config = self.config_watcher.config
+        self.initialize_modules()
+        print("Configuration reloaded")
+        return True
     
     def setup_directories(self):
         os.makedirs('logs', exist_ok=True)
@@ -45,6 +67,8 @@ class AirlineOperationsSystem:
         self.health_monitor = HealthMonitor(self.config)
         self.dashboard = Dashboard(self.config)
         self.reporter = ReportGenerator(self.config)
+        self.fuel_planner = FuelPlanner(self.config)
+        self.tail_assigner = TailAssigner(self.config)
     
     def check_data_files(self):
         """Check if data files exist and are valid"""
@@ -63,11 +87,10 @@ class AirlineOperationsSystem:
                 print(f"Missing data file: {file}")
                 all_exist = False
             else:
-                # Check if file is valid JSON
+                # A structural check only; records are fully parsed once, during ingestion
                 try:
-                    with open(filepath, 'r') as f:
-                        json.load(f)
-                except json.JSONDecodeError:
+                    check_input(filepath)
+                except ValueError:
                     print(f"Invalid JSON in {file}")
                     all_exist = False
         
@@ -91,40 +114,43 @@ class AirlineOperationsSystem:
             print("No flight data found. Please check data files.")
             return
         
+        # Predictions are counted into the summary as they are produced
+        summary = OperationsSummary()
+        
         print("\nPredicting Flight Delays...")
-        delay_predictions = self.delay_predictor.predict_all_flights(logs_data)
+        delay_predictions = self.delay_predictor.predict_all_flights(logs_data, summary=summary)
         
         print("\nOptimizing Crew Schedules...")
         crew_schedule = self.crew_optimizer.optimize_schedule(logs_data)
         
         print("\nPredicting Passenger Load...")
-        load_predictions = self.load_predictor.predict_loads(logs_data)
+        load_predictions = self.load_predictor.predict_loads(logs_data, summary=summary)
         
         print("\nMonitoring Aircraft Health...")
         health_alerts = self.health_monitor.monitor_all_aircraft(logs_data)
         
+        print("\nPlanning Tail Assignments...")
+        tail_plan = self.plan_tails(logs_data)
+        
         print("\nAnalyzing Flight Routes...")
         route_suggestions = self.log_processor.analyze_routes(logs_data)
         
+        results = {
+            'logs_data': logs_data,
+            'delay_predictions': delay_predictions,
+            'crew_schedule': crew_schedule,
+            'load_predictions': load_predictions,
+            'health_alerts': health_alerts,
+            'tail_plan': tail_plan,
+            'route_suggestions': route_suggestions
+        }
+        summary = OperationsSummary.build(summary=summary, **results)
+        
         print("\nGenerating Operations Dashboard...")
-        self.dashboard.display(
-            logs_data=logs_data,
-            delay_predictions=delay_predictions,
-            crew_schedule=crew_schedule,
-            load_predictions=load_predictions,
-            health_alerts=health_alerts,
-            route_suggestions=route_suggestions
-        )
+        self.dashboard.display(summary=summary, **results)
         
         print("\nGenerating Daily Report...")
-        report_path = self.reporter.generate_daily_report(
-            logs_data=logs_data,
-            delay_predictions=delay_predictions,
-            crew_schedule=crew_schedule,
-            load_predictions=load_predictions,
-            health_alerts=health_alerts,
-            route_suggestions=route_suggestions
-        )
+        report_path = self.reporter.generate_daily_report(summary=summary, **results)
         
         print(f"\nDaily report generated: {report_path}")
     
@@ -142,26 +168,36 @@ class AirlineOperationsSystem:
             print("No flight data available to generate report.")
             return
         
-        delay_predictions = self.delay_predictor.predict_all_flights(logs_data)
+        summary = OperationsSummary()
+        delay_predictions = self.delay_predictor.predict_all_flights(logs_data, summary=summary)
         crew_schedule = self.crew_optimizer.optimize_schedule(logs_data)
-        load_predictions = self.load_predictor.predict_loads(logs_data)
+        load_predictions = self.load_predictor.predict_loads(logs_data, summary=summary)
         health_alerts = self.health_monitor.monitor_all_aircraft(logs_data)
+        tail_plan = self.plan_tails(logs_data)
         route_suggestions = self.log_processor.analyze_routes(logs_data)
         
         report_path = self.reporter.generate_daily_report(
+            summary=summary,
             logs_data=logs_data,
             delay_predictions=delay_predictions,
             crew_schedule=crew_schedule,
             load_predictions=load_predictions,
             health_alerts=health_alerts,
+            tail_plan=tail_plan,
             route_suggestions=route_suggestions
         )
         
         print(f"Daily report generated: {report_path}")
         return report_path
     
+    def plan_tails(self, logs_data):
+        """Reassign the schedule around tails grounded by an unresolved critical incident in the alert logs"""
+        grounded = self.tail_assigner.grounded_aircraft(self.health_monitor.alert_store.open_incidents())
+        return self.tail_assigner.assign(logs_data['flight_schedule'], grounded)
+    
     def run_interactive_mode(self):
         while True:
+            self.reload_config_if_changed()
             print("\n" + "="*60)
             print("AIRLINE OPERATIONS DASHBOARD MENU")
             print("="*60)
@@ -174,11 +210,15 @@ class AirlineOperationsSystem:
             print("7. Generate Custom Report")
             print("8. View System Configuration")
             print("9. Initialize/Reset Sample Data")
-            print("10. Exit")
+            print("10. Run Rolling-Horizon Planner (Replay)")
+            print("11. Run Discrete-Event Simulation (Replay)")
+            print("12. Live Operations Dashboard")
+            print("13. View Fuel Plan")
+            print("14. Exit")
             print("="*60)
             
             try:
-                choice = input("\nEnter your choice (1-10): ").strip()
+                choice = input("\nEnter your choice (1-14): ").strip()
                 
                 if choice == '1':
                     self.process_daily_operations()
@@ -200,6 +240,14 @@ class AirlineOperationsSystem:
                     print("\nInitializing sample data...")
                     os.system("python init_system.py")
                 elif choice == '10':
+                    self.run_planner()
+                elif choice == '11':
+                    self.run_simulation()
+                elif choice == '12':
+                    self.run_live_dashboard()
+                elif choice == '13':
+                    self.view_fuel_plan()
+                elif choice == '14':
                     print("\nThank you for using Airline Operations System!")
                     break
                 else:
@@ -225,6 +273,8 @@ class AirlineOperationsSystem:
         print("\n" + "="*60)
         print("FLIGHT DELAY PREDICTIONS")
         print("="*60)
+        if self.delay_predictor.model is not None:
+            print("Delay minutes come from the trained model; reasons list the rules that fired.")
         
         delayed_flights = 0
         for flight_id, prediction in predictions.items():
@@ -253,6 +303,9 @@ class AirlineOperationsSystem:
         
         schedule = self.crew_optimizer.optimize_schedule(logs_data)
         self.crew_optimizer.display_schedule(schedule)
+        
+        pairings = self.crew_optimizer.build_pairings(logs_data)
+        self.crew_optimizer.display_pairings(pairings)
     
     def view_health_alerts(self):
         if not self.check_data_files():
@@ -281,6 +334,7 @@ class AirlineOperationsSystem:
                 print(f"Alert: {alert['alert_type']}")
                 print(f"Message: {alert['message']}")
                 print(f"Time: {alert['timestamp'][:19]}")
+                print(f"Status: {self.health_monitor.alert_store.state(alert['aircraft_id'], alert['alert_type'])}")
         
         if alerts['warning']:
             print("\nWARNING ALERTS:")
@@ -289,6 +343,7 @@ class AirlineOperationsSystem:
                 print(f"Alert: {alert['alert_type']}")
                 print(f"Message: {alert['message']}")
                 print(f"Time: {alert['timestamp'][:19]}")
+                print(f"Status: {self.health_monitor.alert_store.state(alert['aircraft_id'], alert['alert_type'])}")
     
     def view_load_predictions(self):
         if not self.check_data_files():
@@ -312,6 +367,7 @@ class AirlineOperationsSystem:
             print(f"Predicted Load: {prediction['predicted_load']} passengers")
             print(f"Capacity: {prediction['capacity']} passengers")
             print(f"Load Factor: {prediction['load_factor']:.1%}")
+            print(f"Booking Limit: {prediction['booking_limit']} (show rate {prediction['show_rate']:.1%})")
             print(f"Status: {prediction['status']}")
     
     def generate_custom_report(self):
@@ -346,6 +402,152 @@ class AirlineOperationsSystem:
         
         print(f"\nCustom report generated: {report_path}")
     
+    def run_planner(self):
+        """Replay the loaded schedule through the rolling-horizon planner on a simulated clock"""
+        if not self.check_data_files():
+            print("Data files are missing or invalid.")
+            return
+        
+        logs_data = self.log_processor.process_all_logs()
+        if not logs_data['flight_schedule']:
+            print("No flight data available.")
+            return
+        
+        tick_seconds = self.config.get('planning', {}).get('tick_minutes', 15) * 60
+        first_departure = min(flight['departure_ts'] for flight in logs_data['flight_schedule'])
+        last_departure = max(flight['departure_ts'] for flight in logs_data['flight_schedule'])
+        
+        clock = SimulatedClock(first_departure - tick_seconds)
+        planner = RollingHorizonPlanner(self, clock=clock)
+        planner.feed(logs_data)
+        
+        print("\n" + "="*60)
+        print("ROLLING-HORIZON PLANNER")
+        print("="*60)
+        
+        ticks = (last_departure - clock()) // tick_seconds + 2
+        results = planner.run(ticks, tick_seconds)
+        for result in results:
+            print(f"{datetime.fromtimestamp(result['now']).strftime('%Y-%m-%d %H:%M')}  "
+                  f"active: {result['active_flights']:4d}  retired: {result['retired_flights']:3d}  "
+                  f"telemetry: {result['telemetry_readings']:5d}  reassigned: {result['reassigned_flights']:3d}  "
+                  f"latency: {result['latency_ms']:.1f} ms")
+            for change in result['tail_changes']:
+                print(f"    {change['flight_id']}: {change['from_aircraft']} -> {change['to_aircraft']} ({change['reason']})")
+        
+        latencies = sorted(result['latency_ms'] for result in results)
+        print(f"\nTicks: {len(results)}, median latency: {latencies[len(latencies) // 2]:.1f} ms, "
+              f"max latency: {latencies[-1]:.1f} ms")
+        
+        print(f"Grounded at end of replay: {', '.join(sorted(planner.grounded)) or 'none'}")
+        if planner.tail_plan and planner.tail_plan['unassigned']:
+            print(f"Flights left without a tail: {len(planner.tail_plan['unassigned'])}")
+            for flight in planner.tail_plan['unassigned'][:5]:
+                print(f"  {flight['flight_id']} ({flight['aircraft_id']}): {flight['reason']}")
+    
+    def run_live_dashboard(self):
+        """Keep the dashboard on screen, re-running the pipeline whenever a data file changes"""
+        if not self.check_data_files():
+            print("Data files are missing or invalid.")
+            return
+        
+        data_files = sorted(os.path.join('data', name) for name in os.listdir('data') if name.endswith('.json'))
+        last_modified = {}
+        live = LiveDashboard(self.dashboard)
+        
+        def source():
+            # Reloading the config rebuilds the modules, so everything is recomputed under the new settings
+            with contextlib.redirect_stdout(io.StringIO()):
+                reloaded = self.reload_config_if_changed()
+            # A rejected edit would otherwise go unnoticed while the old settings keep running
+            error = self.config_watcher.error
+            live.notice = f"Config change ignored: {error}" if error else ''
+            modified = {path: os.path.getmtime(path) for path in data_files if os.path.exists(path)}
+            if modified == last_modified and not reloaded:
+                return None
+            last_modified.clear()
+            last_modified.update(modified)
+            
+            # Progress output from the modules would scroll the live view
+            with contextlib.redirect_stdout(io.StringIO()):
+                logs_data = self.log_processor.process_all_logs()
+                return {
+                    'logs_data': logs_data,
+                    'delay_predictions': self.delay_predictor.predict_all_flights(logs_data),
+                    'crew_schedule': self.crew_optimizer.optimize_schedule(logs_data),
+                    'load_predictions': self.load_predictor.predict_loads(logs_data),
+                    'health_alerts': self.health_monitor.monitor_all_aircraft(logs_data),
+                    'tail_plan': self.plan_tails(logs_data),
+                    'route_suggestions': self.log_processor.analyze_routes(logs_data)
+                }
+        
+        interval = self.config.get('dashboard', {}).get('refresh_seconds', 5)
+        live.run(source, interval)
+    
+    def view_fuel_plan(self):
+        if not self.check_data_files():
+            print("Data files are missing or invalid.")
+            return
+        
+        logs_data = self.log_processor.process_all_logs()
+        if not logs_data['flight_schedule']:
+            print("No flight data available.")
+            return
+        
+        started = time.perf_counter()
+        plans = self.fuel_planner.plan(logs_data)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        print("\n" + "="*60)
+        print("FUEL PLAN")
+        print("="*60)
+        
+        for flight_id, plan in plans.items():
+            print(f"\nFlight: {flight_id} ({plan['route']}, {plan['aircraft_id']})")
+            print(f"Block Time: {plan['block_hours']:.1f} hours")
+            if plan['issue']:
+                print(f"NOT PLANNED: {plan['issue']}")
+                continue
+            print(f"Trip Fuel: {plan['trip_fuel_kg']} kg")
+            print(f"Contingency: {plan['contingency_kg']} kg  Reserve: {plan['reserve_kg']} kg")
+            print(f"Block Fuel: {plan['block_fuel_kg']} kg (burn curve: {plan['burn_source']})")
+        
+        planned = [plan for plan in plans.values() if not plan['issue']]
+        total = sum(plan['block_fuel_kg'] for plan in planned)
+        print(f"\nFleet Block Fuel: {total} kg for {len(planned)} flights ({elapsed_ms:.1f} ms)")
+        if len(planned) < len(plans):
+            print(f"{len(plans) - len(planned)} flights not planned: their schedule has no positive block time")
+    
+    def run_simulation(self):
+        if not self.check_data_files():
+            print("Data files are missing or invalid.")
+            return
+        
+        logs_data = self.log_processor.process_all_logs()
+        if not logs_data['flight_schedule']:
+            print("No flight data available.")
+            return
+        
+        simulator = OperationsSimulator(self)
+        simulator.load(logs_data)
+        stats = simulator.run()
+        
+        print("\n" + "="*60)
+        print("DISCRETE-EVENT SIMULATION")
+        print("="*60)
+        
+        print(f"\nFlights departed: {stats['flights_departed']}")
+        print(f"Flights delayed: {stats['flights_delayed']}")
+        print(f"Non-compliant crew assignments: {stats['non_compliant_flights']}")
+        print(f"Health alerts: {stats['alerts'].get('CRITICAL', 0)} critical, {stats['alerts'].get('WARNING', 0)} warning")
+        
+        print("\nEvent Latency:")
+        for name, event_stats in stats['events'].items():
+            print(f"  {name}: {event_stats['count']} events, mean {event_stats['mean_ms']:.3f} ms, "
+                  f"p95 {event_stats['p95_ms']:.3f} ms, max {event_stats['max_ms']:.3f} ms")
+        
+        print(f"\nReplay time: {stats['elapsed_seconds']:.2f} s")
+    
     def view_configuration(self):
         print("\n" + "="*60)
         print("SYSTEM CONFIGURATION")
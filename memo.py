@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+from modules.records import Record
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed);
+"""
+
+# SQLite caps the number of bound parameters per statement
+BATCH_SIZE = 500
+
+def content_hash(value):
+    """Digest of a record's fields, or of a mapping or list independent of key order
+    
+    Records hash through their repr, which is far cheaper than re-encoding them;
+    nested readings then hash in load order, so a reordered source file can
+    only cost a cache miss, never a wrong hit.
+    """
+    if isinstance(value, Record):
+        encoded = repr(value)
+    else:
+        encoded = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+def config_hash(config, sections=(), thresholds=()):
+    """Digest of only the config a module reads, so unrelated edits keep its results valid"""
+    subset = {section: config.get(section) for section in sections}
+    subset['thresholds'] = {name: config['thresholds'].get(name) for name in thresholds}
+    return content_hash(subset)
+
+def cache_key(*parts):
+    return hashlib.blake2b('|'.join(str(part) for part in parts).encode('utf-8'), digest_size=20).hexdigest()
+
+class RecordHashes:
+    """Per-record content hashes of a snapshot, grouped the way the predictors look records up"""
+    
+    def __init__(self, logs_data):
+        self.logs_data = logs_data
+        self._flights = {}
+        self._engine = None
+        self._weather = None
+        self._crew = None
+        self._loads = None
+    
+    def flight(self, flight):
+        digest = self._flights.get(flight['flight_id'])
+        if digest is None:
+            digest = content_hash(flight)
+            self._flights[flight['flight_id']] = digest
+        return digest
+    
+    def engine(self, aircraft_id):
+        if self._engine is None:
+            # Only the first log listed per aircraft is read by the predictors
+            self._engine = {}
+            for engine_log in self.logs_data.get('engine_logs', []):
+                if engine_log['aircraft_id'] not in self._engine:
+                    self._engine[engine_log['aircraft_id']] = content_hash(engine_log)
+        return self._engine.get(aircraft_id, '-')
+    
+    def _grouped(self, records, field):
+        groups = {}
+        for record in records:
+            groups.setdefault(record[field], []).append(content_hash(record))
+        # Kept in load order: predictors read positional entries such as a route's first load record
+        return {name: cache_key(*digests) for name, digests in groups.items()}
+    
+    def weather(self, airport):
+        if self._weather is None:
+            self._weather = self._grouped(self.logs_data.get('weather_logs', []), 'airport')
+        return self._weather.get(airport, '-')
+    
+    def crew(self, airport):
+        if self._crew is None:
+            self._crew = self._grouped(self.logs_data.get('crew_schedules', []), 'current_location')
+        return self._crew.get(airport, '-')
+    
+    def loads(self, route):
+        if self._loads is None:
+            self._loads = self._grouped(self.logs_data.get('passenger_load', []), 'route')
+        return self._loads.get(route, '-')
+
+def get_record_hashes(logs_data):
+    """Hash the snapshot's records once and share the digests between modules"""
+    hashes = logs_data.get('record_hashes')
+    if hashes is None:
+        hashes = RecordHashes(logs_data)
+        logs_data['record_hashes'] = hashes
+    return hashes
+
+class ResultCache:
+    """SQLite-backed memo table with least-recently-used eviction under a byte cap"""
+    
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+    
+    def close(self):
+        self.connection.close()
+    
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), BATCH_SIZE):
+            batch = keys[start:start + BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            for key, value in self.connection.execute(
+                f"SELECT key, value FROM results WHERE key IN ({placeholders})", batch
+            ):
+                found[key] = pickle.loads(value)
+        
+        if found:
+            now = time.time()
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE results SET accessed = ? WHERE key = ?", ((now, key) for key in found)
+                )
+        return found
+    
+    def put_many(self, items):
+        if not items:
+            return
+        
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, blob, len(blob), now))
+        
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows)
+        self._evict()
+    
+    def _evict(self):
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        doomed = []
+        for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        
+        with self.connection:
+            self.connection.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+_caches = {}
+
+def get_result_cache(config):
+    """Shared cache for the configured path, or None when memoization is switched off"""
+    settings = config.get('memoization', {})
+    if not settings.get('enabled', True):
+        return None
+    
+    path = settings.get('path', 'output/cache/results.db')
+    if path not in _caches:
+        _caches[path] = ResultCache(path, int(settings.get('max_mb', 64) * 1024 * 1024))
+    return _caches[path]
+
+def memoized(cache, entries, compute):
+    """entries maps name -> (cache key, argument); misses are computed and stored in one batch"""
+    if cache is None:
+        return {name: compute(argument) for name, (key, argument) in entries.items()}
+    
+    hits = cache.get_many(key for key, argument in entries.values())
+    results = {}
+    fresh = {}
+    for name, (key, argument) in entries.items():
+        if key in hits:
+            results[name] = hits[key]
+        else:
+            results[name] = fresh[key] = compute(argument)
+    
+    # Stored before callers post-process the results in place
+    cache.put_many(fresh)
+    return results
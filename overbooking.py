@@ -0,0 +1,93 @@
+import numpy as np
+
+from modules.settings import get_compiled_config
+
+def normal_cdf(x):
+    """Standard normal CDF of an array (Abramowitz and Stegun 7.1.26, absolute error below 1e-7)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+def normal_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+class OverbookingOptimizer:
+    """Booking limits that trade empty-seat revenue against denied-boarding cost, for every flight at once
+    
+    Shows out of L bookings are approximated as normal with the beta-binomial
+    mean and variance. Booking L+1 pays off while the chance that the first L
+    bookings already fill the cabin stays below fare / denied_boarding_cost,
+    so each flight's limit is its capacity plus the count of extra seats
+    passing that test, capped at max_overbooking_percent.
+    
+    The show probability is the configured prior, a beta distribution worth
+    prior_weight bookings whose variance widens every flight's show-up
+    distribution. Passenger load records keep boarded counts without the
+    bookings they came from, so no per-route show rate can be measured.
+    """
+    
+    def __init__(self, config):
+        self.config = config
+        self.aircraft = get_compiled_config(config).aircraft
+        settings = config.get('overbooking', {})
+        self.prior_rate = settings.get('show_rate', 0.92)
+        self.prior_weight = settings.get('prior_weight_bookings', 400)
+        self.rate_variance = self.prior_rate * (1 - self.prior_rate) / (self.prior_weight + 1)
+        self.fare = settings.get('average_fare', 250)
+        self.denied_boarding_cost = settings.get('denied_boarding_cost', 800)
+        self.max_overbooking = settings.get('max_overbooking_percent', 15) / 100
+    
+    def optimize(self, logs_data):
+        """flight_id -> booking limit and its expected outcome for every scheduled flight"""
+        flights = logs_data['flight_schedule']
+        if not flights:
+            return {}
+        
+        bookings = {}
+        for load_data in logs_data['passenger_load']:
+            bookings.setdefault(load_data['route'], load_data['current_bookings'])
+        
+        capacity = np.array([self.aircraft[flight['aircraft_type']].capacity for flight in flights], dtype=float)
+        show_rate, rate_variance = self.prior_rate, self.rate_variance
+        
+        # One column per candidate extra booking, shared by all flights
+        extra = np.arange(int(np.ceil(capacity.max() * self.max_overbooking)) + 1)
+        limits = capacity[:, None] + extra
+        probability_full = self._probability_at_least(limits, capacity[:, None], show_rate, rate_variance)
+        
+        critical_ratio = self.fare / self.denied_boarding_cost
+        # Extra seats are only worth selling while the cabin is unlikely to fill already; that probability only grows with L
+        allowed = (probability_full <= critical_ratio) & (extra <= np.floor(capacity * self.max_overbooking)[:, None])
+        booking_limit = capacity + allowed.sum(axis=1)
+        
+        expected_shows = booking_limit * show_rate
+        spread = self._spread(booking_limit, show_rate, rate_variance)
+        z = (capacity - expected_shows) / spread
+        expected_denied = spread * normal_pdf(z) + (expected_shows - capacity) * (1 - normal_cdf(z))
+        denied_probability = self._probability_at_least(booking_limit, capacity + 1, show_rate, rate_variance)
+        
+        results = {}
+        for position, flight in enumerate(flights):
+            results[flight['flight_id']] = {
+                'route': flight['route'],
+                'capacity': int(capacity[position]),
+                'current_bookings': bookings.get(flight['route'], 0),
+                'show_rate': float(show_rate),
+                'booking_limit': int(booking_limit[position]),
+                'overbook_seats': int(booking_limit[position] - capacity[position]),
+                'expected_shows': float(expected_shows[position]),
+                'expected_denied_boardings': float(expected_denied[position]),
+                'denied_boarding_probability': float(denied_probability[position])
+            }
+        return results
+    
+    def _spread(self, bookings, show_rate, rate_variance):
+        variance = bookings * show_rate * (1 - show_rate) + bookings * bookings * rate_variance
+        return np.sqrt(np.maximum(variance, 1e-9))
+    
+    def _probability_at_least(self, bookings, seats, show_rate, rate_variance):
+        """P(shows >= seats) with a continuity correction"""
+        spread = self._spread(bookings, show_rate, rate_variance)
+        return 1 - normal_cdf((seats - 0.5 - bookings * show_rate) / spread)
@@ -0,0 +1,135 @@
+import heapq
+
+from modules.flight_index import get_flight_index
+from modules.settings import get_compiled_config
+
+class ConnectionGraph:
+    """Legal crew connections: same airport, at least the minimum connection time, at most the longest sit"""
+    
+    def __init__(self, config, logs_data, max_sit_hours=4, max_connections=6):
+        crew_rules = config['crew_rules']
+        self.min_connection = crew_rules.get('min_connection_minutes', 45) * 60
+        self.max_sit = int(max_sit_hours * 3600)
+        self.max_connections = max_connections
+        
+        self.flights = {flight['flight_id']: flight for flight in logs_data['flight_schedule']}
+        self.successors = {}
+        
+        flight_index = get_flight_index(logs_data)
+        for flight_id, flight in self.flights.items():
+            destination = flight['route'].split('-')[1]
+            earliest = flight['arrival_ts'] + self.min_connection
+            
+            # The earliest onward legs are kept; later ones only lengthen the duty
+            onward = flight_index.departing_between(earliest, flight['arrival_ts'] + self.max_sit + 1, destination)
+            self.successors[flight_id] = [next_flight['flight_id'] for next_flight in onward[:self.max_connections]]
+
+class PairingGenerator:
+    """Enumerates legal multi-leg duty periods and picks a covering set of them greedily"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.crew_rules = config['crew_rules']
+        self.aircraft = get_compiled_config(config).aircraft
+        pairing = config.get('pairing', {})
+        self.max_sit_hours = pairing.get('max_sit_hours', 4)
+        self.max_connections = pairing.get('max_connections_per_leg', 6)
+        self.duty_overhead_hours = pairing.get('duty_overhead_hours', 1.5)
+        
+        self.max_duty = self.crew_rules['max_duty_hours'] * 3600
+        # Report and release time count against the duty limit, leaving less for departure to final arrival
+        self.max_span = self.max_duty - self.duty_overhead_hours * 3600
+        self.max_legs = self.crew_rules['max_consecutive_flights']
+    
+    def enumerate_duties(self, graph):
+        """Return every legal duty as (legs, release_ts); each start flight's duties share memoized suffixes"""
+        memo = {}
+        
+        def suffixes(flight_id, legs_left):
+            key = (flight_id, legs_left)
+            if key in memo:
+                return memo[key]
+            
+            flight = graph.flights[flight_id]
+            result = [((flight_id,), flight['arrival_ts'])]
+            
+            if legs_left > 1:
+                # Any duty through this leg started no later than it, so longer spans can never be legal
+                deadline = flight['departure_ts'] + self.max_span
+                for next_id in graph.successors[flight_id]:
+                    if graph.flights[next_id]['arrival_ts'] > deadline:
+                        continue
+                    for legs, release_ts in suffixes(next_id, legs_left - 1):
+                        if release_ts <= deadline:
+                            result.append(((flight_id,) + legs, release_ts))
+            
+            memo[key] = result
+            return result
+        
+        duties = []
+        for flight_id, flight in graph.flights.items():
+            if flight['arrival_ts'] - flight['departure_ts'] > self.max_span:
+                continue
+            duties.extend(suffixes(flight_id, self.max_legs))
+        return duties
+    
+    def _duty_cost(self, graph, legs, release_ts):
+        report_ts = graph.flights[legs[0]]['departure_ts']
+        return (release_ts - report_ts) / 3600 + self.duty_overhead_hours
+    
+    def solve(self, graph, duties):
+        """Greedy weighted set cover: repeatedly take the duty with the lowest cost per newly covered leg"""
+        uncovered = set(graph.flights)
+        heap = []
+        for position, (legs, release_ts) in enumerate(duties):
+            cost = self._duty_cost(graph, legs, release_ts)
+            heapq.heappush(heap, (cost / len(legs), position, len(legs)))
+        
+        chosen = []
+        while uncovered and heap:
+            ratio, position, counted = heapq.heappop(heap)
+            legs, release_ts = duties[position]
+            new_legs = sum(1 for leg in legs if leg in uncovered)
+            if new_legs == 0:
+                continue
+            
+            # Scores only get worse as legs are covered, so a stale entry is re-queued instead of rescanned
+            if new_legs < counted:
+                cost = self._duty_cost(graph, legs, release_ts)
+                heapq.heappush(heap, (cost / new_legs, position, new_legs))
+                continue
+            
+            chosen.append(self._pairing(graph, legs, release_ts, uncovered))
+            uncovered.difference_update(legs)
+        
+        return chosen, sorted(uncovered)
+    
+    def _pairing(self, graph, legs, release_ts, uncovered):
+        flights = [graph.flights[leg] for leg in legs]
+        required = {'pilots': 0, 'crew': 0}
+        for flight in flights:
+            spec = self.aircraft[flight['aircraft_type']]
+            required['pilots'] = max(required['pilots'], spec.pilots)
+            required['crew'] = max(required['crew'], spec.crew)
+        
+        return {
+            'legs': list(legs),
+            'deadhead_legs': [leg for leg in legs if leg not in uncovered],
+            'start_airport': flights[0]['route'].split('-')[0],
+            'end_airport': flights[-1]['route'].split('-')[1],
+            'report_ts': flights[0]['departure_ts'],
+            'release_ts': release_ts,
+            'duty_hours': (release_ts - flights[0]['departure_ts']) / 3600,
+            'required_crew': required
+        }
+    
+    def generate(self, logs_data):
+        graph = ConnectionGraph(self.config, logs_data, self.max_sit_hours, self.max_connections)
+        duties = self.enumerate_duties(graph)
+        pairings, uncovered = self.solve(graph, duties)
+        
+        return {
+            'pairings': pairings,
+            'uncovered_flights': uncovered,
+            'candidate_duties': len(duties)
+        }
@@ -0,0 +1,207 @@
+import heapq
+import time
+from collections import deque
+
+from modules.health_monitor import HealthMonitor
+from modules.tail_assignment import TailAssigner
+
+class SimulatedClock:
+    """Clock that only moves when advanced, for replaying a snapshot faster than real time"""
+    
+    def __init__(self, start):
+        self.now = int(start)
+    
+    def __call__(self):
+        return self.now
+    
+    def advance(self, seconds):
+        self.now += int(seconds)
+
+class RollingHorizonPlanner:
+    """Re-plans only the flights departing inside the next horizon_hours as the clock advances"""
+    
+    def __init__(self, system, clock=None):
+        planning = system.config.get('planning', {})
+        self.system = system
+        self.horizon = int(planning.get('horizon_hours', 6) * 3600)
+        self.telemetry_window = int(planning.get('telemetry_window_hours', 24) * 3600)
+        self.tick_seconds = int(planning.get('tick_minutes', 15) * 60)
+        self.clock = clock or time.time
+        
+        self.pending_flights = []
+        self.pending_telemetry = []
+        self.pending_weather = []
+        self.sequence = 0
+        # Keys of flights and readings that are queued or in the window; dropped again when they age out
+        self.known_flights = set()
+        self.known_readings = set()
+        self.known_reports = set()
+        
+        self.active_flights = {}
+        self.telemetry = deque()
+        self.weather = deque()
+        self.crew_schedules = []
+        self.passenger_load = []
+        
+        self.delay_predictions = {}
+        self.crew_schedule = {}
+        self.load_predictions = {}
+        self.health_alerts = {'critical': [], 'warning': []}
+        self.aircraft_alerts = {}
+        
+        # The planner's own monitor streams its readings into its own baselines and never writes the alert logs
+        self.health_monitor = HealthMonitor(system.config, store_alerts=False)
+        self.tail_assigner = TailAssigner(system.config)
+        self.grounded = set()
+        self.tail_plan = None
+    
+    def _push(self, queue, timestamp, record):
+        # The sequence number keeps heap ordering stable and avoids comparing records
+        heapq.heappush(queue, (timestamp, self.sequence, record))
+        self.sequence += 1
+    
+    def feed(self, logs_data):
+        """Queue a snapshot; flights and readings already seen or already past are ignored, crew and loads are replaced"""
+        now = int(self.clock())
+        cutoff = now - self.telemetry_window
+        
+        for flight in logs_data.get('flight_schedule', []):
+            if flight['departure_ts'] > now and flight['flight_id'] not in self.known_flights:
+                self.known_flights.add(flight['flight_id'])
+                self.health_monitor.anomaly.register_flights([flight])
+                self._push(self.pending_flights, flight['departure_ts'], flight)
+        
+        for reading in logs_data.get('engine_logs', []):
+            key = (reading['aircraft_id'], reading['reading_ts'])
+            if reading['reading_ts'] >= cutoff and key not in self.known_readings:
+                self.known_readings.add(key)
+                self._push(self.pending_telemetry, reading['reading_ts'], reading)
+        
+        for report in logs_data.get('weather_logs', []):
+            key = (report['airport'], report['observed_ts'])
+            if report['observed_ts'] >= cutoff and key not in self.known_reports:
+                self.known_reports.add(key)
+                self._push(self.pending_weather, report['observed_ts'], report)
+        
+        if logs_data.get('crew_schedules'):
+            self.crew_schedules = logs_data['crew_schedules']
+        if logs_data.get('passenger_load'):
+            self.passenger_load = logs_data['passenger_load']
+    
+    def _admit(self, queue, until):
+        admitted = []
+        while queue and queue[0][0] <= until:
+            admitted.append(heapq.heappop(queue)[2])
+        return admitted
+    
+    def tick(self):
+        started = time.perf_counter()
+        now = int(self.clock())
+        
+        retired = [flight_id for flight_id, flight in self.active_flights.items()
+                   if flight['departure_ts'] <= now]
+        for flight_id in retired:
+            del self.active_flights[flight_id]
+            self.known_flights.discard(flight_id)
+            self.delay_predictions.pop(flight_id, None)
+            self.crew_schedule.pop(flight_id, None)
+            self.load_predictions.pop(flight_id, None)
+        
+        # Flights whose departure already passed before they were admitted are dropped unseen
+        for flight in self._admit(self.pending_flights, now + self.horizon):
+            if flight['departure_ts'] > now:
+                self.active_flights[flight['flight_id']] = flight
+            else:
+                self.known_flights.discard(flight['flight_id'])
+        
+        new_telemetry = self._admit(self.pending_telemetry, now)
+        for reading in new_telemetry:
+            self.telemetry.appendleft(reading)
+        for report in self._admit(self.pending_weather, now):
+            self.weather.appendleft(report)
+        
+        cutoff = now - self.telemetry_window
+        while self.telemetry and self.telemetry[-1]['reading_ts'] < cutoff:
+            reading = self.telemetry.pop()
+            self.known_readings.discard((reading['aircraft_id'], reading['reading_ts']))
+        while self.weather and self.weather[-1]['observed_ts'] < cutoff:
+            report = self.weather.pop()
+            self.known_reports.discard((report['airport'], report['observed_ts']))
+        
+        # Newest-first so the predictors' "first entry is the latest" convention holds;
+        # flights moved off a grounded tail are predicted on the tail that will fly them
+        window = {
+            'flight_schedule': self.tail_assigner.apply(self.active_flights.values(), self.tail_plan),
+            'engine_logs': list(self.telemetry),
+            'weather_logs': list(self.weather),
+            'crew_schedules': self.crew_schedules,
+            'passenger_load': self.passenger_load
+        }
+        
+        if window['flight_schedule']:
+            self.delay_predictions = self.system.delay_predictor.predict_all_flights(window)
+            self.crew_schedule = self.system.crew_optimizer.optimize_schedule(window)
+            self.load_predictions = self.system.load_predictor.predict_loads(window)
+        else:
+            self.delay_predictions = {}
+            self.crew_schedule = {}
+            self.load_predictions = {}
+        
+        # Without new telemetry every aircraft's last alerts stand
+        if new_telemetry:
+            self._check_health(new_telemetry)
+        
+        # Grounding follows the aircraft's current critical alerts, so a clean reading releases the tail.
+        # While any tail is grounded the horizon is re-planned every tick, covering newly admitted flights;
+        # only reassignments the previous plan did not already hold are reported
+        previous = {change['flight_id']: change['to_aircraft'] for change in (self.tail_plan or {}).get('changes', [])}
+        self.grounded = self.tail_assigner.grounded_aircraft(self.health_alerts['critical'])
+        self.tail_plan = self.tail_assigner.assign(self.active_flights.values(), self.grounded) if self.grounded else None
+        tail_changes = [change for change in (self.tail_plan or {}).get('changes', [])
+                        if previous.get(change['flight_id']) != change['to_aircraft']]
+        
+        return {
+            'now': now,
+            'active_flights': len(self.active_flights),
+            'retired_flights': len(retired),
+            'pending_flights': len(self.pending_flights),
+            'telemetry_readings': len(self.telemetry),
+            'new_telemetry': len(new_telemetry),
+            'critical_alerts': len(self.health_alerts['critical']),
+            'reassigned_flights': len(tail_changes),
+            'tail_changes': tail_changes,
+            'latency_ms': (time.perf_counter() - started) * 1000
+        }
+    
+    def _check_health(self, new_telemetry):
+        """Fold the new readings into the planner's baselines and re-check each updated aircraft's latest one"""
+        monitor = self.health_monitor
+        monitor.anomaly.update(new_telemetry)
+        
+        latest = {}
+        for reading in new_telemetry:
+            if reading['reading_ts'] >= latest.get(reading['aircraft_id'], reading)['reading_ts']:
+                latest[reading['aircraft_id']] = reading
+        readings = list(latest.values())
+        
+        for reading, distance in zip(readings, monitor.anomaly.score(readings)):
+            self.aircraft_alerts[reading['aircraft_id']] = monitor.analyze_reading(
+                reading, log_alerts=False, distance=distance
+            )
+        
+        self.health_alerts = {'critical': [], 'warning': []}
+        for alerts in self.aircraft_alerts.values():
+            for alert in alerts:
+                self.health_alerts['critical' if alert['severity'] == 'CRITICAL' else 'warning'].append(alert)
+    
+    def run(self, ticks, tick_seconds=None):
+        """Run a number of ticks; a simulated clock is advanced, a wall clock is slept on"""
+        tick_seconds = tick_seconds or self.tick_seconds
+        results = []
+        for _ in range(ticks):
+            results.append(self.tick())
+            if isinstance(self.clock, SimulatedClock):
+                self.clock.advance(tick_seconds)
+            else:
+                time.sleep(tick_seconds)
+        return results
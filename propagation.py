@@ -0,0 +1,79 @@
+from modules.settings import get_compiled_config
+
+class DelayPropagator:
+    """Pushes predicted delays down each aircraft's rotation, absorbed only by turnaround slack"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.aircraft = get_compiled_config(config).aircraft
+    
+    def rotations(self, flights):
+        """Group flights by aircraft_id, each rotation ordered by scheduled departure"""
+        rotations = {}
+        for flight in flights:
+            rotations.setdefault(flight['aircraft_id'], []).append(flight)
+        
+        for rotation in rotations.values():
+            rotation.sort(key=lambda flight: flight['departure_ts'])
+        return rotations
+    
+    def propagate(self, flights, own_delays):
+        """Return flight_id -> (total_delay, knock_on_delay, inbound_flight_id) in minutes
+        
+        A flight leaves at the later of its own delayed departure and the moment
+        its aircraft is turned around after the delayed inbound leg.
+        """
+        propagated = {}
+        
+        for rotation in self.rotations(flights).values():
+            ready_ts = None
+            inbound = None
+            inbound_arrival_ts = None
+            
+            for flight in rotation:
+                own_delay = own_delays.get(flight['flight_id'], 0)
+                departure_ts = flight['departure_ts'] + own_delay * 60
+                
+                # A leg scheduled to leave before the previous one lands cannot be the same
+                # physical rotation, so the chain restarts instead of cascading bad data
+                if inbound_arrival_ts is not None and flight['departure_ts'] < inbound_arrival_ts:
+                    ready_ts = None
+                
+                knock_on = 0
+                if ready_ts is not None and ready_ts > departure_ts:
+                    knock_on = -(-(ready_ts - departure_ts) // 60)
+                
+                total_delay = own_delay + knock_on
+                propagated[flight['flight_id']] = (total_delay, knock_on, inbound if knock_on else None)
+                
+                ready_ts = flight['arrival_ts'] + total_delay * 60 + self.aircraft[flight['aircraft_type']].turnaround_seconds
+                inbound = flight['flight_id']
+                inbound_arrival_ts = flight['arrival_ts']
+        
+        return propagated
+    
+    def apply(self, flights, predictions):
+        """Fold knock-on delays into DelayPrediction records in place"""
+        own_delays = {flight_id: prediction['predicted_delay'] for flight_id, prediction in predictions.items()}
+        
+        for flight_id, (total_delay, knock_on, inbound) in self.propagate(flights, own_delays).items():
+            if not knock_on or flight_id not in predictions:
+                continue
+            
+            prediction = predictions[flight_id]
+            prediction['predicted_delay'] = total_delay
+            prediction['knock_on_delay'] = knock_on
+            prediction['inbound_flight'] = inbound
+            prediction['reasons'].append(f"Late inbound aircraft: {inbound} (+{knock_on} min)")
+            prediction['severity'] = delay_severity(total_delay)
+        
+        return predictions
+
+def delay_severity(delay_minutes):
+    if delay_minutes == 0:
+        return "NONE"
+    elif delay_minutes <= 30:
+        return "LOW"
+    elif delay_minutes <= 90:
+        return "MEDIUM"
+    return "HIGH"
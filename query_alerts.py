@@ -0,0 +1,88 @@
+import argparse
+import json
+import sys
+import time
+
+from modules.alert_index import AlertIndex
+from modules.alert_store import ALERT_LOGS, AlertStore
+
+def change_key(entry):
+    return (entry['aircraft_id'], entry['alert_type'], entry.get('source'), entry.get('state'), entry.get('updated'))
+
+def print_entry(entry):
+    print(f"{entry['timestamp'][:19]}  {entry['severity']:<8}  {entry['aircraft_id']:<8}  "
+          f"{entry['alert_type']:<22}  {entry.get('state', 'open'):<8}  {entry['message']}")
+
+def query():
+    """Look up alerts through the sidecar index, e.g. all critical alerts for GA-008 since a date"""
+    parser = argparse.ArgumentParser(description="Query the aircraft health alert logs")
+    parser.add_argument('--aircraft', help="aircraft id, e.g. GA-008")
+    parser.add_argument('--type', help="alert type, e.g. ENGINE_VIBRATION")
+    parser.add_argument('--severity', type=str.upper, choices=sorted(ALERT_LOGS))
+    parser.add_argument('--state', choices=['open', 'ack', 'resolved'])
+    parser.add_argument('--since', help="earliest timestamp or date (ISO format)")
+    parser.add_argument('--until', help="latest timestamp or date (ISO format), inclusive")
+    parser.add_argument('--history', action='store_true', help="show every state change, not just the latest")
+    parser.add_argument('--tail', type=int, metavar='N', help="only the N most recent matches")
+    parser.add_argument('--follow', action='store_true', help="keep printing new matches as alerts are logged")
+    parser.add_argument('--acknowledge', action='store_true',
+                        help="acknowledge the open incidents of --aircraft (optionally only --type) before querying")
+    args = parser.parse_args()
+    if args.acknowledge and not args.aircraft:
+        parser.error("--acknowledge needs --aircraft")
+    
+    try:
+        with open('airline_config.json', 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        print("Configuration file not found. Please run init_system.py first.")
+        sys.exit(1)
+    
+    if args.acknowledge:
+        acknowledged = AlertStore(config).acknowledge(args.aircraft, args.type)
+        print(f"Acknowledged {acknowledged} open incidents for {args.aircraft}\n")
+    
+    index = AlertIndex(config.get('alert_store', {}).get('index_path', 'logs/alert_index.db'))
+    filters = {
+        'aircraft_id': args.aircraft,
+        'alert_type': args.type,
+        'severity': args.severity,
+        'state': args.state,
+        'since': args.since,
+        'until': args.until,
+        'history': args.history
+    }
+    
+    started = time.perf_counter()
+    for path in ALERT_LOGS.values():
+        index.refresh(path)
+    matches = index.query(limit=args.tail, **filters)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    for _, entry in matches:
+        print_entry(entry)
+    print(f"\n{len(matches)} matching alerts ({elapsed_ms:.1f} ms)")
+    
+    if not args.follow:
+        return
+    
+    # A compacted log is re-indexed under new ids, so changes already shown are remembered
+    shown = set(change_key(entry) for _, entry in matches)
+    last_id = index.last_id()
+    try:
+        while True:
+            time.sleep(1)
+            for path in ALERT_LOGS.values():
+                index.refresh(path)
+            for line_id, entry in index.query(after_id=last_id, **filters):
+                last_id = max(last_id, line_id)
+                if change_key(entry) not in shown:
+                    shown.add(change_key(entry))
+                    print_entry(entry)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    query()
@@ -0,0 +1,105 @@
+import argparse
+import json
+import sys
+import time
+
+from modules.alert_store import ALERT_LOGS
+from modules.archive import ReportArchive
+
+def print_delays(rows):
+    for row in rows:
+        print(f"{row['date']}  {row['flights']:>5} flights  {row['delayed']:>5} delayed  "
+              f"avg {row['average_delay'] or 0:6.1f} min")
+
+def print_flight(rows):
+    for row in rows:
+        print(f"{row['date']}  {row['route']:<8}  {row['predicted_delay']:>4} min  "
+              f"{row['severity']:<8}  {row['reasons']}")
+
+def print_alerts(rows):
+    for row in rows:
+        print(f"{row['date']}  {row['severity']:<8}  {row['alert_type']:<22}  {row['message']}")
+
+def print_loads(rows):
+    for row in rows:
+        print(f"{row['date']}  {row['flights']:>5} flights  load {row['average_load_factor'] or 0:6.1%}  "
+              f"{row['overbooking_risk']:>4} overbooking risk")
+
+def print_compliance(rows):
+    for row in rows:
+        rate = row['compliant'] / row['flights'] if row['flights'] else 0
+        print(f"{row['date']}  {row['flights']:>5} flights  {row['compliant']:>5} compliant  ({rate:.1%})")
+
+def query():
+    """Trend queries over the archived daily runs, e.g. the delay profile of one route over a month"""
+    parser = argparse.ArgumentParser(description="Query the archive of daily operations runs")
+    parser.add_argument('--since', help="earliest run date (YYYY-MM-DD), default the first archived run")
+    parser.add_argument('--until', help="latest run date (YYYY-MM-DD), inclusive, default the last archived run")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    delays = commands.add_parser('delays', help="per-day delay profile")
+    delays.add_argument('--route', help="route, e.g. JFK-LAX")
+    delays.add_argument('--aircraft', help="aircraft id, e.g. GA-008")
+    
+    flight = commands.add_parser('flight', help="predicted delays of one flight")
+    flight.add_argument('flight_id')
+    
+    alerts = commands.add_parser('alerts', help="health alerts archived for one aircraft")
+    alerts.add_argument('aircraft')
+    alerts.add_argument('--severity', type=str.upper, choices=sorted(ALERT_LOGS))
+    
+    loads = commands.add_parser('loads', help="per-day load factor of one route")
+    loads.add_argument('route')
+    
+    commands.add_parser('compliance', help="per-day crew compliance")
+    commands.add_parser('runs', help="list the archived run dates")
+    args = parser.parse_args()
+    
+    try:
+        with open('airline_config.json', 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        print("Configuration file not found. Please run init_system.py first.")
+        sys.exit(1)
+    
+    archive = ReportArchive(config.get('reporting', {}).get('archive_path', 'output/archive/operations.db'))
+    try:
+        run_dates = archive.run_dates()
+        if not run_dates:
+            print("No runs archived yet. Generate a daily report first.")
+            return
+        
+        if args.command == 'runs':
+            for run_date in run_dates:
+                print(run_date)
+            print(f"\n{len(run_dates)} archived runs")
+            return
+        
+        since = args.since or run_dates[0]
+        until = args.until or run_dates[-1]
+        
+        started = time.perf_counter()
+        if args.command == 'delays':
+            rows = archive.delay_profile(since, until, route=args.route, aircraft_id=args.aircraft)
+            printer = print_delays
+        elif args.command == 'flight':
+            rows = archive.flight_history(args.flight_id, since, until)
+            printer = print_flight
+        elif args.command == 'alerts':
+            rows = archive.alert_history(args.aircraft, since, until, severity=args.severity)
+            printer = print_alerts
+        elif args.command == 'loads':
+            rows = archive.load_trend(args.route, since, until)
+            printer = print_loads
+        else:
+            rows = archive.compliance_trend(since, until)
+            printer = print_compliance
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        printer(rows)
+        print(f"\n{len(rows)} rows from {since} to {until} ({elapsed_ms:.1f} ms)")
+    finally:
+        archive.close()
+
+if __name__ == "__main__":
+    query()
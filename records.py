@@ -0,0 +1,145 @@
+class Record:
+    """Slotted record with a read-mostly dict interface for older callers"""
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(*[get(name) for name in cls.__slots__])
+    
+    def __getitem__(self, key):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+    
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+    
+    def keys(self):
+        return [name for name in self.__slots__ if getattr(self, name) is not None]
+    
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+    
+    def to_dict(self):
+        return dict(self.items())
+    
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class Flight(Record):
+    __slots__ = ('flight_id', 'route', 'scheduled_departure', 'scheduled_arrival',
+                 'aircraft_id', 'aircraft_type', 'status', 'current_delay', 'gate',
+                 'runway_queue', 'boarding_time_minutes', 'departure_ts', 'arrival_ts')
+    
+    def __init__(self, flight_id, route, scheduled_departure=None, scheduled_arrival=None,
+                 aircraft_id=None, aircraft_type=None, status=None, current_delay=None,
+                 gate=None, runway_queue=None, boarding_time_minutes=None,
+                 departure_ts=None, arrival_ts=None):
+        self.flight_id = flight_id
+        self.route = route
+        self.scheduled_departure = scheduled_departure
+        self.scheduled_arrival = scheduled_arrival
+        self.aircraft_id = aircraft_id
+        self.aircraft_type = aircraft_type
+        self.status = status
+        self.current_delay = current_delay
+        self.gate = gate
+        self.runway_queue = runway_queue
+        self.boarding_time_minutes = boarding_time_minutes
+        self.departure_ts = departure_ts
+        self.arrival_ts = arrival_ts
+
+class CrewMember(Record):
+    __slots__ = ('crew_id', 'name', 'role', 'current_location', 'duty_hours_today',
+                 'rest_hours_remaining', 'assigned_flights', 'next_available', 'status',
+                 'available_ts')
+    
+    def __init__(self, crew_id, name, role, current_location=None, duty_hours_today=None,
+                 rest_hours_remaining=None, assigned_flights=None, next_available=None,
+                 status=None, available_ts=None):
+        self.crew_id = crew_id
+        self.name = name
+        self.role = role
+        self.current_location = current_location
+        self.duty_hours_today = duty_hours_today
+        self.rest_hours_remaining = rest_hours_remaining
+        self.assigned_flights = assigned_flights
+        self.next_available = next_available
+        self.status = status
+        self.available_ts = available_ts
+
+class EngineReading(Record):
+    __slots__ = ('flight_id', 'aircraft_id', 'timestamp', 'metrics', 'status', 'reading_ts')
+    
+    def __init__(self, flight_id, aircraft_id, timestamp=None, metrics=None, status=None,
+                 reading_ts=None):
+        self.flight_id = flight_id
+        self.aircraft_id = aircraft_id
+        self.timestamp = timestamp
+        self.metrics = metrics
+        self.status = status
+        self.reading_ts = reading_ts
+
+class WeatherReport(Record):
+    __slots__ = ('airport', 'timestamp', 'weather_data', 'crosswind_knots', 'observed_ts')
+    
+    def __init__(self, airport, timestamp=None, weather_data=None, crosswind_knots=None,
+                 observed_ts=None):
+        self.airport = airport
+        self.timestamp = timestamp
+        self.weather_data = weather_data
+        self.crosswind_knots = crosswind_knots
+        self.observed_ts = observed_ts
+
+class DelayPrediction(Record):
+    __slots__ = ('predicted_delay', 'reasons', 'severity', 'flight_id', 'route',
+                 'knock_on_delay', 'inbound_flight')
+    
+    def __init__(self, predicted_delay, reasons, severity, flight_id, route,
+                 knock_on_delay=0, inbound_flight=None):
+        self.predicted_delay = predicted_delay
+        self.reasons = reasons
+        self.severity = severity
+        self.flight_id = flight_id
+        self.route = route
+        self.knock_on_delay = knock_on_delay
+        self.inbound_flight = inbound_flight
+
+class Alert(Record):
+    __slots__ = ('aircraft_id', 'alert_type', 'message', 'severity', 'timestamp',
+                 'metric_value', 'threshold')
+    
+    def __init__(self, aircraft_id, alert_type, message, severity, timestamp,
+                 metric_value=None, threshold=None):
+        self.aircraft_id = aircraft_id
+        self.alert_type = alert_type
+        self.message = message
+        self.severity = severity
+        self.timestamp = timestamp
+        self.metric_value = metric_value
+        self.threshold = threshold
+
+RECORD_TYPES = {
+    'flight_schedule': Flight,
+    'crew_schedules': CrewMember,
+    'engine_logs': EngineReading,
+    'weather_logs': WeatherReport
+}
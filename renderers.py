@@ -0,0 +1,198 @@
+import csv
+import json
+import os
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class ReportSection:
+    """One report section: text lines plus a factory for its detail rows"""
+    
+    __slots__ = ('key', 'title', 'lines', 'rows')
+    
+    def __init__(self, key, title, lines, rows=None):
+        self.key = key
+        self.title = title
+        self.lines = lines
+        self.rows = rows or (lambda: iter(()))
+
+class TextRenderer:
+    extension = 'txt'
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.first_line = True
+        self.first_section = True
+    
+    def _write_line(self, line):
+        if not self.first_line:
+            self.file.write('\n')
+        self.file.write(line)
+        self.first_line = False
+    
+    def begin(self, header):
+        self.file = open(self.path, 'w')
+        self._write_line("="*80)
+        self._write_line(header['title'])
+        self._write_line(f"Date: {header['date']}")
+        self._write_line(f"Airline: {header['airline']}")
+        self._write_line("="*80)
+        self._write_line("\n")
+    
+    def write_section(self, section):
+        if not self.first_section:
+            self._write_line("\n")
+        self.first_section = False
+        
+        self._write_line(section.title)
+        self._write_line("-"*40)
+        for line in section.lines:
+            self._write_line(line)
+    
+    def end(self):
+        self._write_line("\n" + "="*80)
+        self._write_line("END OF REPORT")
+        self._write_line("="*80)
+        self.file.close()
+        return self.path
+    
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+            _remove(self.path)
+
+class JsonRenderer:
+    extension = 'json'
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.first_section = True
+    
+    def begin(self, header):
+        self.file = open(self.path, 'w')
+        self.file.write('{"header": ' + json.dumps(header) + ', "sections": {')
+    
+    def write_section(self, section):
+        if not self.first_section:
+            self.file.write(', ')
+        self.first_section = False
+        
+        self.file.write(json.dumps(section.key) + ': {')
+        self.file.write('"title": ' + json.dumps(section.title) + ', ')
+        self.file.write('"lines": ' + json.dumps(section.lines) + ', "rows": [')
+        
+        first_row = True
+        for row in section.rows():
+            if not first_row:
+                self.file.write(', ')
+            self.file.write(json.dumps(row, default=str))
+            first_row = False
+        
+        self.file.write(']}')
+    
+    def end(self):
+        self.file.write('}}\n')
+        self.file.close()
+        return self.path
+    
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+            _remove(self.path)
+
+class CsvRenderer:
+    """Writes one CSV file per section into a directory named after the report"""
+    
+    extension = 'csv'
+    
+    def __init__(self, path):
+        self.directory = os.path.splitext(path)[0] + '_csv'
+        self.written = []
+    
+    def begin(self, header):
+        os.makedirs(self.directory, exist_ok=True)
+    
+    def write_section(self, section):
+        rows = section.rows()
+        first_row = next(rows, None)
+        if first_row is None:
+            return
+        
+        path = os.path.join(self.directory, f'{section.key}.csv')
+        self.written.append(path)
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(first_row.keys()))
+            writer.writeheader()
+            writer.writerow(first_row)
+            for row in rows:
+                writer.writerow(row)
+    
+    def end(self):
+        return self.directory
+    
+    def abort(self):
+        for path in self.written:
+            _remove(path)
+
+class PdfRenderer:
+    """Draws the report onto an A4 reportlab canvas
+    
+    Unlike the other renderers this one is not bounded in memory: reportlab
+    keeps every finished page until save() writes the file in end().
+    """
+    
+    extension = 'pdf'
+    
+    LINE_HEIGHT = 12
+    MARGIN = 50
+    
+    def __init__(self, path):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        
+        self.path = path
+        self.page_width, self.page_height = A4
+        self.canvas = canvas.Canvas(path, pagesize=A4)
+        self.y = self.page_height - self.MARGIN
+    
+    def _write_line(self, line, font='Courier', size=9):
+        if self.y < self.MARGIN:
+            self.canvas.showPage()
+            self.y = self.page_height - self.MARGIN
+        
+        self.canvas.setFont(font, size)
+        self.canvas.drawString(self.MARGIN, self.y, line.strip('\n'))
+        self.y -= self.LINE_HEIGHT
+    
+    def begin(self, header):
+        self._write_line(header['title'], font='Helvetica-Bold', size=14)
+        self._write_line(f"Date: {header['date']}")
+        self._write_line(f"Airline: {header['airline']}")
+        self._write_line('')
+    
+    def write_section(self, section):
+        self._write_line(section.title, font='Helvetica-Bold', size=11)
+        for line in section.lines:
+            for part in line.split('\n'):
+                self._write_line(part)
+        self._write_line('')
+    
+    def end(self):
+        self.canvas.save()
+        return self.path
+    
+    def abort(self):
+        # Nothing reaches the disk before save(), so dropping the canvas discards the report
+        self.canvas = None
+
+RENDERERS = {
+    'txt': TextRenderer,
+    'json': JsonRenderer,
+    'csv': CsvRenderer,
+    'pdf': PdfRenderer
+}
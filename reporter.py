@@ -2,211 +2,283 @@ import json
 from datetime import datetime
 import os
 
+from modules.archive import ReportArchive
+from modules.renderers import RENDERERS, ReportSection
+from modules.summary import OperationsSummary
+
 class ReportGenerator:
     def __init__(self, config):
         self.config = config
+        self.formats = config.get('reporting', {}).get('formats', ['txt'])
+        self.archive_path = config.get('reporting', {}).get('archive_path', 'output/archive/operations.db')
+        self.archive = None
     
-    def generate_daily_report(self, **data):
+    def generate_daily_report(self, formats=None, **data):
         date_str = datetime.now().strftime('%Y-%m-%d')
-        filename = f'output/reports/aviation_report_{date_str}.txt'
+        base_path = f'output/reports/aviation_report_{date_str}'
         
-        with open(filename, 'w') as f:
-            f.write(self._generate_report_content(date_str, **data))
+        outputs = self._render(base_path, date_str, formats or self.formats, data)
+        for output in outputs:
+            print(f"Report saved: {output}")
         
-        print(f"Report saved: {filename}")
-        return filename
-    
-    def generate_custom_report(self, date, **data):
-        filename = f'output/reports/aviation_report_custom_{date}.txt'
+        self.archive_run(date_str, **data)
         
-        with open(filename, 'w') as f:
-            f.write(self._generate_report_content(date, **data))
+        return outputs[0] if outputs else None
+    
+    def archive_run(self, run_date, **data):
+        if self.archive is None:
+            self.archive = ReportArchive(self.archive_path)
         
-        return filename
+        try:
+            self.archive.record_run(run_date, **data)
+        except Exception as e:
+            print(f"Error archiving run: {e}")
     
-    def _generate_report_content(self, report_date, **data):
-        content = []
-        
-        content.append("="*80)
-        content.append(f"AVIATION OPERATIONS DAILY REPORT")
-        content.append(f"Date: {report_date}")
-        content.append(f"Airline: {self.config['airline']['name']} ({self.config['airline']['code']})")
-        content.append("="*80)
-        content.append("\n")
-        
-        logs_data = data.get('logs_data', {})
-        delay_predictions = data.get('delay_predictions', {})
-        crew_schedule = data.get('crew_schedule', {})
-        load_predictions = data.get('load_predictions', {})
-        health_alerts = data.get('health_alerts', {})
-        route_suggestions = data.get('route_suggestions', [])
-        
-        content.append("1. EXECUTIVE SUMMARY")
-        content.append("-"*40)
+    def generate_custom_report(self, date, formats=None, **data):
+        base_path = f'output/reports/aviation_report_custom_{date}'
         
-        flights = logs_data.get('flight_schedule', [])
-        content.append(f"Total Flights Monitored: {len(flights)}")
-        
-        delayed = sum(1 for p in delay_predictions.values() 
-                     if p.get('predicted_delay', 0) > 0)
-        content.append(f"Flights with Predicted Delays: {delayed}")
-        
-        critical_alerts = len(health_alerts.get('critical', []))
-        warning_alerts = len(health_alerts.get('warning', []))
-        content.append(f"Critical Aircraft Alerts: {critical_alerts}")
-        content.append(f"Warning Alerts: {warning_alerts}")
-        content.append("\n")
-        
-        content.append("2. FLIGHT OPERATIONS")
-        content.append("-"*40)
-        
-        if flights:
-            status_count = {}
-            for flight in flights:
-                status = flight.get('status', 'UNKNOWN')
-                status_count[status] = status_count.get(status, 0) + 1
-            
-            for status, count in status_count.items():
-                content.append(f"{status}: {count}")
-            
-            current_delays = [f for f in flights if f.get('current_delay', 0) > 0]
-            if current_delays:
-                content.append(f"\nCurrently Delayed Flights: {len(current_delays)}")
-                for flight in current_delays[:5]:
-                    content.append(f"  {flight['flight_id']}: {flight['current_delay']} min delay")
-        content.append("\n")
-        
-        content.append("3. DELAY PREDICTIONS")
-        content.append("-"*40)
-        
-        if delay_predictions:
-            severity_groups = {}
-            for flight_id, prediction in delay_predictions.items():
-                severity = prediction.get('severity', 'NONE')
-                if severity not in severity_groups:
-                    severity_groups[severity] = []
-                severity_groups[severity].append(prediction)
-            
-            for severity, predictions in severity_groups.items():
-                if severity != 'NONE':
-                    content.append(f"\n{severity} Severity Delays ({len(predictions)} flights):")
-                    for pred in predictions[:3]:
-                        content.append(f"  {pred['flight_id']}: {pred['predicted_delay']} min - {pred['route']}")
-                        if pred.get('reasons'):
-                            content.append(f"    Reasons: {', '.join(pred['reasons'][:2])}")
-        content.append("\n")
-        
-        content.append("4. CREW SCHEDULING")
-        content.append("-"*40)
-        
-        if crew_schedule:
-            compliant = sum(1 for a in crew_schedule.values() 
-                           if a['compliance_check']['is_compliant'])
-            content.append(f"Compliant Assignments: {compliant}/{len(crew_schedule)}")
-            
-            non_compliant = [f for f, a in crew_schedule.items() 
-                            if not a['compliance_check']['is_compliant']]
+        outputs = self._render(base_path, date, formats or self.formats, data)
+        return outputs[0] if outputs else None
+    
+    def _render(self, base_path, report_date, formats, data):
+        renderers = []
+        for fmt in formats:
+            renderer_class = RENDERERS.get(fmt)
+            if renderer_class is None:
+                print(f"Unknown report format: {fmt}")
+                continue
             
-            if non_compliant:
-                content.append(f"\nNon-Compliant Flights ({len(non_compliant)}):")
-                for flight_id in non_compliant[:5]:
-                    assignment = crew_schedule[flight_id]
-                    issues = assignment['compliance_check']['issues']
-                    content.append(f"  {flight_id}: {', '.join(issues)}")
-        content.append("\n")
-        
-        content.append("5. PASSENGER LOAD PREDICTIONS")
-        content.append("-"*40)
-        
-        if load_predictions:
-            total_capacity = 0
-            total_predicted = 0
+            try:
+                renderers.append(renderer_class(f'{base_path}.{renderer_class.extension}'))
+            except ImportError as e:
+                print(f"Skipping {fmt} report, missing dependency: {e}")
+        
+        header = self._report_header(report_date)
+        try:
+            for renderer in renderers:
+                renderer.begin(header)
             
-            for prediction in load_predictions.values():
-                total_capacity += prediction.get('capacity', 0)
-                total_predicted += prediction.get('predicted_load', 0)
+            # Each section goes to every renderer as soon as it is built
+            for section in self._report_sections(**data):
+                for renderer in renderers:
+                    renderer.write_section(section)
             
-            if total_capacity > 0:
-                load_factor = total_predicted / total_capacity
-                content.append(f"Overall Load Factor: {load_factor:.1%}")
-                content.append(f"Total Predicted Passengers: {total_predicted}")
-                content.append(f"Total Available Capacity: {total_capacity}")
+            return [renderer.end() for renderer in renderers]
+        except BaseException:
+            # A failed report leaves no open files and no half-written outputs behind
+            for renderer in renderers:
+                renderer.abort()
+            raise
+    
+    def _report_header(self, report_date):
+        return {
+            'title': "AVIATION OPERATIONS DAILY REPORT",
+            'date': report_date,
+            'airline': f"{self.config['airline']['name']} ({self.config['airline']['code']})"
+        }
+    
+    def _report_sections(self, **data):
+        # A summary passed in with predictions already streamed in only needs its remaining parts filled
+        summary = OperationsSummary.build(**data)
+        
+        yield self._executive_summary(summary)
+        yield self._flight_operations(summary, data.get('logs_data', {}))
+        yield self._delay_predictions(summary, data.get('delay_predictions', {}))
+        yield self._crew_scheduling(summary, data.get('crew_schedule', {}))
+        yield self._passenger_loads(summary, data.get('load_predictions', {}))
+        yield self._aircraft_health(summary, data.get('health_alerts', {}))
+        yield self._route_analysis(summary, data.get('route_suggestions', []))
+        yield self._recommendations(summary)
+    
+    def _executive_summary(self, summary):
+        metrics = [
+            ("Total Flights Monitored", summary.total_flights),
+            ("Flights with Predicted Delays", summary.delayed_flights),
+            ("Critical Aircraft Alerts", summary.critical_alert_count),
+            ("Warning Alerts", summary.warning_alert_count)
+        ]
+        
+        lines = [f"{name}: {value}" for name, value in metrics]
+        rows = lambda: ({'metric': name, 'value': value} for name, value in metrics)
+        
+        return ReportSection('executive_summary', "1. EXECUTIVE SUMMARY", lines, rows)
+    
+    def _flight_operations(self, summary, logs_data):
+        lines = []
+        
+        if summary.total_flights:
+            for status, count in summary.flight_status_count.items():
+                lines.append(f"{status}: {count}")
             
-            overbooking = [f for f, p in load_predictions.items() 
-                          if p.get('status') == 'OVERBOOKING RISK']
+            if summary.currently_delayed:
+                lines.append(f"\nCurrently Delayed Flights: {summary.currently_delayed_count}")
+                for flight in summary.currently_delayed[:5]:
+                    lines.append(f"  {flight['flight_id']}: {flight['current_delay']} min delay")
+        
+        flights = logs_data.get('flight_schedule', [])
+        rows = lambda: ({
+            'flight_id': flight['flight_id'],
+            'route': flight['route'],
+            'aircraft_id': flight.get('aircraft_id'),
+            'status': flight.get('status', 'UNKNOWN'),
+            'current_delay': flight.get('current_delay', 0)
+        } for flight in flights)
+        
+        return ReportSection('flight_operations', "2. FLIGHT OPERATIONS", lines, rows)
+    
+    def _delay_predictions(self, summary, delay_predictions):
+        lines = []
+        
+        for severity, predictions in summary.delay_severity_examples.items():
+            if severity != 'NONE':
+                lines.append(f"\n{severity} Severity Delays ({summary.delay_severity_count[severity]} flights):")
+                for pred in predictions:
+                    lines.append(f"  {pred['flight_id']}: {pred['predicted_delay']} min - {pred['route']}")
+                    if pred.get('reasons'):
+                        lines.append(f"    Reasons: {', '.join(pred['reasons'][:2])}")
+        
+        rows = lambda: ({
+            'flight_id': flight_id,
+            'route': pred['route'],
+            'predicted_delay': pred['predicted_delay'],
+            'severity': pred['severity'],
+            'reasons': '; '.join(pred.get('reasons', []))
+        } for flight_id, pred in delay_predictions.items())
+        
+        return ReportSection('delay_predictions', "3. DELAY PREDICTIONS", lines, rows)
+    
+    def _crew_scheduling(self, summary, crew_schedule):
+        lines = []
+        
+        if summary.assignment_count:
+            lines.append(f"Compliant Assignments: {summary.compliant_assignments}/{summary.assignment_count}")
             
-            if overbooking:
-                content.append(f"\nOverbooking Risk ({len(overbooking)} flights):")
-                for flight_id in overbooking[:3]:
-                    pred = load_predictions[flight_id]
-                    content.append(f"  {flight_id}: {pred['predicted_load']}/{pred['capacity']} seats")
-        content.append("\n")
-        
-        content.append("6. AIRCRAFT HEALTH MONITORING")
-        content.append("-"*40)
-        
-        if health_alerts:
-            critical = health_alerts.get('critical', [])
-            warning = health_alerts.get('warning', [])
+            if summary.non_compliant_flights:
+                lines.append(f"\nNon-Compliant Flights ({summary.non_compliant_count}):")
+                for flight_id, issues in summary.non_compliant_flights[:5]:
+                    lines.append(f"  {flight_id}: {', '.join(issues)}")
+        
+        rows = lambda: ({
+            'flight_id': flight_id,
+            'pilots_assigned': len(assignment['assigned_crew']['pilots']),
+            'cabin_crew_assigned': len(assignment['assigned_crew']['crew']),
+            'is_compliant': assignment['compliance_check']['is_compliant'],
+            'issues': '; '.join(assignment['compliance_check']['issues'])
+        } for flight_id, assignment in crew_schedule.items())
+        
+        return ReportSection('crew_scheduling', "4. CREW SCHEDULING", lines, rows)
+    
+    def _passenger_loads(self, summary, load_predictions):
+        lines = []
+        
+        if summary.load_prediction_count:
+            if summary.total_capacity > 0:
+                lines.append(f"Overall Load Factor: {summary.overall_load_factor:.1%}")
+                lines.append(f"Total Predicted Passengers: {summary.total_predicted_passengers}")
+                lines.append(f"Total Available Capacity: {summary.total_capacity}")
             
-            content.append(f"Critical Alerts: {len(critical)}")
-            content.append(f"Warning Alerts: {len(warning)}")
+            if summary.overbooking_flights:
+                lines.append(f"\nOverbooking Risk ({summary.overbooking_count} flights):")
+                for flight_id, pred in summary.overbooking_flights[:3]:
+                    lines.append(f"  {flight_id}: {pred['predicted_load']}/{pred['capacity']} seats, "
+                                 f"book up to {pred.get('booking_limit', pred['capacity'])}")
+        
+        rows = lambda: ({
+            'flight_id': flight_id,
+            'route': pred['route'],
+            'predicted_load': pred['predicted_load'],
+            'capacity': pred['capacity'],
+            'load_factor': round(pred['load_factor'], 4),
+            'status': pred['status'],
+            'booking_limit': pred.get('booking_limit')
+        } for flight_id, pred in load_predictions.items())
+        
+        return ReportSection('passenger_loads', "5. PASSENGER LOAD PREDICTIONS", lines, rows)
+    
+    def _aircraft_health(self, summary, health_alerts):
+        lines = []
+        
+        if summary.has_health_alerts:
+            lines.append(f"Critical Alerts: {summary.critical_alert_count}")
+            lines.append(f"Warning Alerts: {summary.warning_alert_count}")
             
-            if critical:
-                content.append("\nCritical Alerts:")
-                for alert in critical[:3]:
-                    content.append(f"  {alert['aircraft_id']}: {alert['alert_type']}")
-                    content.append(f"    {alert['message']}")
+            if summary.critical_alerts:
+                lines.append("\nCritical Alerts:")
+                for alert in summary.critical_alerts[:3]:
+                    lines.append(f"  {alert['aircraft_id']}: {alert['alert_type']}")
+                    lines.append(f"    {alert['message']}")
             
-            all_alerts = critical + warning
-            if all_alerts:
-                aircraft_with_alerts = set(alert['aircraft_id'] for alert in all_alerts)
-                content.append(f"\nAircraft with Alerts: {len(aircraft_with_alerts)}")
-        content.append("\n")
+            if summary.aircraft_with_alerts:
+                lines.append(f"\nAircraft with Alerts: {len(summary.aircraft_with_alerts)}")
         
-        content.append("7. ROUTE ANALYSIS & DIVERSION SUGGESTIONS")
-        content.append("-"*40)
+        if summary.grounded_aircraft:
+            lines.append(f"\nGrounded Aircraft: {', '.join(summary.grounded_aircraft)}")
+            lines.append(f"Reassigned Flights: {summary.tail_change_count}")
+            for change in summary.tail_changes[:5]:
+                lines.append(f"  {change['flight_id']}: {change['from_aircraft']} -> {change['to_aircraft']} ({change['reason']})")
+            if summary.unassigned_flights:
+                lines.append(f"Flights Without a Tail: {summary.unassigned_count}")
+                for flight in summary.unassigned_flights[:5]:
+                    lines.append(f"  {flight['flight_id']} ({flight['aircraft_id']}): {flight['reason']}")
         
-        if route_suggestions:
-            content.append(f"Flights with Route Issues: {len(route_suggestions)}")
+        rows = lambda: ({
+            'aircraft_id': alert['aircraft_id'],
+            'alert_type': alert['alert_type'],
+            'severity': alert['severity'],
+            'message': alert['message'],
+            'timestamp': alert['timestamp']
+        } for severity in ('critical', 'warning') for alert in health_alerts.get(severity, []))
+        
+        return ReportSection('aircraft_health', "6. AIRCRAFT HEALTH MONITORING", lines, rows)
+    
+    def _route_analysis(self, summary, route_suggestions):
+        lines = []
+        
+        if summary.route_issue_count:
+            lines.append(f"Flights with Route Issues: {summary.route_issue_count}")
             
-            high_severity = [r for r in route_suggestions if r.get('severity') == 'HIGH']
-            if high_severity:
-                content.append(f"\nHigh Severity Issues ({len(high_severity)}):")
-                for suggestion in high_severity[:3]:
-                    content.append(f"  {suggestion['flight_id']} ({suggestion['route']})")
-                    content.append(f"    Issues: {', '.join(suggestion.get('issues', []))}")
-                    content.append(f"    Suggestion: {suggestion.get('suggestion', 'None')}")
+            if summary.high_severity_routes:
+                lines.append(f"\nHigh Severity Issues ({summary.high_severity_count}):")
+                for suggestion in summary.high_severity_routes[:3]:
+                    lines.append(f"  {suggestion['flight_id']} ({suggestion['route']})")
+                    lines.append(f"    Issues: {', '.join(suggestion.get('issues', []))}")
+                    lines.append(f"    Suggestion: {suggestion.get('suggestion', 'None')}")
         else:
-            content.append("No major route issues detected.")
-        content.append("\n")
+            lines.append("No major route issues detected.")
         
-        content.append("8. RECOMMENDATIONS & ACTIONS REQUIRED")
-        content.append("-"*40)
+        rows = lambda: ({
+            'flight_id': suggestion['flight_id'],
+            'route': suggestion['route'],
+            'severity': suggestion.get('severity'),
+            'issues': '; '.join(suggestion.get('issues', [])),
+            'suggestion': suggestion.get('suggestion')
+        } for suggestion in route_suggestions)
         
+        return ReportSection('route_analysis', "7. ROUTE ANALYSIS & DIVERSION SUGGESTIONS", lines, rows)
+    
+    def _recommendations(self, summary):
+        lines = []
         recommendations = []
         
-        if health_alerts.get('critical'):
+        if summary.critical_alerts:
             recommendations.append("Immediate maintenance required for aircraft with critical alerts")
         
-        if route_suggestions:
-            high_severity = [r for r in route_suggestions if r.get('severity') == 'HIGH']
-            if high_severity:
-                recommendations.append(f"Review and possibly reschedule {len(high_severity)} high-risk flights")
+        if summary.unassigned_flights:
+            recommendations.append(f"Find aircraft for {summary.unassigned_count} flights left without a healthy tail")
+        
+        if summary.high_severity_routes:
+            recommendations.append(f"Review and possibly reschedule {summary.high_severity_count} high-risk flights")
         
-        overbooking = [f for f, p in load_predictions.items() 
-                      if p.get('status') == 'OVERBOOKING RISK'] if load_predictions else []
-        if overbooking:
-            recommendations.append(f"Manage overbooking for {len(overbooking)} flights")
+        if summary.overbooking_flights:
+            recommendations.append(f"Manage overbooking for {summary.overbooking_count} flights")
         
         if recommendations:
             for i, rec in enumerate(recommendations, 1):
-                content.append(f"{i}. {rec}")
+                lines.append(f"{i}. {rec}")
         else:
-            content.append("No urgent actions required. Operations are running smoothly.")
+            lines.append("No urgent actions required. Operations are running smoothly.")
         
-        content.append("\n" + "="*80)
-        content.append("END OF REPORT")
-        content.append("="*80)
+        rows = lambda: ({'priority': i, 'recommendation': rec}
+                        for i, rec in enumerate(recommendations, 1))
         
-        return '\n'.join(content)
\ No newline at end of file
+        return ReportSection('recommendations', "8. RECOMMENDATIONS & ACTIONS REQUIRED", lines, rows)
@@ -0,0 +1,192 @@
+import numpy as np
+
+from modules.memo import content_hash
+from modules.settings import get_compiled_config
+from modules.tail_assignment import great_circle_km
+from modules.weather_index import CONDITION_SEVERITY
+
+class RouteNetwork:
+    """Airport graph from the configured routes and the day's schedule, with cached all-pairs shortest paths
+    
+    Legs are undirected and weighted by great-circle distance, or by scheduled
+    block time at cruise speed where an airport has no coordinates. Each
+    aircraft range sees only the legs it can fly. All-pairs results are kept
+    per network signature, so a new snapshot flying the same network reuses
+    them and any added leg or changed distance recomputes them.
+    """
+    
+    # (signature, range_km) -> (distances, next hops), shared by every instance
+    _all_pairs = {}
+    
+    def __init__(self, config, flights):
+        self.config = config
+        compiled = get_compiled_config(config)
+        self.thresholds = compiled.thresholds
+        self.aircraft = compiled.aircraft
+        network = config.get('network', {})
+        self.cruise_speed = network.get('cruise_speed_kmh', 800)
+        self.penalty_km = network.get('weather_penalty_km', 150)
+        self.max_alternates = network.get('max_alternates', 3)
+        self.max_diversion_km = network.get('max_diversion_km', 1000)
+        
+        self.legs = self._legs(config, flights)
+        airports = set(config.get('airports', {}))
+        for origin, destination in self.legs:
+            airports.update((origin, destination))
+        self.airports = sorted(airports)
+        self.position = {airport: position for position, airport in enumerate(self.airports)}
+        self.great_circle = self._great_circle(config.get('airports', {}))
+        self.signature = content_hash([self.airports, sorted([*leg, round(km)] for leg, km in self.legs.items())])
+    
+    def _legs(self, config, flights):
+        coordinates = config.get('airports', {})
+        block_hours = {}
+        for flight in flights:
+            leg = tuple(sorted(flight['route'].split('-')))
+            block_hours.setdefault(leg, []).append((flight['arrival_ts'] - flight['departure_ts']) / 3600)
+        
+        routes = set(block_hours)
+        for configured in config.get('routes', {}).values():
+            routes.update(tuple(sorted(route.split('-'))) for route in configured)
+        
+        legs = {}
+        for leg in routes:
+            origin, destination = leg
+            if origin in coordinates and destination in coordinates:
+                legs[leg] = great_circle_km(coordinates[origin], coordinates[destination])
+            elif leg in block_hours:
+                hours = sorted(block_hours[leg])[len(block_hours[leg]) // 2]
+                legs[leg] = max(hours, 0) * self.cruise_speed
+        return legs
+    
+    def _great_circle(self, coordinates):
+        """Direct distances between airports with coordinates; infinite where either has none"""
+        count = len(self.airports)
+        distances = np.full((count, count), np.inf)
+        located = [airport for airport in self.airports if airport in coordinates]
+        for first in located:
+            for second in located:
+                distances[self.position[first], self.position[second]] = great_circle_km(coordinates[first], coordinates[second])
+        return distances
+    
+    def all_pairs(self, range_km):
+        """Shortest distances and next hops between all airports over legs within range_km"""
+        key = (self.signature, range_km)
+        if key not in self._all_pairs:
+            # Results for an older network can never be hit again
+            for stale in [cached for cached in self._all_pairs if cached[0] != self.signature]:
+                del self._all_pairs[stale]
+            self._all_pairs[key] = self._floyd_warshall(range_km)
+        return self._all_pairs[key]
+    
+    def _floyd_warshall(self, range_km):
+        count = len(self.airports)
+        distances = np.full((count, count), np.inf)
+        np.fill_diagonal(distances, 0.0)
+        for (origin, destination), km in self.legs.items():
+            if km <= range_km:
+                first, second = self.position[origin], self.position[destination]
+                distances[first, second] = distances[second, first] = km
+        
+        next_hops = np.where(np.isfinite(distances), np.arange(count), -1)
+        for via in range(count):
+            through = distances[:, via, None] + distances[None, via, :]
+            shorter = through < distances
+            distances = np.where(shorter, through, distances)
+            next_hops = np.where(shorter, next_hops[:, via, None], next_hops)
+        return distances, next_hops
+    
+    def path(self, origin, destination, range_km):
+        """Airports on the shortest path, or None when destination is out of reach"""
+        if origin not in self.position or destination not in self.position:
+            return None
+        _, next_hops = self.all_pairs(range_km)
+        current, target = self.position[origin], self.position[destination]
+        if next_hops[current, target] < 0:
+            return None
+        
+        path = [origin]
+        while current != target:
+            current = next_hops[current, target]
+            path.append(self.airports[current])
+        return path
+    
+    def _closed(self, weather):
+        return (weather['conditions'] == 'Thunderstorm'
+                or weather['crosswind_knots'] > self.thresholds.crosswind_max_knots
+                or weather['visibility_meters'] < self.thresholds.visibility_min_meters)
+    
+    def weather_penalties(self, weather_index, timestamp):
+        """Extra km per airport for its conditions at timestamp; closed airports are infinite"""
+        penalties = np.zeros(len(self.airports))
+        for position, airport in enumerate(self.airports):
+            weather = weather_index.conditions_at(airport, timestamp)
+            if not weather:
+                continue
+            if self._closed(weather):
+                penalties[position] = np.inf
+            else:
+                penalties[position] = CONDITION_SEVERITY.get(weather['conditions'], 0) * self.penalty_km
+        return penalties
+    
+    def alternates(self, flight, weather_index):
+        """Diversion airports near the destination and one-stop hub routings, cheapest first
+        
+        Diversions are airports within max_diversion_km of the destination
+        that the aircraft could fly to directly from the origin within its
+        range, ranked by great-circle distance from the destination; hub routings are ranked by network distance through
+        the hub. Both add the weather penalty at the alternate when the flight
+        would arrive there.
+        """
+        origin, destination = flight['route'].split('-')
+        if origin not in self.position or destination not in self.position:
+            return {'diversions': [], 'hubs': []}
+        
+        range_km = self.aircraft[flight['aircraft_type']].range_km
+        distances, _ = self.all_pairs(range_km)
+        penalties = self.weather_penalties(weather_index, flight['arrival_ts'])
+        start, end = self.position[origin], self.position[destination]
+        
+        # Landing somewhere the aircraft can still reach, as close to the destination as possible
+        diversion_cost = self.great_circle[end] + penalties
+        hub_cost = distances[start] + penalties + distances[:, end]
+        for cost in (diversion_cost, hub_cost):
+            cost[[start, end]] = np.inf
+        diversion_cost[(self.great_circle[start] > range_km) | (self.great_circle[end] > self.max_diversion_km)] = np.inf
+        
+        diversions = [{
+            'airport': self.airports[position],
+            'km_from_destination': round(float(self.great_circle[end, position])),
+            'weather_penalty_km': round(float(penalties[position]))
+        } for position in self._cheapest(diversion_cost)[:self.max_alternates]]
+        
+        hubs = []
+        for position in self._cheapest(hub_cost):
+            if len(hubs) == self.max_alternates:
+                break
+            hub = self.airports[position]
+            path = self.path(origin, hub, range_km)[:-1] + self.path(hub, destination, range_km)
+            # A hub whose shortest legs double back through an airport is just a detour of a better routing
+            if len(set(path)) < len(path):
+                continue
+            via_km = distances[start, position] + distances[position, end]
+            hubs.append({
+                'hub': hub,
+                'path': path,
+                # None when the direct leg is beyond this aircraft's range
+                'extra_km': round(float(via_km - distances[start, end])) if np.isfinite(distances[start, end]) else None
+            })
+        
+        return {'diversions': diversions, 'hubs': hubs}
+    
+    def _cheapest(self, cost):
+        order = np.argsort(cost, kind='stable')
+        return [int(position) for position in order if np.isfinite(cost[position])]
+
+def get_route_network(config, logs_data):
+    """Build the route network once per snapshot and share it between modules"""
+    network = logs_data.get('route_network')
+    if network is None:
+        network = RouteNetwork(config, logs_data['flight_schedule'])
+        logs_data['route_network'] = network
+    return network
@@ -0,0 +1,167 @@
+import json
+import os
+from collections import namedtuple
+from types import MappingProxyType
+
+from modules.validation import ValidationError
+
+THRESHOLDS = (
+    'crosswind_max_knots', 'visibility_min_meters', 'engine_thrust_deviation_percent',
+    'runway_queue_max_minutes', 'boarding_max_minutes', 'turbulence_threshold',
+    'engine_vibration_threshold', 'altitude_fluctuation_threshold',
+    'fuel_burn_threshold_percent', 'cabin_temp_max_celsius'
+)
+
+Thresholds = namedtuple('Thresholds', THRESHOLDS)
+
+# Everything a per-flight loop needs about an aircraft type, resolved once per config load
+AircraftSpec = namedtuple('AircraftSpec', (
+    'name', 'size', 'capacity', 'range_km', 'pilots', 'crew', 'turnaround_seconds'
+))
+
+CompiledConfig = namedtuple('CompiledConfig', ('raw', 'thresholds', 'aircraft'))
+
+DEFAULT_TURNAROUND_MINUTES = 45
+
+_latest = None
+
+def _number(problems, where, value, minimum=0):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        problems.append(f"{where}: expected number, got {value!r}")
+        return 0
+    if value < minimum:
+        problems.append(f"{where}: expected at least {minimum}, got {value!r}")
+    return value
+
+def _mapping(problems, where, value):
+    """value when it is a JSON object, else an empty one with the problem recorded"""
+    if isinstance(value, dict):
+        return value
+    problems.append(f"{where}: expected object, got {value!r}")
+    return {}
+
+def compile_config(config):
+    """Validate the config and resolve it into flat, read-only lookup tables
+    
+    Raises ValidationError listing every problem found, so a bad edit can be
+    fixed in one pass.
+    """
+    if not isinstance(config, dict):
+        raise ValidationError(f"config: expected object, got {type(config).__name__}")
+    
+    problems = []
+    for section in ('thresholds', 'crew_rules', 'aircraft_types'):
+        if not isinstance(config.get(section), dict):
+            problems.append(f"{section}: missing section")
+    if problems:
+        raise ValidationError('; '.join(problems))
+    
+    thresholds = Thresholds(*[
+        _number(problems, f"thresholds.{name}", config['thresholds'].get(name)) for name in THRESHOLDS
+    ])
+    
+    crew_rules = config['crew_rules']
+    for name in ('max_duty_hours', 'min_rest_hours', 'max_consecutive_flights'):
+        _number(problems, f"crew_rules.{name}", crew_rules.get(name), minimum=1)
+    
+    crew_sizes = {}
+    required = _mapping(problems, "crew_rules.required_crew_per_flight", crew_rules.get('required_crew_per_flight', {}))
+    for size, crew in required.items():
+        if not isinstance(crew, dict):
+            problems.append(f"crew_rules.required_crew_per_flight.{size}: expected object, got {crew!r}")
+            continue
+        crew_sizes[size] = (
+            _number(problems, f"crew_rules.required_crew_per_flight.{size}.pilots", crew.get('pilots'), minimum=1),
+            _number(problems, f"crew_rules.required_crew_per_flight.{size}.crew", crew.get('crew'))
+        )
+    
+    turnaround = _mapping(problems, "min_turnaround_minutes", config.get('min_turnaround_minutes', {}))
+    aircraft = {}
+    for name, specs in config['aircraft_types'].items():
+        if not isinstance(specs, dict):
+            problems.append(f"aircraft_types.{name}: expected object, got {specs!r}")
+            continue
+        size = specs.get('type')
+        if isinstance(size, str) and size in required and size not in crew_sizes:
+            # Its crew entry is malformed and already reported
+            continue
+        if not isinstance(size, str) or size not in crew_sizes:
+            problems.append(f"aircraft_types.{name}.type: no required crew for size {size!r}")
+            continue
+        pilots, crew = crew_sizes[size]
+        aircraft[name] = AircraftSpec(
+            name=name,
+            size=size,
+            capacity=_number(problems, f"aircraft_types.{name}.capacity", specs.get('capacity'), minimum=1),
+            range_km=_number(problems, f"aircraft_types.{name}.range_km", specs.get('range_km'), minimum=1),
+            pilots=pilots,
+            crew=crew,
+            turnaround_seconds=_number(problems, f"min_turnaround_minutes.{size}", turnaround.get(size, DEFAULT_TURNAROUND_MINUTES)) * 60
+        )
+    
+    for airport, coordinates in _mapping(problems, "airports", config.get('airports', {})).items():
+        if not isinstance(coordinates, list) or len(coordinates) != 2:
+            problems.append(f"airports.{airport}: expected [latitude, longitude], got {coordinates!r}")
+            continue
+        _number(problems, f"airports.{airport}[0]", coordinates[0], minimum=-90)
+        _number(problems, f"airports.{airport}[1]", coordinates[1], minimum=-180)
+    
+    if problems:
+        raise ValidationError('; '.join(problems))
+    
+    return CompiledConfig(
+        raw=config,
+        thresholds=thresholds,
+        aircraft=MappingProxyType(aircraft)
+    )
+
+def get_compiled_config(config):
+    """Compile the config once and share the result between modules until a different config is loaded"""
+    global _latest
+    if _latest is None or _latest.raw is not config:
+        _latest = compile_config(config)
+    return _latest
+
+class ConfigWatcher:
+    """Reloads and recompiles the config file when its modification time changes
+    
+    An edit that fails to parse or validate is reported, kept in `error`
+    until a later edit loads, and the last good config stays in effect.
+    """
+    
+    def __init__(self, path='airline_config.json'):
+        self.path = path
+        self.mtime = None
+        self.config = None
+        self.error = None
+    
+    def load(self):
+        """Read and compile the file; raises FileNotFoundError, ValueError or ValidationError"""
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, 'r') as f:
+            config = json.load(f)
+        # Compiled here so a bad file is rejected before anything reads it, and cached for the modules
+        get_compiled_config(config)
+        self.config = config
+        self.mtime = mtime
+        self.error = None
+        return config
+    
+    def check(self):
+        """Reload if the file changed since the last load; returns True when a new config took effect"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self.mtime:
+            return False
+        
+        try:
+            self.load()
+        except (OSError, ValueError, ValidationError) as e:
+            # Remembered so a broken file is reported once, not on every check
+            self.mtime = mtime
+            self.error = str(e)
+            print(f"Configuration change ignored: {e}")
+            return False
+        return True
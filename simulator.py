@@ -0,0 +1,226 @@
+import heapq
+import time
+
+from modules.health_monitor import HealthMonitor
+from modules.settings import get_compiled_config
+from modules.weather_index import WeatherIndex
+
+# Events sharing a timestamp apply observations first, then crew changes, then flight movements
+WEATHER, TELEMETRY, CREW_READY, ARRIVAL, DEPARTURE = range(5)
+
+EVENT_NAMES = {
+    WEATHER: 'weather',
+    TELEMETRY: 'telemetry',
+    CREW_READY: 'crew_ready',
+    ARRIVAL: 'arrival',
+    DEPARTURE: 'departure'
+}
+
+PILOT_ROLES = ('Pilot', 'Co-Pilot')
+
+class CrewPool:
+    """Crew standing by at each airport; stands in for the crew index while a simulation runs"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.aircraft = get_compiled_config(config).aircraft
+        self.available = {}
+        self.counts = {}
+    
+    def add(self, crew):
+        airport = crew['current_location']
+        self.available.setdefault(airport, {})[crew['crew_id']] = crew
+        counts = self.counts.setdefault(airport, [0, 0])
+        counts[0 if crew['role'] in PILOT_ROLES else 1] += 1
+    
+    def remove(self, crew):
+        airport = crew['current_location']
+        if self.available.get(airport, {}).pop(crew['crew_id'], None) is not None:
+            self.counts[airport][0 if crew['role'] in PILOT_ROLES else 1] -= 1
+    
+    def at(self, airport):
+        return list(self.available.get(airport, {}).values())
+    
+    def shortfall(self, flight):
+        spec = self.aircraft[flight['aircraft_type']]
+        pilots, cabin = self.counts.get(flight['route'].split('-')[0], (0, 0))
+        
+        return {
+            'pilots': max(0, spec.pilots - pilots),
+            'crew': max(0, spec.crew - cabin)
+        }
+
+class OperationsSimulator:
+    """Discrete-event replay of a day of departures, arrivals, telemetry, weather and crew duty"""
+    
+    def __init__(self, system, log_alerts=False):
+        self.system = system
+        self.config = system.config
+        self.crew_rules = system.config['crew_rules']
+        self.log_alerts = log_alerts
+        # A fresh monitor per run, so its streamed baselines never carry over from earlier runs or menu actions;
+        # it only opens the production alert logs when the caller asked for the replay's alerts to be logged
+        self.health_monitor = HealthMonitor(self.config, store_alerts=log_alerts)
+        
+        self.events = []
+        self.sequence = 0
+        self.crew = {}
+        self.pool = CrewPool(self.config)
+        
+        # Live snapshot the predictors read; the cached index slots are kept current by the events
+        self.state = {
+            'flight_schedule': [],
+            'engine_logs': [],
+            'weather_logs': [],
+            'crew_schedules': [],
+            'passenger_load': [],
+            'weather_index': WeatherIndex([]),
+            'crew_index': self.pool,
+            'latest_engine_logs': {}
+        }
+        
+        self.flights = {}
+        self.alert_count = {'CRITICAL': 0, 'WARNING': 0}
+        self.latencies = {kind: [] for kind in EVENT_NAMES}
+    
+    def _schedule(self, timestamp, kind, payload):
+        heapq.heappush(self.events, (timestamp, kind, self.sequence, payload))
+        self.sequence += 1
+    
+    def load(self, logs_data):
+        self.health_monitor.anomaly.register_flights(logs_data['flight_schedule'])
+        for flight in logs_data['flight_schedule']:
+            self._schedule(flight['departure_ts'], DEPARTURE, flight)
+        
+        for reading in logs_data.get('engine_logs', []):
+            self._schedule(reading['reading_ts'], TELEMETRY, reading)
+        
+        for report in logs_data.get('weather_logs', []):
+            self._schedule(report['observed_ts'], WEATHER, report)
+        
+        for member in logs_data.get('crew_schedules', []):
+            crew = member.to_dict() if hasattr(member, 'to_dict') else dict(member)
+            crew['assigned_flights'] = list(crew['assigned_flights'])
+            self.crew[crew['crew_id']] = crew
+            self._schedule(self._initial_ready_time(crew), CREW_READY, crew['crew_id'])
+        
+        self.state['passenger_load'] = logs_data.get('passenger_load', [])
+    
+    def _initial_ready_time(self, crew):
+        ready_at = crew['available_ts']
+        rest_remaining = crew['rest_hours_remaining']
+        if rest_remaining < self.crew_rules['min_rest_hours']:
+            ready_at += (self.crew_rules['min_rest_hours'] - rest_remaining) * 3600
+        
+        if self._needs_rest(crew):
+            crew['status'] = 'RESTING'
+            ready_at += self.crew_rules['min_rest_hours'] * 3600
+        return int(ready_at)
+    
+    def _needs_rest(self, crew):
+        return (crew['duty_hours_today'] >= self.crew_rules['max_duty_hours']
+                or len(crew['assigned_flights']) >= self.crew_rules['max_consecutive_flights'])
+    
+    def run(self, until=None):
+        """Process events in time order up to an optional epoch timestamp and return run statistics"""
+        handlers = {
+            WEATHER: self._on_weather,
+            TELEMETRY: self._on_telemetry,
+            CREW_READY: self._on_crew_ready,
+            ARRIVAL: self._on_arrival,
+            DEPARTURE: self._on_departure
+        }
+        
+        started = time.perf_counter()
+        while self.events and (until is None or self.events[0][0] <= until):
+            timestamp, kind, _, payload = heapq.heappop(self.events)
+            event_started = time.perf_counter()
+            handlers[kind](timestamp, payload)
+            self.latencies[kind].append(time.perf_counter() - event_started)
+        
+        return self.statistics(time.perf_counter() - started)
+    
+    def _on_weather(self, timestamp, report):
+        self.state['weather_index'].add(report)
+    
+    def _on_telemetry(self, timestamp, reading):
+        self.state['latest_engine_logs'][reading['aircraft_id']] = reading
+        for alert in self.health_monitor.analyze_reading(reading, log_alerts=self.log_alerts):
+            self.alert_count[alert['severity']] = self.alert_count.get(alert['severity'], 0) + 1
+    
+    def _on_crew_ready(self, timestamp, crew_id):
+        crew = self.crew[crew_id]
+        if crew['status'] == 'RESTING':
+            crew['duty_hours_today'] = 0.0
+            crew['assigned_flights'] = []
+        crew['status'] = 'AVAILABLE'
+        crew['rest_hours_remaining'] = self.crew_rules['min_rest_hours']
+        self.pool.add(crew)
+    
+    def _on_departure(self, timestamp, flight):
+        prediction = self.system.delay_predictor.predict_delay(flight, self.state)
+        
+        origin = flight['route'].split('-')[0]
+        assignment = self.system.crew_optimizer.assign_flight(flight, self.pool.at(origin))
+        assigned = assignment['assigned_crew']
+        
+        crew_ids = [member['crew_id'] for member in assigned['pilots'] + assigned['crew']]
+        for crew_id in crew_ids:
+            crew = self.crew[crew_id]
+            self.pool.remove(crew)
+            crew['status'] = 'ON_DUTY'
+        
+        delay_seconds = prediction['predicted_delay'] * 60
+        arrival = flight['arrival_ts'] + delay_seconds
+        self._schedule(arrival, ARRIVAL, (flight, crew_ids))
+        
+        self.flights[flight['flight_id']] = {
+            'predicted_delay': prediction['predicted_delay'],
+            'severity': prediction['severity'],
+            'is_compliant': assignment['compliance_check']['is_compliant'],
+            'departed_at': timestamp + delay_seconds,
+            'arrived_at': None
+        }
+    
+    def _on_arrival(self, timestamp, payload):
+        flight, crew_ids = payload
+        destination = flight['route'].split('-')[1]
+        block_hours = (flight['arrival_ts'] - flight['departure_ts']) / 3600
+        
+        for crew_id in crew_ids:
+            crew = self.crew[crew_id]
+            crew['current_location'] = destination
+            crew['duty_hours_today'] += block_hours
+            crew['assigned_flights'].append(flight['flight_id'])
+            
+            if self._needs_rest(crew):
+                crew['status'] = 'RESTING'
+                ready_at = timestamp + self.crew_rules['min_rest_hours'] * 3600
+            else:
+                crew['status'] = 'CONNECTING'
+                ready_at = timestamp + self.crew_rules.get('min_connection_minutes', 45) * 60
+            self._schedule(int(ready_at), CREW_READY, crew_id)
+        
+        self.flights[flight['flight_id']]['arrived_at'] = timestamp
+    
+    def statistics(self, elapsed_seconds):
+        events = {}
+        for kind, latencies in self.latencies.items():
+            if not latencies:
+                continue
+            ordered = sorted(latencies)
+            events[EVENT_NAMES[kind]] = {
+                'count': len(ordered),
+                'mean_ms': sum(ordered) / len(ordered) * 1000,
+                'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                'max_ms': ordered[-1] * 1000
+            }
+        
+        return {
+            'elapsed_seconds': elapsed_seconds,
+            'events': events,
+            'flights_departed': len(self.flights),
+            'flights_delayed': sum(1 for result in self.flights.values() if result['predicted_delay'] > 0),
+            'non_compliant_flights': sum(1 for result in self.flights.values() if not result['is_compliant']),
+            'alerts': dict(self.alert_count)
+        }
@@ -0,0 +1,351 @@
+import heapq
+import math
+
+RISKY_CONDITIONS = ('Thunderstorm', 'Fog', 'Rain')
+
+class TopK:
+    """The k largest items seen so far, kept in a min-heap; ties keep the earliest items, as heapq.nlargest does"""
+    
+    def __init__(self, k, key):
+        self.k = k
+        self.key = key
+        self.heap = []
+        self.sequence = 0
+    
+    def add(self, item):
+        entry = (self.key(item), -self.sequence, item)
+        self.sequence += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+    
+    def items(self):
+        return [item for _, _, item in sorted(self.heap, key=lambda entry: entry[:2], reverse=True)]
+
+class QuantileSketch:
+    """Approximate quantiles of non-negative values in bounded memory
+    
+    Values are counted in logarithmically spaced buckets, so every quantile
+    is within relative_accuracy of a true sample value. Past max_buckets
+    the lowest buckets are merged, which only blurs the smallest values.
+    """
+    
+    def __init__(self, relative_accuracy=0.01, max_buckets=1024):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+    
+    def add(self, value):
+        self.count += 1
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        
+        if value <= 0:
+            self.zero_count += 1
+            return
+        
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            lowest, second = sorted(self.buckets)[:2]
+            self.buckets[second] += self.buckets.pop(lowest)
+    
+    def quantile(self, q):
+        if not self.count:
+            return 0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.minimum, 0)
+        
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # The bucket midpoint, kept inside the observed range
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.minimum), self.maximum)
+        return self.maximum
+
+class OperationsSummary:
+    """Counts and shortlists shared by the dashboard and the report, built in one pass
+    
+    Delay and load predictions can also be added one at a time as the
+    predictors produce them; build() only fills the parts not yet fed, so it
+    can be called again on a summary that is already complete. Every
+    part keeps counts, top-K heaps and quantile sketches of a fixed size, so
+    rendering costs the same at any fleet size.
+    """
+    
+    # The inputs each part reads, so a live view can rebuild only the parts whose inputs changed
+    PARTS = {
+        'flights': ('flight_schedule',),
+        'delays': ('delay_predictions',),
+        'crew': ('crew_schedules', 'crew_schedule'),
+        'loads': ('load_predictions',),
+        'health': ('health_alerts',),
+        'tails': ('tail_plan',),
+        'routes': ('route_suggestions',),
+        'weather': ('weather_logs',)
+    }
+    
+    def __init__(self):
+        self.total_flights = 0
+        self.flight_status_count = {}
+        self.aircraft_type_count = {}
+        self.total_current_delay = 0
+        self.currently_delayed_count = 0
+        self.longest_current_delays = TopK(5, key=lambda flight: flight.get('current_delay', 0))
+        
+        self.prediction_count = 0
+        self.delay_severity_count = {'NONE': 0, 'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
+        self.delay_severity_examples = {}
+        self.total_predicted_delay = 0
+        self.delayed_flights = 0
+        self.worst_delays = TopK(3, key=lambda item: item[1].get('predicted_delay', 0))
+        self.delay_quantiles = QuantileSketch()
+        
+        self.total_crew = 0
+        self.crew_status_count = {}
+        self.crew_role_count = {}
+        self.assignment_count = 0
+        self.compliant_assignments = 0
+        self.non_compliant_count = 0
+        self.most_non_compliant = TopK(5, key=lambda item: len(item[1]))
+        
+        self.load_prediction_count = 0
+        self.total_capacity = 0
+        self.total_predicted_passengers = 0
+        self.load_status_count = {}
+        self.overbooking_count = 0
+        self.most_overbooked = TopK(3, key=lambda item: item[1].get('load_factor', 0))
+        self.load_factor_quantiles = QuantileSketch()
+        
+        self.has_health_alerts = False
+        self.critical_alert_count = 0
+        self.warning_alert_count = 0
+        self.latest_critical = TopK(3, key=lambda alert: alert.get('timestamp', ''))
+        self.alert_type_count = {}
+        self.aircraft_with_alerts = set()
+        
+        self.grounded_aircraft = []
+        self.tail_change_count = 0
+        self.unassigned_count = 0
+        # The first few of each, in the plan's departure order
+        self.tail_changes = []
+        self.unassigned_flights = []
+        
+        self.filled = set()
+        
+        self.route_issue_count = 0
+        self.high_severity_count = 0
+        self.medium_severity_count = 0
+        self.worst_high_severity = TopK(3, key=lambda suggestion: len(suggestion.get('issues', [])))
+        self.worst_medium_severity = TopK(3, key=lambda suggestion: len(suggestion.get('issues', [])))
+        
+        self.weather_report_count = 0
+        self.weather_condition_count = {}
+        self.risky_airports = []
+        self.seen_risky_airports = set()
+    
+    @staticmethod
+    def inputs(**data):
+        logs_data = data.get('logs_data', {})
+        return {
+            'flight_schedule': logs_data.get('flight_schedule', []),
+            'crew_schedules': logs_data.get('crew_schedules', []),
+            'weather_logs': logs_data.get('weather_logs', []),
+            'delay_predictions': data.get('delay_predictions', {}),
+            'crew_schedule': data.get('crew_schedule', {}),
+            'load_predictions': data.get('load_predictions', {}),
+            'health_alerts': data.get('health_alerts', {}),
+            'tail_plan': data.get('tail_plan') or {},
+            'route_suggestions': data.get('route_suggestions', [])
+        }
+    
+    @classmethod
+    def build(cls, summary=None, **data):
+        """Fill in every part of summary not already filled, or of a new summary"""
+        summary = summary if summary is not None else cls()
+        inputs = cls.inputs(**data)
+        for part in cls.PARTS:
+            if part not in summary.filled:
+                summary._add_part(part, inputs)
+        return summary
+    
+    @classmethod
+    def build_part(cls, part, inputs):
+        """A summary with only one part filled in, from the mapping returned by inputs()"""
+        summary = cls()
+        summary._add_part(part, inputs)
+        return summary
+    
+    def _add_part(self, part, inputs):
+        self.filled.add(part)
+        add = getattr(self, f'_add_{part}')
+        add(*[inputs[name] for name in self.PARTS[part]])
+    
+    def _add_flights(self, flights):
+        for flight in flights:
+            self.add_flight(flight)
+    
+    def add_flight(self, flight):
+        self.total_flights += 1
+        
+        status = flight.get('status', 'UNKNOWN')
+        self.flight_status_count[status] = self.flight_status_count.get(status, 0) + 1
+        
+        ac_type = flight.get('aircraft_type', 'UNKNOWN')
+        self.aircraft_type_count[ac_type] = self.aircraft_type_count.get(ac_type, 0) + 1
+        
+        current_delay = flight.get('current_delay', 0)
+        self.total_current_delay += current_delay
+        if current_delay > 0:
+            self.currently_delayed_count += 1
+            self.longest_current_delays.add(flight)
+    
+    def _add_delays(self, delay_predictions):
+        for flight_id, prediction in delay_predictions.items():
+            self.add_delay_prediction(flight_id, prediction)
+    
+    def add_delay_prediction(self, flight_id, prediction):
+        self.filled.add('delays')
+        self.prediction_count += 1
+        
+        severity = prediction.get('severity', 'NONE')
+        self.delay_severity_count[severity] = self.delay_severity_count.get(severity, 0) + 1
+        examples = self.delay_severity_examples.setdefault(severity, [])
+        if len(examples) < 3:
+            examples.append(prediction)
+        
+        delay = prediction.get('predicted_delay', 0)
+        self.total_predicted_delay += delay
+        if delay > 0:
+            self.delayed_flights += 1
+        
+        self.worst_delays.add((flight_id, prediction))
+        self.delay_quantiles.add(delay)
+    
+    def _add_crew(self, crew_members, crew_schedule):
+        self.total_crew = len(crew_members)
+        
+        for crew in crew_members:
+            status = crew.get('status', 'UNKNOWN')
+            role = crew.get('role', 'UNKNOWN')
+            self.crew_status_count[status] = self.crew_status_count.get(status, 0) + 1
+            self.crew_role_count[role] = self.crew_role_count.get(role, 0) + 1
+        
+        self.assignment_count = len(crew_schedule)
+        for flight_id, assignment in crew_schedule.items():
+            if assignment['compliance_check']['is_compliant']:
+                self.compliant_assignments += 1
+            else:
+                self.non_compliant_count += 1
+                self.most_non_compliant.add((flight_id, assignment['compliance_check']['issues']))
+    
+    def _add_loads(self, load_predictions):
+        for flight_id, prediction in load_predictions.items():
+            self.add_load_prediction(flight_id, prediction)
+    
+    def add_load_prediction(self, flight_id, prediction):
+        self.filled.add('loads')
+        self.load_prediction_count += 1
+        self.total_capacity += prediction.get('capacity', 0)
+        self.total_predicted_passengers += prediction.get('predicted_load', 0)
+        self.load_factor_quantiles.add(prediction.get('load_factor', 0))
+        
+        status = prediction.get('status', 'UNKNOWN')
+        self.load_status_count[status] = self.load_status_count.get(status, 0) + 1
+        
+        if status == 'OVERBOOKING RISK':
+            self.overbooking_count += 1
+            self.most_overbooked.add((flight_id, prediction))
+    
+    def _add_health(self, health_alerts):
+        self.has_health_alerts = bool(health_alerts)
+        self.critical_alert_count = len(health_alerts.get('critical', []))
+        self.warning_alert_count = len(health_alerts.get('warning', []))
+        for alert in health_alerts.get('critical', []):
+            self.latest_critical.add(alert)
+        
+        for alert in health_alerts.get('critical', []) + health_alerts.get('warning', []):
+            alert_type = alert.get('alert_type', 'UNKNOWN')
+            self.alert_type_count[alert_type] = self.alert_type_count.get(alert_type, 0) + 1
+            self.aircraft_with_alerts.add(alert['aircraft_id'])
+    
+    def _add_tails(self, tail_plan):
+        self.grounded_aircraft = tail_plan.get('grounded', [])
+        self.tail_change_count = len(tail_plan.get('changes', []))
+        self.unassigned_count = len(tail_plan.get('unassigned', []))
+        self.tail_changes = tail_plan.get('changes', [])[:5]
+        self.unassigned_flights = tail_plan.get('unassigned', [])[:5]
+    
+    def _add_routes(self, route_suggestions):
+        for suggestion in route_suggestions:
+            self.route_issue_count += 1
+            severity = suggestion.get('severity')
+            if severity == 'HIGH':
+                self.high_severity_count += 1
+                self.worst_high_severity.add(suggestion)
+            elif severity == 'MEDIUM':
+                self.medium_severity_count += 1
+                self.worst_medium_severity.add(suggestion)
+    
+    def _add_weather(self, weather_logs):
+        for log in weather_logs:
+            self.add_weather_report(log)
+    
+    def add_weather_report(self, log):
+        self.weather_report_count += 1
+        
+        condition = log['weather_data'].get('conditions', 'UNKNOWN')
+        self.weather_condition_count[condition] = self.weather_condition_count.get(condition, 0) + 1
+        
+        if condition in RISKY_CONDITIONS:
+            airport = log.get('airport', 'UNKNOWN')
+            if airport not in self.seen_risky_airports:
+                self.seen_risky_airports.add(airport)
+                self.risky_airports.append(airport)
+    
+    @property
+    def average_current_delay(self):
+        return self.total_current_delay / self.total_flights if self.total_flights else 0
+    
+    @property
+    def top_delays(self):
+        return self.worst_delays.items()
+    
+    @property
+    def currently_delayed(self):
+        return self.longest_current_delays.items()
+    
+    @property
+    def non_compliant_flights(self):
+        return self.most_non_compliant.items()
+    
+    @property
+    def overbooking_flights(self):
+        return self.most_overbooked.items()
+    
+    @property
+    def critical_alerts(self):
+        return self.latest_critical.items()
+    
+    @property
+    def high_severity_routes(self):
+        return self.worst_high_severity.items()
+    
+    @property
+    def medium_severity_routes(self):
+        return self.worst_medium_severity.items()
+    
+    @property
+    def overall_load_factor(self):
+        if self.total_capacity > 0:
+            return self.total_predicted_passengers / self.total_capacity
+        return 0
@@ -0,0 +1,144 @@
+import math
+
+from modules.settings import get_compiled_config
+
+EARTH_RADIUS_KM = 6371.0
+
+def great_circle_km(origin, destination):
+    lat1, lon1 = map(math.radians, origin)
+    lat2, lon2 = map(math.radians, destination)
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+class TailAssigner:
+    """Reassigns the day's flights among compatible aircraft, keeping grounded tails off the schedule"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.aircraft = get_compiled_config(config).aircraft
+        self.airports = config.get('airports', {})
+        self.distances = {}
+    
+    def route_distance(self, route):
+        """Great-circle distance in km, or None when either airport has no coordinates"""
+        if route not in self.distances:
+            origin, destination = route.split('-')
+            if origin in self.airports and destination in self.airports:
+                self.distances[route] = great_circle_km(self.airports[origin], self.airports[destination])
+            else:
+                self.distances[route] = None
+        return self.distances[route]
+    
+    def in_range(self, aircraft_type, route):
+        distance = self.route_distance(route)
+        return distance is None or distance <= self.aircraft[aircraft_type].range_km
+    
+    def grounded_aircraft(self, incidents):
+        """Tails with an unresolved critical alert or incident; resolving the last one releases the tail"""
+        return set(incident['aircraft_id'] for incident in incidents
+                   if incident['severity'] == 'CRITICAL' and incident.get('state') != 'resolved')
+    
+    def apply(self, flights, plan):
+        """The flights with every planned reassignment applied, as copies; unchanged flights are passed through"""
+        if not plan or not plan['changes']:
+            return list(flights)
+        
+        changes = {change['flight_id']: change for change in plan['changes']}
+        applied = []
+        for flight in flights:
+            change = changes.get(flight['flight_id'])
+            if change is None:
+                applied.append(flight)
+                continue
+            fields = dict(flight.to_dict() if hasattr(flight, 'to_dict') else flight,
+                          aircraft_id=change['to_aircraft'], aircraft_type=change['to_type'])
+            applied.append(type(flight).from_dict(fields) if hasattr(flight, 'from_dict') else fields)
+        return applied
+    
+    def assign(self, flights, grounded=()):
+        """Sweep flights in departure order, giving each a healthy, in-range tail standing at its origin
+        
+        Each aircraft starts at the origin of its first scheduled flight with
+        the type it is scheduled as. The scheduled tail is kept whenever it is
+        eligible, otherwise the shortest-range eligible tail of the same size
+        class takes the flight.
+        """
+        grounded = set(grounded)
+        ordered = sorted(flights, key=lambda flight: flight['departure_ts'])
+        
+        fleet_type = {}
+        location = {}
+        ready_ts = {}
+        parked = {}
+        for flight in ordered:
+            aircraft_id = flight['aircraft_id']
+            if aircraft_id not in fleet_type:
+                fleet_type[aircraft_id] = flight['aircraft_type']
+                origin = flight['route'].split('-')[0]
+                location[aircraft_id] = origin
+                ready_ts[aircraft_id] = 0
+                parked.setdefault(origin, set()).add(aircraft_id)
+        
+        assignments = {}
+        changes = []
+        unassigned = []
+        
+        for flight in ordered:
+            origin, destination = flight['route'].split('-')
+            size = self.aircraft[flight['aircraft_type']].size
+            
+            def eligible(aircraft_id):
+                aircraft_type = fleet_type[aircraft_id]
+                return (aircraft_id not in grounded
+                        and location[aircraft_id] == origin
+                        and ready_ts[aircraft_id] <= flight['departure_ts']
+                        and self.aircraft[aircraft_type].size == size
+                        and self.in_range(aircraft_type, flight['route']))
+            
+            scheduled = flight['aircraft_id']
+            if eligible(scheduled):
+                chosen = scheduled
+            else:
+                candidates = [aircraft_id for aircraft_id in parked.get(origin, ()) if eligible(aircraft_id)]
+                if not candidates:
+                    unassigned.append({
+                        'flight_id': flight['flight_id'],
+                        'aircraft_id': scheduled,
+                        'reason': self._unassigned_reason(flight, scheduled, grounded, fleet_type)
+                    })
+                    continue
+                
+                # Shortest sufficient range keeps long-haul tails free for the routes only they can fly
+                chosen = min(candidates, key=lambda aircraft_id: (
+                    self.aircraft[fleet_type[aircraft_id]].range_km, ready_ts[aircraft_id], aircraft_id
+                ))
+                changes.append({
+                    'flight_id': flight['flight_id'],
+                    'from_aircraft': scheduled,
+                    'to_aircraft': chosen,
+                    'to_type': fleet_type[chosen],
+                    'reason': self._unassigned_reason(flight, scheduled, grounded, fleet_type)
+                })
+            
+            assignments[flight['flight_id']] = chosen
+            parked[origin].discard(chosen)
+            parked.setdefault(destination, set()).add(chosen)
+            location[chosen] = destination
+            ready_ts[chosen] = flight['arrival_ts'] + self.aircraft[fleet_type[chosen]].turnaround_seconds
+        
+        return {
+            'assignments': assignments,
+            'changes': changes,
+            'unassigned': unassigned,
+            'grounded': sorted(grounded)
+        }
+    
+    def _unassigned_reason(self, flight, aircraft_id, grounded, fleet_type):
+        if aircraft_id in grounded:
+            return "Aircraft grounded by critical health alert"
+        if not self.in_range(fleet_type[aircraft_id], flight['route']):
+            return f"Route {flight['route']} exceeds {fleet_type[aircraft_id]} range"
+        if self.aircraft[fleet_type[aircraft_id]].size != self.aircraft[flight['aircraft_type']].size:
+            return f"{fleet_type[aircraft_id]} is not a {flight['aircraft_type']} substitute"
+        return "Aircraft not at origin in time"
@@ -0,0 +1,49 @@
+import json
+import sys
+import time
+
+from modules.delay_model import FEATURES, DelayModel
+from modules.delay_predictor import DelayPredictor
+from modules.log_processor import LogProcessor
+
+def train():
+    """Fit the delay model on the current_delay outcomes of the loaded schedule"""
+    try:
+        with open('airline_config.json', 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        print("Configuration file not found. Please run init_system.py first.")
+        sys.exit(1)
+    
+    settings = config.get('delay_model', {})
+    artifact_path = settings.get('artifact_path', 'output/models/delay_model.bin')
+    
+    logs_data = LogProcessor(config).process_all_logs()
+    flights = logs_data['flight_schedule']
+    if not flights:
+        print("No flight data available to train on.")
+        sys.exit(1)
+    
+    predictor = DelayPredictor(config)
+    samples = [predictor.features(flight, logs_data) for flight in flights]
+    targets = [flight['current_delay'] for flight in flights]
+    
+    model = DelayModel.fit(samples, targets, FEATURES, settings.get('ridge_lambda', 1.0))
+    model.save(artifact_path)
+    
+    started = time.perf_counter()
+    predicted = model.predict(samples)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    error = sum((p - t) ** 2 for p, t in zip(predicted, targets)) / len(targets)
+    print(f"\nTrained on {len(targets)} flights, RMSE {error ** 0.5:.1f} minutes")
+    print(f"Batch scoring: {elapsed_ms:.3f} ms for {len(targets)} flights")
+    
+    print("\nLearned minutes per feature:")
+    for feature, minutes in model.penalty_minutes().items():
+        print(f"  {feature}: {minutes:+.1f}")
+    
+    print(f"\nModel saved: {artifact_path}")
+
+if __name__ == "__main__":
+    train()
@@ -0,0 +1,203 @@
+import json
+import math
+import sys
+from datetime import datetime
+
+REQUIRED = object()
+
+ENGINE_METRICS = (
+    'engine_thrust_percent', 'engine_vibration', 'fuel_burn_rate', 'oil_temperature',
+    'oil_pressure', 'cabin_pressure_psi', 'cabin_temperature_c', 'airspeed_knots',
+    'altitude_ft', 'turbulence_level'
+)
+
+WEATHER_METRICS = (
+    'temperature_c', 'wind_speed_knots', 'wind_direction', 'visibility_meters',
+    'humidity_percent', 'pressure_hpa'
+)
+
+CREW_ROLES = ('Pilot', 'Co-Pilot', 'Senior Attendant', 'Attendant')
+
+class ValidationError(ValueError):
+    pass
+
+def _text(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValidationError(f"expected non-empty string, got {value!r}")
+    return value
+
+def _code(value):
+    return sys.intern(_text(value).strip().upper())
+
+def _number(value):
+    if isinstance(value, bool):
+        raise ValidationError(f"expected number, got {value!r}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"expected number, got {value!r}")
+    if math.isnan(number) or math.isinf(number):
+        raise ValidationError(f"expected finite number, got {value!r}")
+    return number
+
+def _integer(value):
+    return int(round(_number(value)))
+
+def _timestamp(value):
+    try:
+        return int(datetime.fromisoformat(_text(value)).timestamp())
+    except ValueError:
+        raise ValidationError(f"expected ISO timestamp, got {value!r}")
+
+def _route(value):
+    parts = _text(value).strip().upper().split('-')
+    if len(parts) != 2 or not parts[0] or not parts[1]:
+        raise ValidationError(f"expected route like DEL-BOM, got {value!r}")
+    return sys.intern(f"{parts[0]}-{parts[1]}")
+
+def _string_list(value):
+    if not isinstance(value, list):
+        raise ValidationError(f"expected list, got {value!r}")
+    return [_text(item) for item in value]
+
+def _integer_list(value):
+    if not isinstance(value, list):
+        raise ValidationError(f"expected list, got {value!r}")
+    return [_integer(item) for item in value]
+
+def _role(value):
+    if value not in CREW_ROLES:
+        raise ValidationError(f"unknown crew role {value!r}")
+    return sys.intern(value)
+
+def _numeric_mapping(fields, value):
+    if not isinstance(value, dict):
+        raise ValidationError(f"expected object, got {value!r}")
+    normalized = {}
+    for field in fields:
+        if field not in value:
+            raise ValidationError(f"missing {field}")
+        normalized[field] = _number(value[field])
+    return normalized
+
+def _metrics(value):
+    return _numeric_mapping(ENGINE_METRICS, value)
+
+def _weather_data(value):
+    normalized = _numeric_mapping(WEATHER_METRICS, value)
+    normalized['conditions'] = sys.intern(_text(value.get('conditions')))
+    return normalized
+
+# (field, coerce, default) per input file; ISO timestamp fields also get an epoch column
+SCHEMAS = {
+    'flight_schedule': [
+        ('flight_id', _text, REQUIRED),
+        ('route', _route, REQUIRED),
+        ('scheduled_departure', _text, REQUIRED),
+        ('scheduled_arrival', _text, REQUIRED),
+        ('aircraft_id', _code, REQUIRED),
+        ('aircraft_type', _code, REQUIRED),
+        ('status', _code, 'UNKNOWN'),
+        ('current_delay', _integer, 0),
+        ('gate', _text, 'UNASSIGNED'),
+        ('runway_queue', _integer, 0),
+        ('boarding_time_minutes', _integer, 0)
+    ],
+    'crew_schedules': [
+        ('crew_id', _text, REQUIRED),
+        ('name', _text, REQUIRED),
+        ('role', _role, REQUIRED),
+        ('current_location', _code, REQUIRED),
+        ('duty_hours_today', _number, 0.0),
+        ('rest_hours_remaining', _number, 0.0),
+        ('assigned_flights', _string_list, []),
+        ('next_available', _text, REQUIRED),
+        ('status', _code, 'UNKNOWN')
+    ],
+    'engine_logs': [
+        ('flight_id', _text, REQUIRED),
+        ('aircraft_id', _code, REQUIRED),
+        ('timestamp', _text, REQUIRED),
+        ('metrics', _metrics, REQUIRED),
+        ('status', _code, 'NORMAL')
+    ],
+    'weather_logs': [
+        ('airport', _code, REQUIRED),
+        ('timestamp', _text, REQUIRED),
+        ('weather_data', _weather_data, REQUIRED),
+        ('crosswind_knots', _number, 0.0)
+    ],
+    'passenger_load': [
+        ('route', _route, REQUIRED),
+        ('date', _text, REQUIRED),
+        ('historical_loads', _integer_list, []),
+        ('current_bookings', _integer, 0),
+        ('capacity', _integer, REQUIRED),
+        ('seasonal_factor', _number, 1.0)
+    ]
+}
+
+EPOCH_FIELDS = {
+    'flight_schedule': [('scheduled_departure', 'departure_ts'), ('scheduled_arrival', 'arrival_ts')],
+    'crew_schedules': [('next_available', 'available_ts')],
+    'engine_logs': [('timestamp', 'reading_ts')],
+    'weather_logs': [('timestamp', 'observed_ts')]
+}
+
+class RecordValidator:
+    """Coerces raw input records to the shapes the predictors expect"""
+    
+    def __init__(self, config):
+        self.aircraft_types = set(config['aircraft_types'])
+    
+    def normalize(self, key, raw):
+        if not isinstance(raw, dict):
+            raise ValidationError(f"expected object, got {type(raw).__name__}")
+        
+        schema = SCHEMAS.get(key)
+        if schema is None:
+            return raw
+        
+        record = {}
+        for field, coerce, default in schema:
+            value = raw.get(field)
+            if value is None:
+                if default is REQUIRED:
+                    raise ValidationError(f"missing {field}")
+                record[field] = list(default) if isinstance(default, list) else default
+                continue
+            
+            try:
+                record[field] = coerce(value)
+            except ValidationError as e:
+                raise ValidationError(f"{field}: {e}")
+        
+        for source, target in EPOCH_FIELDS.get(key, []):
+            try:
+                record[target] = _timestamp(record[source])
+            except ValidationError as e:
+                raise ValidationError(f"{source}: {e}")
+        
+        if key == 'flight_schedule' and record['aircraft_type'] not in self.aircraft_types:
+            raise ValidationError(f"aircraft_type: unknown type {record['aircraft_type']!r}")
+        
+        return record
+
+class RejectLog:
+    """Appends quarantined records with their reason to a JSON-lines file"""
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def write(self, source, rejects):
+        if not rejects:
+            return
+        
+        with open(self.path, 'a') as f:
+            for reason, raw in rejects:
+                f.write(json.dumps({
+                    'rejected_at': datetime.now().isoformat(),
+                    'source': source,
+                    'reason': reason,
+                    'record': raw
+                }, default=str) + '\n')
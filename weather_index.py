@@ -0,0 +1,149 @@
+import bisect
+
+CONDITION_SEVERITY = {
+    'Clear': 0,
+    'Cloudy': 1,
+    'Rain': 2,
+    'Fog': 3,
+    'Thunderstorm': 4
+}
+
+INTERPOLATED_FIELDS = ('visibility_meters', 'wind_speed_knots', 'temperature_c')
+
+class WeatherIndex:
+    """Per-airport weather timeline with hourly worst-case buckets"""
+    
+    BUCKET_SECONDS = 3600
+    
+    def __init__(self, weather_logs):
+        self.timestamps = {}
+        self.readings = {}
+        self.bucket_keys = {}
+        self.bucket_worst = {}
+        self._build(weather_logs)
+    
+    def _build(self, weather_logs):
+        by_airport = {}
+        for weather_log in weather_logs:
+            by_airport.setdefault(weather_log['airport'], []).append((weather_log['observed_ts'], weather_log))
+        
+        for airport, entries in by_airport.items():
+            entries.sort(key=lambda entry: entry[0])
+            self.timestamps[airport] = [entry[0] for entry in entries]
+            self.readings[airport] = [self._reading(entry[1]) for entry in entries]
+            
+            buckets = {}
+            for timestamp, reading in zip(self.timestamps[airport], self.readings[airport]):
+                bucket = int(timestamp) // self.BUCKET_SECONDS
+                if bucket in buckets:
+                    buckets[bucket] = self._worse(buckets[bucket], reading)
+                else:
+                    buckets[bucket] = reading
+            
+            keys = sorted(buckets)
+            self.bucket_keys[airport] = keys
+            self.bucket_worst[airport] = [buckets[key] for key in keys]
+    
+    def add(self, weather_log):
+        """Insert one observation, keeping the airport timeline and its hourly bucket current"""
+        airport = weather_log['airport']
+        timestamp = weather_log['observed_ts']
+        reading = self._reading(weather_log)
+        
+        timestamps = self.timestamps.setdefault(airport, [])
+        readings = self.readings.setdefault(airport, [])
+        position = bisect.bisect_right(timestamps, timestamp)
+        timestamps.insert(position, timestamp)
+        readings.insert(position, reading)
+        
+        keys = self.bucket_keys.setdefault(airport, [])
+        worst = self.bucket_worst.setdefault(airport, [])
+        bucket = int(timestamp) // self.BUCKET_SECONDS
+        position = bisect.bisect_left(keys, bucket)
+        if position < len(keys) and keys[position] == bucket:
+            worst[position] = self._worse(worst[position], reading)
+        else:
+            keys.insert(position, bucket)
+            worst.insert(position, reading)
+    
+    def _reading(self, weather_log):
+        weather_data = weather_log['weather_data']
+        reading = {
+            'conditions': weather_data['conditions'],
+            'crosswind_knots': weather_log['crosswind_knots']
+        }
+        for field in INTERPOLATED_FIELDS:
+            reading[field] = weather_data[field]
+        return reading
+    
+    def _worse(self, first, second):
+        if CONDITION_SEVERITY.get(second['conditions'], 0) > CONDITION_SEVERITY.get(first['conditions'], 0):
+            conditions = second['conditions']
+        else:
+            conditions = first['conditions']
+        
+        return {
+            'conditions': conditions,
+            'crosswind_knots': max(first['crosswind_knots'], second['crosswind_knots']),
+            'visibility_meters': min(first['visibility_meters'], second['visibility_meters']),
+            'wind_speed_knots': max(first['wind_speed_knots'], second['wind_speed_knots']),
+            'temperature_c': max(first['temperature_c'], second['temperature_c'])
+        }
+    
+    def conditions_at(self, airport, timestamp=None):
+        """Interpolate the weather at airport for an epoch timestamp, latest if None"""
+        timestamps = self.timestamps.get(airport)
+        if not timestamps:
+            return None
+        
+        readings = self.readings[airport]
+        if timestamp is None:
+            return dict(readings[-1])
+        
+        position = bisect.bisect_left(timestamps, timestamp)
+        
+        # Outside the observed window the nearest reading is the best estimate
+        if position == 0:
+            return dict(readings[0])
+        if position == len(timestamps):
+            return dict(readings[-1])
+        
+        before_time = timestamps[position - 1]
+        after_time = timestamps[position]
+        before = readings[position - 1]
+        after = readings[position]
+        
+        span = after_time - before_time
+        weight = (timestamp - before_time) / span if span else 0.0
+        
+        reading = {
+            'conditions': after['conditions'] if weight >= 0.5 else before['conditions'],
+            'crosswind_knots': before['crosswind_knots'] + (after['crosswind_knots'] - before['crosswind_knots']) * weight
+        }
+        for field in INTERPOLATED_FIELDS:
+            reading[field] = before[field] + (after[field] - before[field]) * weight
+        return reading
+    
+    def worst_between(self, airport, start, end):
+        """Worst conditions at airport between two epoch timestamps, at bucket resolution"""
+        keys = self.bucket_keys.get(airport)
+        if not keys:
+            return None
+        
+        first = bisect.bisect_left(keys, int(start) // self.BUCKET_SECONDS)
+        last = bisect.bisect_right(keys, int(end) // self.BUCKET_SECONDS)
+        if first >= last:
+            return None
+        
+        worst = self.bucket_worst[airport][first]
+        for reading in self.bucket_worst[airport][first + 1:last]:
+            worst = self._worse(worst, reading)
+        return dict(worst)
+
+def get_weather_index(logs_data):
+    """Build the weather index once per snapshot and share it between modules"""
+    index = logs_data.get('weather_index')
+    if index is None:
+        index = WeatherIndex(logs_data['weather_logs'])
+        logs_data['weather_index'] = index
+    return index